@@ -2,63 +2,70 @@ print(">>> Starting Movie Recommendation Backend...")
 
 import os
 import sys
+import hmac
+import json
+import time
 import numpy as np
 import pandas as pd
 import unicodedata
 from difflib import SequenceMatcher
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, g, request, jsonify, render_template
 from flask_cors import CORS
 
 from src.exception import MyException
 from src.logger import logging
 from src.entity.estimator import MovieRecommenderEstimator
-from src.cloud_storage.aws_storage import SimpleStorageService
+from src.pipeline.model_reloader import ModelReloader
+from src.cloud_storage.artifact_sync import ArtifactSync
+from src.utils import metrics
+from src.utils.profiling import RequestProfiler
 from src.constants import (
     MODEL_BUCKET_NAME,
     MODEL_PUSHER_S3_KEY,
     TFIDF_VECTORIZER_FILE_NAME,
     TFIDF_MATRIX_FILE_NAME,
     COSINE_SIMILARITY_FILE_NAME,
+    NEIGHBOR_INDICES_FILE_NAME,
+    NEIGHBOR_SCORES_FILE_NAME,
     TFIDF_VECTORIZER_PATH,
     TFIDF_MATRIX_PATH,
     COSINE_SIMILARITY_PATH,
+    NEIGHBOR_INDICES_PATH,
+    NEIGHBOR_SCORES_PATH,
+    MAX_BATCH_SIZE,
+    MODEL_WATCH_INTERVAL_ENV_KEY,
+    ADMIN_TOKEN_ENV_KEY,
+    SKIP_ARTIFACT_SYNC_ENV_KEY,
 )
 
 
 # =====================================================
 # OPTIONAL: DOWNLOAD ARTIFACTS FROM S3 AT STARTUP
 # =====================================================
-def ensure_model_artifacts_from_s3(force_download: bool = True):
+def ensure_model_artifacts_from_s3(force_download: bool = False):
     """
-    Always fetch artifacts from S3 when force_download is True
-    to guarantee we serve the S3 version (no local fallback).
+    Sync model artifacts from S3 before the estimator loads: files whose
+    S3 ETag / manifest checksum match the verified local copy are kept,
+    changed ones are downloaded concurrently and verified.
+    force_download=True re-downloads everything.
     """
     try:
-        s3 = SimpleStorageService()
-        downloads = [
-            (TFIDF_VECTORIZER_FILE_NAME, TFIDF_VECTORIZER_PATH),
-            (TFIDF_MATRIX_FILE_NAME, TFIDF_MATRIX_PATH),
-            (COSINE_SIMILARITY_FILE_NAME, COSINE_SIMILARITY_PATH),
+        artifacts = [
+            (TFIDF_VECTORIZER_FILE_NAME, TFIDF_VECTORIZER_PATH, True),
+            (TFIDF_MATRIX_FILE_NAME, TFIDF_MATRIX_PATH, True),
+            # Neighbour table is absent from models trained before it existed and
+            # the dense matrix is absent from models trained in blocked mode;
+            # the recommender serves from whichever one is present.
+            (COSINE_SIMILARITY_FILE_NAME, COSINE_SIMILARITY_PATH, False),
+            (NEIGHBOR_INDICES_FILE_NAME, NEIGHBOR_INDICES_PATH, False),
+            (NEIGHBOR_SCORES_FILE_NAME, NEIGHBOR_SCORES_PATH, False),
         ]
 
-        for fname, local_path in downloads:
-            local_path = str(local_path)
-
-            if not force_download and os.path.exists(local_path):
-                logging.info(f"Model artifact present locally, skipping download: {local_path}")
-                continue
-
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            s3_key = f"{MODEL_PUSHER_S3_KEY}/{fname}"
-            logging.info(
-                f"Downloading {s3_key} from s3://{MODEL_BUCKET_NAME} to {local_path}"
-            )
-            s3.s3_resource.meta.client.download_file(
-                MODEL_BUCKET_NAME,
-                s3_key,
-                local_path,
-            )
+        ArtifactSync(
+            bucket_name=MODEL_BUCKET_NAME,
+            s3_prefix=MODEL_PUSHER_S3_KEY,
+        ).sync(artifacts, force=force_download)
 
         logging.info("Model artifacts ready from S3")
     except Exception as e:
@@ -72,14 +79,89 @@ def ensure_model_artifacts_from_s3(force_download: bool = True):
 app = Flask(__name__, template_folder="templates", static_folder="static")
 CORS(app)
 
+# Handlers read model_reloader.estimator once per request, so a hot reload
+# never switches models in the middle of a request.
+# SKIP_ARTIFACT_SYNC=1 serves the local artifacts as they are (no S3).
+skip_artifact_sync = os.getenv(SKIP_ARTIFACT_SYNC_ENV_KEY, "0") == "1"
+model_reloader = ModelReloader(
+    estimator_factory=MovieRecommenderEstimator,
+    prepare_fn=None if skip_artifact_sync else ensure_model_artifacts_from_s3,
+)
+
 try:
-    ensure_model_artifacts_from_s3(force_download=True)
     logging.info("Initializing MovieRecommenderEstimator")
-    estimator = MovieRecommenderEstimator()
+    model_reloader.load(prepare=True)
+
+    watch_interval = float(os.getenv(MODEL_WATCH_INTERVAL_ENV_KEY, "0"))
+    if watch_interval > 0:
+        model_reloader.watch(watch_interval)
 except Exception as e:
     raise MyException(e, sys)
 
 
+# =====================================================
+# REQUEST METRICS
+# =====================================================
+REQUEST_SECONDS = metrics.histogram(
+    "recommender_http_request_seconds",
+    "HTTP request latency by endpoint and status",
+    ("endpoint", "status")
+)
+metrics.REGISTRY.add_collect_hook(model_reloader.collect_metrics)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        REQUEST_SECONDS.labels(endpoint, str(response.status_code)).observe(
+            time.perf_counter() - started
+        )
+    return response
+
+
+# PROFILE_ON_DEMAND / PROFILE_SAMPLE_RATE; inactive (no per-request cost) by default
+request_profiler = RequestProfiler.from_env()
+
+
+def is_admin_request() -> bool:
+    """True if the request carries the configured ADMIN_TOKEN."""
+    token = os.getenv(ADMIN_TOKEN_ENV_KEY)
+    supplied = request.headers.get("X-Admin-Token", "")
+    return bool(token) and hmac.compare_digest(supplied, token)
+
+
+def profile_requested() -> bool:
+    """
+    Explicit profiling request (X-Profile: 1 or ?profile=1). When an
+    ADMIN_TOKEN is configured the request must also carry it.
+    """
+    flag = request.headers.get("X-Profile") or request.args.get("profile")
+    if flag not in ("1", "true"):
+        return False
+    return is_admin_request() if os.getenv(ADMIN_TOKEN_ENV_KEY) else True
+
+
+@app.route("/metrics")
+def metrics_api():
+    """Prometheus scrape endpoint (metrics of the worker serving the scrape)."""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+
+# =====================================================
+# PRE-SERIALISED JSON RESPONSES
+# =====================================================
+def json_body_response(body: bytes) -> Response:
+    """Response for a pre-serialised JSON body (same framing as jsonify)."""
+    return Response(body + b"\n", mimetype="application/json")
+
+
 # =====================================================
 # HEALTH CHECK
 # =====================================================
@@ -88,10 +170,32 @@ def health():
     return jsonify({
         "status": "ok",
         "service": "movie-recommendation",
-        "environment": os.getenv("ENV", "local")
+        "environment": os.getenv("ENV", "local"),
+        "model_version": model_reloader.model_version,
+        "model_state": model_reloader.status["state"],
     })
 
 
+# =====================================================
+# ADMIN: HOT RELOAD
+# =====================================================
+@app.route("/admin/reload", methods=["GET", "POST"])
+def admin_reload_api():
+    if not is_admin_request():
+        return jsonify({"error": "forbidden"}), 403
+
+    if request.method == "GET":
+        return jsonify(model_reloader.status)
+
+    # ?download=0 reloads from the artifacts already on local disk
+    download = request.args.get("download", "1") != "0"
+    started = model_reloader.reload_async(prepare=download)
+
+    return jsonify({"reload_started": started, **model_reloader.status}), (
+        202 if started else 409
+    )
+
+
 # =====================================================
 # HOME (UI)
 # =====================================================
@@ -108,19 +212,99 @@ def recommend_api():
     try:
         movie = request.args.get("title", "")
         top_n = int(request.args.get("top_n", 10))
+        genre = request.args.get("genre") or None
 
-        matched_movie, recommendations = estimator.recommend(movie, top_n)
+        estimator = model_reloader.estimator
+        if genre is not None and not estimator.is_known_genre(genre):
+            return jsonify({"error": f"Unknown genre: {genre}"}), 400
 
-        return jsonify({
-            "matched_title": matched_movie,
-            "results": recommendations.to_dict(orient="records")
-        })
+        if request_profiler.active:
+            reason = request_profiler.trigger(profile_requested())
+            if reason is not None:
+                return profiled_recommend(estimator, movie, top_n, reason, genre)
+
+        return json_body_response(estimator.recommend_json(movie, top_n, genre=genre))
 
     except Exception as e:
         logging.error("Recommendation failed", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
 
+def profiled_recommend(estimator, movie: str, top_n: int, reason: str, genre: str = None):
+    """
+    /recommend under cProfile with caches bypassed. Explicitly requested
+    profiles come back in the response under "profile"; sampled requests
+    get the normal response, with the profile saved to PROFILE_DIR.
+    """
+    body, error, report = request_profiler.run(
+        lambda: estimator.recommend_json(movie, top_n, use_cache=False, genre=genre),
+        label=f"/recommend title={movie!r} top_n={top_n}",
+        reason=reason
+    )
+
+    if reason != "requested" or report is None:
+        if error is not None:
+            raise error
+        response = json_body_response(body)
+    else:
+        payload = {"error": str(error)} if error is not None else json.loads(body)
+        payload["profile"] = report
+        response = jsonify(payload)
+        if error is not None:
+            response.status_code = 500
+
+    if report is not None and report["profile_file"]:
+        response.headers["X-Profile-Id"] = report["profile_file"]
+    return response
+
+
+# =====================================================
+# FREE-TEXT RECOMMENDATION API
+# =====================================================
+@app.route("/recommend/text", methods=["GET"])
+def recommend_text_api():
+    try:
+        query = request.args.get("query", "").strip()
+        top_n = int(request.args.get("top_n", 10))
+        genre = request.args.get("genre") or None
+
+        if not query:
+            return jsonify({"error": "'query' is required"}), 400
+
+        estimator = model_reloader.estimator
+        if genre is not None and not estimator.is_known_genre(genre):
+            return jsonify({"error": f"Unknown genre: {genre}"}), 400
+
+        return json_body_response(estimator.recommend_text_json(query, top_n, genre=genre))
+
+    except Exception as e:
+        logging.error("Text recommendation failed", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+
+# =====================================================
+# BATCH RECOMMENDATION API
+# =====================================================
+@app.route("/recommend/batch", methods=["POST"])
+def recommend_batch_api():
+    try:
+        payload = request.get_json(silent=True) or {}
+        titles = payload.get("titles")
+        top_n = int(payload.get("top_n", 10))
+
+        if not isinstance(titles, list) or not all(isinstance(t, str) for t in titles):
+            return jsonify({"error": "'titles' must be a list of strings"}), 400
+        if len(titles) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"At most {MAX_BATCH_SIZE} titles per batch"}), 400
+
+        estimator = model_reloader.estimator
+        return json_body_response(estimator.recommend_many_json(titles, top_n))
+
+    except Exception as e:
+        logging.error("Batch recommendation failed", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+
 # =====================================================
 # SEARCH API (Autocomplete)
 # =====================================================
@@ -131,11 +315,7 @@ def search_api():
         if not query:
             return jsonify([])
 
-        df = estimator.recommender.df
-
-        matches = df[
-            df["title_norm"].str.contains(query, case=False, regex=False, na=False)
-        ].head(10)
+        matches = model_reloader.estimator.search_titles(query, limit=10)
 
         return jsonify(
             matches[["title", "poster_url"]].to_dict(orient="records")
@@ -156,13 +336,8 @@ def suggest_api():
         if not query:
             return jsonify([])
 
-        df = estimator.recommender.df
-
         suggestions = (
-            df[df["title_norm"].str.contains(query, case=False, regex=False, na=False)]
-            ["title"]
-            .head(8)
-            .tolist()
+            model_reloader.estimator.search_titles(query, limit=8)["title"].tolist()
         )
 
         return jsonify(suggestions)
@@ -0,0 +1,112 @@
+"""
+Autocomplete lookup latency: AutocompleteIndex vs the pandas substring scan
+that /search and /suggest used to run on every keystroke.
+
+Titles are synthesised from the word distribution of the bundled catalog.
+Run from the repository root:
+
+    python -m benchmarks.bench_autocomplete --titles 1000000
+"""
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.prediction_pipeline import normalize_text
+from src.utils.search_index import AutocompleteIndex
+
+SOURCE_CSV = "data/movies_with_images_1.csv"
+
+
+def synthetic_titles(n_titles: int, seed: int) -> list:
+    words = [
+        word
+        for title in pd.read_csv(SOURCE_CSV)["title"].map(normalize_text)
+        for word in title.split()
+    ]
+    vocab, counts = np.unique(words, return_counts=True)
+    probs = counts / counts.sum()
+
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, 6, size=n_titles)
+    picks = rng.choice(len(vocab), size=int(lengths.sum()), p=probs)
+
+    titles, pos = [], 0
+    for length in lengths.tolist():
+        titles.append(" ".join(vocab[picks[pos:pos + length]]))
+        pos += length
+    return titles
+
+
+def sample_queries(titles: list, n_queries: int, seed: int) -> list:
+    rnd = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        title = rnd.choice(titles)
+        words = title.split()
+        start = rnd.randrange(len(words))
+        tail = " ".join(words[start:])
+        queries.append(tail[:rnd.randint(2, max(2, min(12, len(tail))))])
+    return queries
+
+
+def percentile_us(samples: list, q: float) -> float:
+    return float(np.percentile(samples, q) * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Autocomplete index benchmark")
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--scan-queries", type=int, default=50,
+                        help="queries timed against the (slow) pandas scan")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    titles = synthetic_titles(args.titles, args.seed)
+    votes = np.random.default_rng(args.seed).pareto(1.5, size=len(titles)) * 100
+    df = pd.DataFrame({"title_norm": titles, "vote_count": votes})
+    queries = sample_queries(titles, args.queries, args.seed)
+
+    started = time.perf_counter()
+    index = AutocompleteIndex(titles, votes)
+    build_seconds = time.perf_counter() - started
+    print(f"{len(titles)} titles, {len(index)} indexed suffixes, built in {build_seconds:.1f}s")
+
+    index_times = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, args.limit)
+        index_times.append(time.perf_counter() - started)
+
+    scan_times = []
+    for query in queries[:args.scan_queries]:
+        started = time.perf_counter()
+        df[
+            df["title_norm"].str.contains(query, case=False, regex=False, na=False)
+        ].head(args.limit)
+        scan_times.append(time.perf_counter() - started)
+
+    results = {
+        "titles": len(titles),
+        "build_seconds": round(build_seconds, 2),
+        "index_p50_us": round(percentile_us(index_times, 50), 1),
+        "index_p99_us": round(percentile_us(index_times, 99), 1),
+        "scan_p50_us": round(percentile_us(scan_times, 50), 1),
+        "scan_p99_us": round(percentile_us(scan_times, 99), 1),
+    }
+    for key, value in results.items():
+        print(f"{key:<15} {value}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Microbenchmarks for MovieRecommender.find_movie by query class and catalog
+size, with regression checks against a stored baseline.
+
+Each catalog size gets a synthetic artifact set (a SyntheticMovieData
+catalog, see bench_http_load) and runs in a fresh process with
+RECOMMENDER_ARTIFACT_DIR pointing at it.
+Queries are generated per class and kept only if find_movie resolves them
+through the tier the class is meant to exercise:
+
+    exact      a catalog title                          -> exact
+    substring  a title without its first word           -> substring
+    acronym    initials of a dotted title ("kgf")       -> acronym (short branch)
+    fuzzy      a title with one character dropped       -> fuzzy
+    miss       random letters                           -> none (every tier)
+
+Every query is timed --repeats times and its fastest run kept; p50/p95/mean are
+over queries. The mean time per stage (normalize, exact, substring,
+acronym, fuzzy) comes from one extra instrumented pass.
+
+Results are compared with the baseline (--baseline): a class is flagged
+when its p50 is more than --tolerance slower and at least --min-delta-us
+in absolute terms, and the script exits with status 1. --update-baseline
+stores this run as the new baseline. Timings are machine dependent, so
+refresh the baseline when the benchmark machine changes. Run from the
+repository root:
+
+    python -m benchmarks.bench_find_movie --sizes 1520 50000 500000
+    python -m benchmarks.bench_find_movie --update-baseline
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from benchmarks.bench_http_load import git_revision, write_synthetic_artifacts
+
+BASELINE_PATH = "benchmarks/baselines/find_movie.json"
+QUERY_CLASSES = {
+    "exact": "exact",
+    "substring": "substring",
+    "acronym": "acronym",
+    "fuzzy": "fuzzy",
+    "miss": "none",
+}
+
+
+class _StageTotals:
+    """Stands in for the stage histogram of StageTimer, summing laps per stage."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+
+    def labels(self, stage):
+        return _StageLap(self.seconds, stage)
+
+
+class _StageLap:
+    __slots__ = ("seconds", "stage")
+
+    def __init__(self, seconds, stage):
+        self.seconds = seconds
+        self.stage = stage
+
+    def observe(self, value):
+        self.seconds[self.stage] += value
+
+
+def candidate_query(query_class: str, titles: list, rng: random.Random) -> str:
+    if query_class == "miss":
+        return " ".join(
+            "".join(rng.choices("bcdfghjklmnpqrstvwxz", k=rng.randint(5, 8)))
+            for _ in range(rng.randint(1, 3))
+        )
+
+    title = rng.choice(titles)
+    words = title.split()
+    if query_class == "exact":
+        return title
+    if query_class == "substring":
+        return " ".join(words[1:]) if len(words) >= 3 else None
+    if query_class == "acronym":
+        head = title.split(":")[0]
+        if ":" not in title or not all(len(part) == 1 for part in head.split(".")):
+            return None
+        return head.replace(".", "").lower()
+
+    # fuzzy: drop one character from the longest word
+    if len(words) < 2:
+        return None
+    longest = max(range(len(words)), key=lambda i: len(words[i]))
+    word = words[longest]
+    if len(word) < 4:
+        return None
+    cut = rng.randrange(1, len(word) - 1)
+    words[longest] = word[:cut] + word[cut + 1:]
+    return " ".join(words)
+
+
+def make_queries(recommender, query_class: str, n: int, rng: random.Random) -> tuple:
+    """Up to n queries resolved through the tier of query_class, plus attempts made."""
+    from src.pipeline.prediction_pipeline import StageTimer
+
+    titles = recommender.catalog.titles
+    if query_class == "acronym":
+        # Dotted titles are rare; sample among them directly
+        titles = [t for t in titles if ":" in t and "." in t.split(":")[0]]
+
+    expected = QUERY_CLASSES[query_class]
+    queries, attempts = [], 0
+    while len(queries) < n and attempts < n * 50 and titles:
+        attempts += 1
+        query = candidate_query(query_class, titles, rng)
+        if query is None or query in queries:
+            continue
+        _, tier = recommender._match_title(query, StageTimer(_StageTotals()))
+        if tier == expected:
+            queries.append(query)
+    return queries, attempts
+
+
+def time_class(recommender, queries: list, repeats: int) -> dict:
+    from src.pipeline.prediction_pipeline import StageTimer
+
+    per_query = []
+    for query in queries:
+        runs = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            recommender.find_movie(query)
+            runs.append(time.perf_counter() - started)
+        per_query.append(min(runs))
+
+    stages = _StageTotals()
+    for query in queries:
+        recommender._match_title(query, StageTimer(stages))
+
+    us = np.asarray(per_query) * 1e6
+    return {
+        "queries": len(queries),
+        "p50_us": round(float(np.percentile(us, 50)), 2),
+        "p95_us": round(float(np.percentile(us, 95)), 2),
+        "mean_us": round(float(us.mean()), 2),
+        "stage_mean_us": {
+            stage: round(seconds / len(queries) * 1e6, 2)
+            for stage, seconds in stages.seconds.items()
+        },
+    }
+
+
+def worker(args: dict, results) -> None:
+    logging.disable(logging.CRITICAL)
+    from src.pipeline.prediction_pipeline import MovieRecommender
+
+    started = time.perf_counter()
+    recommender = MovieRecommender()
+    load_seconds = time.perf_counter() - started
+
+    rng = random.Random(args["seed"])
+    rows = {}
+    for query_class in QUERY_CLASSES:
+        queries, attempts = make_queries(recommender, query_class, args["queries"], rng)
+        if not queries:
+            rows[query_class] = {"queries": 0, "attempts": attempts}
+            continue
+        rows[query_class] = {
+            **time_class(recommender, queries, args["repeats"]),
+            "attempts": attempts,
+        }
+
+    results.put({"load_seconds": round(load_seconds, 3), "classes": rows})
+
+
+def run_size(n_items: int, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory(prefix="find_movie_bench_") as tmp_dir:
+        # find_movie never reads the neighbour table; keep it tiny
+        write_synthetic_artifacts(tmp_dir, n_items, 5, args.seed)
+
+        # RECOMMENDER_ARTIFACT_DIR is read when the child first imports src.constants
+        os.environ["RECOMMENDER_ARTIFACT_DIR"] = tmp_dir
+        ctx = multiprocessing.get_context("spawn")
+        results = ctx.Queue()
+        process = ctx.Process(target=worker, args=(vars(args), results))
+        process.start()
+        row = results.get()
+        process.join()
+    return {"items": n_items, **row}
+
+
+def find_regressions(baseline: dict, results: list, tolerance: float, min_delta_us: float) -> list:
+    before = {
+        (size["items"], name): row
+        for size in baseline["results"]
+        for name, row in size["classes"].items()
+    }
+    regressions = []
+    for size in results:
+        for name, row in size["classes"].items():
+            old = before.get((size["items"], name))
+            if not old or not old.get("p50_us") or not row.get("p50_us"):
+                continue
+            delta = row["p50_us"] - old["p50_us"]
+            if delta > min_delta_us and row["p50_us"] > old["p50_us"] * (1 + tolerance):
+                regressions.append({
+                    "items": size["items"],
+                    "class": name,
+                    "baseline_p50_us": old["p50_us"],
+                    "p50_us": row["p50_us"],
+                    "change": round(row["p50_us"] / old["p50_us"] - 1, 3),
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="find_movie latency by query class and catalog size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1520, 50000, 500000])
+    parser.add_argument("--queries", type=int, default=50, help="queries per class")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative p50 slowdown")
+    parser.add_argument("--min-delta-us", type=float, default=5.0, help="ignore smaller p50 changes")
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"{'items':>9}{'class':>11}{'queries':>9}{'p50 us':>12}{'p95 us':>12}{'mean us':>12}")
+    results = []
+    for n_items in args.sizes:
+        size = run_size(n_items, args)
+        results.append(size)
+        for name, row in size["classes"].items():
+            if not row["queries"]:
+                print(f"{n_items:>9}{name:>11}{'no queries':>9}")
+                continue
+            print(
+                f"{n_items:>9}{name:>11}{row['queries']:>9}{row['p50_us']:>12.1f}"
+                f"{row['p95_us']:>12.1f}{row['mean_us']:>12.1f}"
+            )
+
+    report = {
+        "meta": {
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "config": {key: vars(args)[key] for key in ("queries", "repeats", "seed")},
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to store one")
+        return
+
+    with open(args.baseline) as f:
+        regressions = find_regressions(json.load(f), results, args.tolerance, args.min_delta_us)
+    for row in regressions:
+        print(
+            f"REGRESSION {row['items']} items / {row['class']}: p50 "
+            f"{row['baseline_p50_us']:.1f} -> {row['p50_us']:.1f} us ({row['change']:+.0%})"
+        )
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
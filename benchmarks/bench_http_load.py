@@ -0,0 +1,399 @@
+"""
+HTTP load test for app.py: throughput, latency percentiles and error rates
+of /recommend, /search and /suggest at several concurrency levels.
+
+By default a synthetic artifact set (a SyntheticMovieData catalog plus a
+random neighbour table) is written to a temporary directory, and the app
+is started on it in a subprocess with RECOMMENDER_ARTIFACT_DIR pointing
+there and SKIP_ARTIFACT_SYNC=1, so neither S3 nor MongoDB is touched.
+--url targets a server that is already running instead (e.g. gunicorn);
+queries are then built from --catalog.
+
+Each concurrency level is a closed loop: every client thread keeps one
+keep-alive connection and sends its next request as soon as the previous
+one returns. Requests come from a seeded, pre-generated mix of endpoints
+and query classes:
+
+    exact    a catalog title, popular titles more often
+    acronym  the initials of a title ("kgf" for "K.G.F: Chapter 2")
+    typo     a title with one character dropped, swapped or replaced
+    miss     random letters that match nothing
+
+/search and /suggest get a prefix of the query, as typed by a user.
+Queries repeat (--unique-queries), so the estimator caches see a realistic
+hit rate. /recommend answers 500 "Movie not found" for a query it cannot
+match; those count towards error_rate and not_found_rate but not towards
+unexpected_error_rate.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_http_load --items 20000 --concurrency 1 4 16 \\
+        --output load_$(git rev-parse --short HEAD).json
+    python -m benchmarks.bench_http_load --compare load_abc123.json
+"""
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from src.data_access.synthetic_data import SyntheticMovieData
+
+CATALOG_CSV = "src/artifacts/data_ingestion/movies.csv"
+
+ENDPOINTS = ("recommend", "search", "suggest")
+QUERY_CLASSES = ("exact", "acronym", "typo", "miss")
+
+
+# =====================================================
+# Synthetic artifacts
+# =====================================================
+def write_synthetic_artifacts(root: str, n_items: int, k: int, seed: int) -> None:
+    """
+    Minimal serving artifact set under root: a synthetic catalog in
+    data_ingestion/movies.csv and models/neighbor_indices.npy +
+    neighbor_scores.npy (k random neighbours per movie).
+    """
+    SyntheticMovieData(seed=seed).export_csv(
+        os.path.join(root, "data_ingestion", "movies.csv"), n_items
+    )
+
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.join(root, "models"), exist_ok=True)
+    k = min(k, n_items - 1)
+    offsets = rng.integers(1, n_items, size=(n_items, k))
+    indices = ((np.arange(n_items)[:, None] + offsets) % n_items).astype(np.int32)
+    scores = -np.sort(-rng.random((n_items, k), dtype=np.float32), axis=1)
+    np.save(os.path.join(root, "models", "neighbor_indices.npy"), indices)
+    np.save(os.path.join(root, "models", "neighbor_scores.npy"), scores)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(artifact_dir: str, port: int, timeout: float) -> subprocess.Popen:
+    """app.py on werkzeug's threaded server, serving artifact_dir."""
+    env = {
+        **os.environ,
+        "RECOMMENDER_ARTIFACT_DIR": artifact_dir,
+        "SKIP_ARTIFACT_SYNC": "1",
+    }
+    code = (
+        "from werkzeug.serving import run_simple\n"
+        "from app import app\n"
+        f"run_simple('127.0.0.1', {port}, app, threaded=True)\n"
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-c", code], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Server did not become healthy in time")
+
+
+# =====================================================
+# Query mix
+# =====================================================
+def parse_mix(spec: str, names: tuple) -> dict:
+    """Parse "recommend=0.6,search=0.2" into normalised weights over names."""
+    weights = dict.fromkeys(names, 0.0)
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in weights:
+            raise ValueError(f"Unknown mix entry {name!r}, expected one of {names}")
+        weights[name] = float(weight)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def make_query(query_class: str, titles: list, cum_votes: list, rng: random.Random) -> str:
+    if query_class == "miss":
+        return " ".join(
+            "".join(rng.choices("bcdfghjklmnpqrstvwxz", k=rng.randint(4, 8)))
+            for _ in range(rng.randint(1, 3))
+        )
+
+    title = rng.choices(titles, cum_weights=cum_votes)[0]
+    if query_class == "exact":
+        return title
+
+    if query_class == "acronym":
+        words = [w for w in title.replace(":", " ").replace(".", " ").split() if w[0].isalnum()]
+        return "".join(w[0] for w in words[:4]).lower()
+
+    # typo: drop, swap or replace one character
+    if len(title) < 3:
+        return title + "x"
+    i = rng.randrange(1, len(title) - 1)
+    kind = rng.choice(["drop", "swap", "replace"])
+    if kind == "drop":
+        return title[:i] + title[i + 1:]
+    if kind == "swap":
+        return title[:i - 1] + title[i] + title[i - 1] + title[i + 1:]
+    return title[:i] + rng.choice(string.ascii_lowercase) + title[i + 1:]
+
+
+def build_requests(catalog_csv: str, endpoint_mix: dict, query_mix: dict,
+                   n_unique: int, top_n: int, seed: int) -> list:
+    """(endpoint, query class, path) tuples, replayed in order by the clients."""
+    catalog = pd.read_csv(catalog_csv, usecols=["title", "vote_count"]).dropna(subset=["title"])
+    titles = catalog["title"].astype(str).tolist()
+    # Smoothed popularity so that unpopular titles are still requested
+    votes = np.sqrt(catalog["vote_count"].fillna(0).clip(lower=0).to_numpy()) + 1
+    cum_votes = np.cumsum(votes).tolist()
+
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(n_unique):
+        endpoint = rng.choices(list(endpoint_mix), weights=list(endpoint_mix.values()))[0]
+        query_class = rng.choices(list(query_mix), weights=list(query_mix.values()))[0]
+        query = make_query(query_class, titles, cum_votes, rng)
+
+        if endpoint == "recommend":
+            path = f"/recommend?title={quote(query)}&top_n={top_n}"
+        else:
+            prefix = query[:rng.randint(min(3, len(query)), max(3, len(query)))]
+            path = f"/{endpoint}?query={quote(prefix)}"
+        requests.append((endpoint, query_class, path))
+    return requests
+
+
+# =====================================================
+# Load generation
+# =====================================================
+def run_level(host: str, port: int, requests: list, concurrency: int,
+              duration: float, warmup: float) -> dict:
+    """Closed-loop load with `concurrency` clients for `duration` seconds."""
+    sequence = itertools.count()
+    samples = [[] for _ in range(concurrency)]
+    measuring = threading.Event()
+    stop = threading.Event()
+
+    def client(out: list) -> None:
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        while not stop.is_set():
+            endpoint, query_class, path = requests[next(sequence) % len(requests)]
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                body = response.read()
+                status = response.status
+                not_found = status == 500 and b"Movie not found" in body
+            except (OSError, http.client.HTTPException):
+                status, not_found = 0, False
+                connection.close()
+                connection = http.client.HTTPConnection(host, port, timeout=30)
+            if measuring.is_set():
+                out.append((
+                    endpoint, query_class, status, time.perf_counter() - started, not_found
+                ))
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(out,)) for out in samples]
+    for thread in threads:
+        thread.start()
+    time.sleep(warmup)
+    measuring.set()
+    started = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    elapsed = time.perf_counter() - started
+    for thread in threads:
+        thread.join()
+
+    return summarize([s for out in samples for s in out], concurrency, elapsed)
+
+
+def latency_summary(latencies: list) -> dict:
+    if not latencies:
+        return {}
+    ms = np.asarray(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def group_summary(samples: list, elapsed: float) -> dict:
+    n = len(samples)
+    errors = [s for s in samples if not 200 <= s[2] < 400]
+    not_found = sum(s[4] for s in errors)
+    return {
+        "requests": n,
+        "throughput_rps": round(n / elapsed, 1),
+        **latency_summary([s[3] for s in samples]),
+        "error_rate": round(len(errors) / n, 4) if n else 0.0,
+        "not_found_rate": round(not_found / n, 4) if n else 0.0,
+        "unexpected_error_rate": round((len(errors) - not_found) / n, 4) if n else 0.0,
+        "status_counts": {str(k): v for k, v in sorted(Counter(s[2] for s in samples).items())},
+    }
+
+
+def summarize(samples: list, concurrency: int, elapsed: float) -> dict:
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        **group_summary(samples, elapsed),
+        "by_endpoint": {
+            name: group_summary([s for s in samples if s[0] == name], elapsed)
+            for name in ENDPOINTS if any(s[0] == name for s in samples)
+        },
+        "by_query_class": {
+            name: group_summary([s for s in samples if s[1] == name], elapsed)
+            for name in QUERY_CLASSES if any(s[1] == name for s in samples)
+        },
+    }
+
+
+# =====================================================
+# Reporting
+# =====================================================
+def git_revision() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(
+                ["git", *args], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+
+def print_level(row: dict) -> None:
+    print(
+        f"{row['concurrency']:>6}{row['requests']:>10}{row['throughput_rps']:>10.1f}"
+        f"{row.get('p50_ms', 0):>9.2f}{row.get('p95_ms', 0):>9.2f}{row.get('p99_ms', 0):>9.2f}"
+        f"{row['error_rate']:>9.2%}{row['unexpected_error_rate']:>9.2%}"
+    )
+
+
+def print_comparison(previous: dict, current: dict) -> None:
+    """Throughput and p99 change per concurrency level against an earlier run."""
+    print(f"\nvs {previous['meta']['git'].get('commit')}:")
+    print(f"{'conc':>6}{'rps':>10}{'change':>9}{'p99 ms':>9}{'change':>9}")
+    before = {row["concurrency"]: row for row in previous["results"]}
+    for row in current["results"]:
+        old = before.get(row["concurrency"])
+        if old is None or not old.get("p99_ms"):
+            continue
+        print(
+            f"{row['concurrency']:>6}{row['throughput_rps']:>10.1f}"
+            f"{row['throughput_rps'] / old['throughput_rps'] - 1:>+9.1%}"
+            f"{row['p99_ms']:>9.2f}{row['p99_ms'] / old['p99_ms'] - 1:>+9.1%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP load test for the recommendation service")
+    parser.add_argument("--url", help="existing server to test (default: start one on synthetic artifacts)")
+    parser.add_argument("--catalog", default=CATALOG_CSV, help="movies.csv the --url server serves")
+    parser.add_argument("--items", type=int, default=20000, help="synthetic catalog size")
+    parser.add_argument("--neighbors", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds per level")
+    parser.add_argument("--endpoint-mix", default="recommend=0.6,search=0.2,suggest=0.2")
+    parser.add_argument("--query-mix", default="exact=0.55,acronym=0.1,typo=0.25,miss=0.1")
+    parser.add_argument("--unique-queries", type=int, default=5000)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    parser.add_argument("--compare", help="earlier --output JSON to compare against")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    endpoint_mix = parse_mix(args.endpoint_mix, ENDPOINTS)
+    query_mix = parse_mix(args.query_mix, QUERY_CLASSES)
+
+    with tempfile.TemporaryDirectory(prefix="load_test_") as tmp_dir:
+        server = None
+        if args.url:
+            target = urlsplit(args.url)
+            host, port = target.hostname, target.port or 80
+            catalog_csv = args.catalog
+        else:
+            write_synthetic_artifacts(tmp_dir, args.items, args.neighbors, args.seed)
+            host, port = "127.0.0.1", free_port()
+            server = start_server(tmp_dir, port, args.startup_timeout)
+            catalog_csv = os.path.join(tmp_dir, "data_ingestion", "movies.csv")
+
+        try:
+            requests = build_requests(
+                catalog_csv, endpoint_mix, query_mix,
+                args.unique_queries, args.top_n, args.seed
+            )
+
+            print(f"{'conc':>6}{'requests':>10}{'rps':>10}{'p50 ms':>9}{'p95 ms':>9}"
+                  f"{'p99 ms':>9}{'errors':>9}{'unexp.':>9}")
+            results = []
+            for concurrency in args.concurrency:
+                row = run_level(host, port, requests, concurrency, args.duration, args.warmup)
+                results.append(row)
+                print_level(row)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+    report = {
+        "meta": {
+            "git": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "target": args.url or "synthetic",
+        },
+        "config": vars(args),
+        "results": results,
+    }
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
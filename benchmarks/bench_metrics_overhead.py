@@ -0,0 +1,108 @@
+"""
+Overhead of the serving metrics (src/utils/metrics.py).
+
+1. Micro costs: one histogram observe, one StageTimer lap, the labelled
+   observe done by app.py's request hook, and a full /metrics render.
+2. Per request: MovieRecommenderEstimator.recommend_json with caches
+   disabled, so every request runs find_movie, the neighbour lookup and
+   serialisation, with metrics on vs off. Exact titles stop at the first
+   find_movie tier; titles with a dropped character go through every tier.
+   Runs are interleaved to cancel out machine noise. With metrics off the
+   timers still read the clock, so the difference is the cost of recording.
+   Per HTTP request add the request hook's labelled observe.
+
+Uses the artifacts in src/artifacts. Run from the repository root:
+
+    python -m benchmarks.bench_metrics_overhead
+"""
+import argparse
+import json
+import logging
+import random
+import time
+
+import numpy as np
+
+from src.entity.estimator import MovieRecommenderEstimator
+from src.utils import metrics
+from src.utils.metrics import Histogram, StageTimer
+
+
+def per_call_ns(fn, n: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter_ns() - started) / n
+
+
+def micro_costs(n: int) -> dict:
+    histogram = Histogram("bench_seconds", "bench", ("stage",))
+    child = histogram.labels("exact")
+    request_histogram = Histogram("bench_request_seconds", "bench", ("endpoint", "status"))
+
+    def lap():
+        StageTimer(histogram).lap("exact")
+
+    return {
+        "observe_ns": round(per_call_ns(lambda: child.observe(0.0001), n), 1),
+        "stage_timer_lap_ns": round(per_call_ns(lap, n), 1),
+        "labelled_observe_ns": round(
+            per_call_ns(lambda: request_histogram.labels("/recommend", "200").observe(0.0001), n), 1
+        ),
+        "render_us": round(per_call_ns(metrics.REGISTRY.render, 200) / 1000, 1),
+    }
+
+
+def interleaved(fn, queries: list, rounds: int) -> dict:
+    """Mean µs per request with metrics on and off, alternating per round."""
+    totals = {True: [], False: []}
+    for _ in range(rounds):
+        for enabled in (True, False):
+            metrics.set_enabled(enabled)
+            started = time.perf_counter()
+            for query in queries:
+                fn(query)
+            totals[enabled].append((time.perf_counter() - started) / len(queries) * 1e6)
+    metrics.set_enabled(True)
+
+    on, off = float(np.median(totals[True])), float(np.median(totals[False]))
+    return {"on_us": round(on, 2), "off_us": round(off, 2), "overhead_us": round(on - off, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics instrumentation overhead")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=11)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    micro = micro_costs(200_000)
+    print("micro:", micro)
+
+    estimator = MovieRecommenderEstimator(cache_size=0)
+    rng = random.Random(args.seed)
+    titles = [rng.choice(estimator.recommender.catalog.titles) for _ in range(args.queries)]
+    typos = [title[:len(title) // 2] + title[len(title) // 2 + 1:] for title in titles]
+
+    def recommend(query):
+        try:
+            estimator.recommend_json(query, 10)
+        except Exception:
+            pass
+
+    results = {
+        "exact_title": interleaved(recommend, titles, args.rounds),
+        "typo_title": interleaved(recommend, typos, args.rounds),
+    }
+    for name, row in results.items():
+        print(f"{name}: {row}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "micro": micro, "per_request": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Per-request cost of building a /recommend response: DataFrame slice +
+to_dict(orient="records") + jsonify (before) vs joining the catalog's
+precomputed record fragments into a Response (after). The similarity
+lookup is the same for both and is done up front, so only response
+assembly is measured.
+
+Latency is timed per request. Allocations are the peak bytes traced by
+tracemalloc while one response is built. Uses the artifacts in
+src/artifacts. Run from the repository root:
+
+    python -m benchmarks.bench_response_fragments --top-n 10
+"""
+import argparse
+import json
+import logging
+import random
+import time
+import tracemalloc
+
+import numpy as np
+from flask import Flask, Response
+
+from src.pipeline.prediction_pipeline import MovieRecommender
+from src.utils.serving_catalog import encode_json
+
+
+def build_dataframe_response(recommender, provider, matched_title, rows) -> Response:
+    records = recommender.catalog.frame(rows).to_dict(orient="records")
+    return provider.response({"matched_title": matched_title, "results": records})
+
+
+def build_fragment_response(recommender, provider, matched_title, rows) -> Response:
+    body = (
+        b'{"matched_title":' + encode_json(matched_title)
+        + b',"results":' + recommender.catalog.records_json(rows) + b"}"
+    )
+    return Response(body + b"\n", mimetype="application/json")
+
+
+def measure(build, recommender, provider, requests) -> dict:
+    for matched_title, rows in requests[:50]:
+        build(recommender, provider, matched_title, rows)
+
+    latencies = []
+    for matched_title, rows in requests:
+        started = time.perf_counter()
+        build(recommender, provider, matched_title, rows)
+        latencies.append(time.perf_counter() - started)
+
+    peaks = []
+    tracemalloc.start()
+    for matched_title, rows in requests[:200]:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        build(recommender, provider, matched_title, rows)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    latencies_us = np.asarray(latencies) * 1e6
+    return {
+        "p50_us": round(float(np.percentile(latencies_us, 50)), 1),
+        "p99_us": round(float(np.percentile(latencies_us, 99)), 1),
+        "mean_us": round(float(latencies_us.mean()), 1),
+        "peak_alloc_kb": round(float(np.mean(peaks)) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response assembly cost per request")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    recommender = MovieRecommender()
+    app = Flask(__name__)
+    provider = app.json
+
+    rng = random.Random(args.seed)
+    titles = [rng.choice(recommender.catalog.titles) for _ in range(args.requests)]
+    requests = [
+        (title, recommender.recommend_rows(title, args.top_n)) for title in titles
+    ]
+
+    # Both variants must produce the same bytes
+    for matched_title, rows in requests[:100]:
+        before = build_dataframe_response(recommender, provider, matched_title, rows)
+        after = build_fragment_response(recommender, provider, matched_title, rows)
+        assert before.get_data() == after.get_data()
+
+    print(f"{'variant':<12}{'p50 us':>9}{'p99 us':>9}{'mean us':>9}{'peak alloc KB':>15}")
+    results = []
+    for label, build in [
+        ("dataframe", build_dataframe_response),
+        ("fragments", build_fragment_response),
+    ]:
+        row = {"variant": label, **measure(build, recommender, provider, requests)}
+        results.append(row)
+        print(
+            f"{label:<12}{row['p50_us']:>9.1f}{row['p99_us']:>9.1f}"
+            f"{row['mean_us']:>9.1f}{row['peak_alloc_kb']:>15.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
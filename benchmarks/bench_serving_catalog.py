@@ -0,0 +1,120 @@
+"""
+Load time and per-worker memory of the serving catalog: the columnar
+ServingCatalog vs the full pandas DataFrame (plus title_norm and a Python
+set of title tokens per row) that MovieRecommender used to keep.
+
+Each variant is loaded in a fresh process and the retained memory is the
+RSS growth after loading. --copies replicates the catalog rows (with
+unique titles / poster URLs) to model a larger catalog. Linux only
+(/proc/self/statm). Run from the repository root:
+
+    python -m benchmarks.bench_serving_catalog --copies 1 10 50
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from src.pipeline.prediction_pipeline import normalize_text
+from src.utils.serving_catalog import ServingCatalog
+
+SOURCE_CSV = "src/artifacts/data_ingestion/movies.csv"
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def load_dataframe(path: str):
+    df = pd.read_csv(path)
+    df["title_norm"] = df["title"].apply(normalize_text)
+    df["title_tokens"] = df["title_norm"].apply(lambda x: set(x.split()))
+    df["rating"] = df["rating"].fillna(df["rating"].mean())
+    return df
+
+
+def load_catalog(path: str):
+    return ServingCatalog.from_csv(path, normalize_text)
+
+
+def worker(variant: str, path: str, results) -> None:
+    loader = {"dataframe": load_dataframe, "catalog": load_catalog}[variant]
+    gc.collect()
+    before = current_rss_mb()
+
+    started = time.perf_counter()
+    catalog = loader(path)
+    load_seconds = time.perf_counter() - started
+
+    gc.collect()
+    results.put({
+        "load_seconds": load_seconds,
+        "retained_mb": current_rss_mb() - before,
+        "rows": len(catalog),
+    })
+
+
+def run(variant: str, path: str) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=worker, args=(variant, path, results))
+    process.start()
+    row = results.get()
+    process.join()
+    return row
+
+
+def write_scaled_csv(path: str, copies: int) -> None:
+    df = pd.read_csv(SOURCE_CSV)
+    parts = []
+    for copy in range(copies):
+        part = df.copy()
+        if copy:
+            part["title"] = part["title"] + f" {copy}"
+            part["poster_url"] = part["poster_url"] + f"?v={copy}"
+        parts.append(part)
+    pd.concat(parts, ignore_index=True).to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serving catalog load time and memory")
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}{'variant':>11}{'load s':>9}{'retained MB':>13}")
+    results = []
+    with tempfile.TemporaryDirectory(prefix="catalog_bench_") as tmp_dir:
+        for copies in args.copies:
+            path = os.path.join(tmp_dir, f"movies_{copies}.csv")
+            write_scaled_csv(path, copies)
+
+            for variant in ["dataframe", "catalog"]:
+                runs = [run(variant, path) for _ in range(args.repeats)]
+                row = {
+                    "rows": runs[0]["rows"],
+                    "variant": variant,
+                    "load_seconds": round(min(r["load_seconds"] for r in runs), 3),
+                    "retained_mb": round(min(r["retained_mb"] for r in runs), 1),
+                }
+                results.append(row)
+                print(
+                    f"{row['rows']:>9}{variant:>11}{row['load_seconds']:>9.3f}"
+                    f"{row['retained_mb']:>13.1f}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
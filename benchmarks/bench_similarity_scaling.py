@@ -0,0 +1,74 @@
+"""
+Scaling benchmark for the parallel blocked similarity build.
+
+Builds a synthetic sparse TF-IDF-like catalog and times top_k_parallel
+with 1/2/4/8 workers. Run from the repository root:
+
+    python -m benchmarks.bench_similarity_scaling --items 50000
+"""
+import argparse
+import json
+import logging
+import time
+
+import numpy as np
+from scipy import sparse
+
+from src.utils.similarity_utils import top_k_parallel
+
+
+def synthetic_tfidf(n_items: int, n_features: int, nnz_per_row: int, seed: int):
+    density = nnz_per_row / n_features
+    return sparse.random(
+        n_items, n_features, density=density, format="csr",
+        dtype=np.float32, random_state=seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--features", type=int, default=5000)
+    parser.add_argument("--nnz-per-row", type=int, default=60)
+    parser.add_argument("--top-k", type=int, default=100)
+    parser.add_argument("--block-size", type=int, default=1024)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    # Per-block logs would swamp the table
+    logging.getLogger().setLevel(logging.WARNING)
+
+    matrix = synthetic_tfidf(args.items, args.features, args.nnz_per_row, args.seed)
+    print(f"Synthetic catalog: {matrix.shape}, nnz={matrix.nnz}")
+
+    results = []
+    reference = None
+    for n_jobs in args.workers:
+        started = time.perf_counter()
+        indices, _ = top_k_parallel(
+            matrix, k=args.top_k, block_size=args.block_size, n_jobs=n_jobs
+        )
+        seconds = time.perf_counter() - started
+
+        if reference is None:
+            reference = (seconds, indices)
+        speedup = reference[0] / seconds
+        identical = bool(np.array_equal(reference[1], indices))
+
+        results.append({
+            "workers": n_jobs,
+            "seconds": round(seconds, 3),
+            "speedup": round(speedup, 2),
+            "identical_to_first": identical,
+        })
+        print(f"workers={n_jobs:<2} {seconds:8.2f}s  speedup x{speedup:.2f}  identical={identical}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
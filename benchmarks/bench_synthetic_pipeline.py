@@ -0,0 +1,179 @@
+"""
+End-to-end run of training, evaluation and serving on synthetic catalogs,
+with no MongoDB or S3.
+
+For each --rows size a SyntheticMovieData catalog is streamed to a
+temporary directory. A fresh process then runs with
+RECOMMENDER_ARTIFACT_DIR pointing at the same directory and
+DATA_INGESTION_SOURCE_CSV pointing at the catalog, and times each pipeline
+stage: ingestion, validation, transformation, training, evaluation
+(TrainingPipeline.start_recommender_evaluation: exhaustive up to
+--eval-exhaustive-max rows, otherwise a sample sized to --eval-budget
+seconds), serving load, /recommend bodies for
+--queries random titles and uncached /recommend/text bodies for as many
+random vocabulary-term queries. The model is not pushed. The peak RSS
+of that process is reported too. Run from the repository root:
+
+    python -m benchmarks.bench_synthetic_pipeline --rows 10000 100000
+    python -m benchmarks.bench_synthetic_pipeline --rows 10000 --no-evaluation
+    python -m benchmarks.bench_synthetic_pipeline --rows 100000 --eval-budget 60 --eval-jobs 4
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from src.data_access.synthetic_data import SyntheticMovieData
+from src.constants import (
+    EVALUATION_EXHAUSTIVE_MAX_ITEMS,
+    EVALUATION_TIME_BUDGET_SECONDS,
+    EVALUATION_N_JOBS,
+)
+
+
+def worker(args: dict, results) -> None:
+    logging.disable(logging.INFO)
+    from src.pipeline.training_pipeline import TrainingPipeline
+    from src.entity.estimator import MovieRecommenderEstimator
+    from src.utils.main_utils import peak_rss_mb
+
+    stages = {}
+
+    def timed(stage, fn, *fn_args):
+        started = time.perf_counter()
+        result = fn(*fn_args)
+        stages[stage] = round(time.perf_counter() - started, 3)
+        return result
+
+    pipeline = TrainingPipeline()
+    ingestion = timed("ingestion", pipeline.start_data_ingestion)
+    validation = timed("validation", pipeline.start_data_validation, ingestion)
+    transformation = timed(
+        "transformation", pipeline.start_data_transformation, ingestion, validation
+    )
+    model = timed("training", pipeline.start_recommender_trainer, transformation)
+
+    evaluation = None
+    if args["evaluation"]:
+        config = pipeline.recommender_evaluation_config
+        config.exhaustive_max_items = args["eval_exhaustive_max"]
+        config.time_budget_seconds = args["eval_budget"]
+        config.n_jobs = args["eval_jobs"]
+        config.reload_from_disk = args["eval_reload"]
+        artifact = timed("evaluation", pipeline.start_recommender_evaluation, model)
+        evaluation = {
+            name: round(float(getattr(artifact, name)), 4)
+            for name in (
+                "precision_at_k", "recall_at_k", "f1_at_k", "genre_precision_at_k",
+                "catalog_coverage", "popularity_lift", "intra_list_diversity", "hubness_skewness",
+            )
+        }
+        evaluation.update(
+            n_evaluated=artifact.n_evaluated,
+            sampled=artifact.sampled,
+            confidence_intervals={
+                name: [round(low, 4), round(high, 4)]
+                for name, (low, high) in artifact.confidence_intervals.items()
+            },
+        )
+
+    estimator = timed("serving_load", MovieRecommenderEstimator, 0)
+    rng = random.Random(args["seed"])
+    titles = [rng.choice(estimator.recommender.catalog.titles) for _ in range(args["queries"])]
+    latencies = []
+    for title in titles:
+        started = time.perf_counter()
+        estimator.recommend_json(title, 10)
+        latencies.append(time.perf_counter() - started)
+
+    # Free-text queries: 2-5 random vocabulary terms each
+    vocabulary = estimator.recommender.text_index.vectorizer.get_feature_names_out().tolist()
+    text_latencies = []
+    for _ in range(args["queries"]):
+        query = " ".join(rng.sample(vocabulary, rng.randint(2, 5)))
+        started = time.perf_counter()
+        estimator.recommend_text_json(query, 10, use_cache=False)
+        text_latencies.append(time.perf_counter() - started)
+
+    ms = np.asarray(latencies) * 1000
+    text_ms = np.asarray(text_latencies) * 1000
+    results.put({
+        "stage_seconds": stages,
+        "similarity_mode": "dense" if model.cosine_similarity_path else "blocked",
+        "evaluation": evaluation,
+        "recommend_ms": {
+            "p50": round(float(np.percentile(ms, 50)), 3),
+            "p99": round(float(np.percentile(ms, 99)), 3),
+        },
+        "recommend_text_ms": {
+            "p50": round(float(np.percentile(text_ms, 50)), 3),
+            "p99": round(float(np.percentile(text_ms, 99)), 3),
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    })
+
+
+def run_size(n_rows: int, args: argparse.Namespace, tmp_dir: str) -> dict:
+    catalog_path = os.path.join(tmp_dir, f"catalog_{n_rows}.csv")
+    started = time.perf_counter()
+    SyntheticMovieData(seed=args.seed).export_csv(catalog_path, n_rows)
+    generate_seconds = time.perf_counter() - started
+
+    # Both are read when the child first imports src
+    os.environ["RECOMMENDER_ARTIFACT_DIR"] = os.path.join(tmp_dir, f"artifacts_{n_rows}")
+    os.environ["DATA_INGESTION_SOURCE_CSV"] = catalog_path
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=worker, args=(vars(args), results))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"Pipeline run on {n_rows} rows failed (exit code {process.exitcode})")
+    row = results.get()
+
+    return {
+        "rows": n_rows,
+        "generate_seconds": round(generate_seconds, 3),
+        "catalog_mb": round(os.path.getsize(catalog_path) / (1024 * 1024), 1),
+        **row,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training, evaluation and serving on synthetic catalogs")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000])
+    parser.add_argument("--queries", type=int, default=500, help="/recommend bodies timed")
+    parser.add_argument("--no-evaluation", dest="evaluation", action="store_false")
+    parser.add_argument("--eval-exhaustive-max", type=int, default=EVALUATION_EXHAUSTIVE_MAX_ITEMS,
+                        help="largest catalog evaluated on every movie")
+    parser.add_argument("--eval-budget", type=float, default=EVALUATION_TIME_BUDGET_SECONDS,
+                        help="seconds a sampled evaluation is sized to")
+    parser.add_argument("--eval-jobs", type=int, default=EVALUATION_N_JOBS)
+    parser.add_argument("--eval-reload", action="store_true",
+                        help="evaluate artifacts reloaded from disk instead of the trainer's in-memory copies")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="synthetic_pipeline_") as tmp_dir:
+        for n_rows in args.rows:
+            row = run_size(n_rows, args, tmp_dir)
+            results.append(row)
+            print(json.dumps(row, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
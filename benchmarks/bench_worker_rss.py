@@ -0,0 +1,159 @@
+"""
+Per-worker memory of the serving artifacts with and without memory-mapping.
+
+Starts 1, 4 and 8 concurrent worker processes (like gunicorn workers), each
+loading the similarity / neighbour artifacts the way MovieRecommender does
+and touching every page, then reports per-worker RSS, PSS (RSS with shared
+pages split across the processes mapping them) and private memory.
+With mmap the private column stays flat and PSS shrinks as workers are
+added; without it every worker pays for its own copy. Linux only
+(/proc/self/smaps_rollup). Run from the repository root:
+
+    python -m benchmarks.bench_worker_rss --synthetic-items 8000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.constants import (
+    MODEL_DIR,
+    COSINE_SIMILARITY_FILE_NAME,
+    NEIGHBOR_INDICES_FILE_NAME,
+    NEIGHBOR_SCORES_FILE_NAME,
+)
+
+ARTIFACT_FILE_NAMES = [
+    COSINE_SIMILARITY_FILE_NAME,
+    NEIGHBOR_INDICES_FILE_NAME,
+    NEIGHBOR_SCORES_FILE_NAME,
+]
+
+
+def read_smaps_rollup() -> dict:
+    """RSS / PSS / private memory of the current process in MB."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+
+    return {
+        "rss_mb": fields.get("Rss", 0.0),
+        "pss_mb": fields.get("Pss", 0.0),
+        "private_mb": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def write_synthetic_artifacts(model_dir: str, n_items: int, top_k: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    np.save(
+        os.path.join(model_dir, COSINE_SIMILARITY_FILE_NAME),
+        rng.random((n_items, n_items))
+    )
+    np.save(
+        os.path.join(model_dir, NEIGHBOR_INDICES_FILE_NAME),
+        rng.integers(0, n_items, size=(n_items, top_k), dtype=np.int32)
+    )
+    np.save(
+        os.path.join(model_dir, NEIGHBOR_SCORES_FILE_NAME),
+        rng.random((n_items, top_k), dtype=np.float32)
+    )
+
+
+def worker(paths, mmap_mode, loaded_barrier, done_barrier, results):
+    before = read_smaps_rollup()
+
+    started = time.perf_counter()
+    arrays = [np.load(path, mmap_mode=mmap_mode) for path in paths]
+    load_seconds = time.perf_counter() - started
+
+    # Touch every page, as a long-running worker eventually would
+    for array in arrays:
+        float(np.asarray(array).sum())
+
+    loaded_barrier.wait()
+    after = read_smaps_rollup()
+    results.put({
+        "load_seconds": load_seconds,
+        **{key: after[key] - before[key] for key in after},
+    })
+    done_barrier.wait()
+
+
+def run(paths, mmap_mode, n_workers):
+    ctx = multiprocessing.get_context("spawn")
+    loaded_barrier = ctx.Barrier(n_workers)
+    done_barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+
+    processes = [
+        ctx.Process(
+            target=worker,
+            args=(paths, mmap_mode, loaded_barrier, done_barrier, results)
+        )
+        for _ in range(n_workers)
+    ]
+    for process in processes:
+        process.start()
+
+    rows = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    return {
+        key: round(float(np.mean([row[key] for row in rows])), 3)
+        for key in rows[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker RSS of serving artifacts")
+    parser.add_argument("--model-dir", default=str(MODEL_DIR))
+    parser.add_argument("--synthetic-items", type=int,
+                        help="generate synthetic artifacts of this size instead")
+    parser.add_argument("--top-k", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="rss_bench_") as tmp_dir:
+        model_dir = args.model_dir
+        if args.synthetic_items:
+            model_dir = tmp_dir
+            write_synthetic_artifacts(model_dir, args.synthetic_items, args.top_k, args.seed)
+
+        paths = [
+            os.path.join(model_dir, name) for name in ARTIFACT_FILE_NAMES
+            if os.path.exists(os.path.join(model_dir, name))
+        ]
+        if not paths:
+            raise SystemExit(f"No model artifacts found in {model_dir}")
+
+        on_disk_mb = sum(os.path.getsize(path) for path in paths) / (1024 * 1024)
+        print(f"Artifacts: {len(paths)} files, {on_disk_mb:.1f} MB on disk")
+        print(f"{'mode':<7}{'workers':>8}{'load s':>9}{'RSS MB':>10}{'PSS MB':>10}{'private MB':>12}")
+
+        results = []
+        for mmap_mode, label in [(None, "eager"), ("r", "mmap")]:
+            for n_workers in args.workers:
+                row = run(paths, mmap_mode, n_workers)
+                results.append({"mode": label, "workers": n_workers, **row})
+                print(
+                    f"{label:<7}{n_workers:>8}{row['load_seconds']:>9.3f}"
+                    f"{row['rss_mb']:>10.1f}{row['pss_mb']:>10.1f}{row['private_mb']:>12.1f}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
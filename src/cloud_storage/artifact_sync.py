@@ -0,0 +1,228 @@
+import os
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from src.cloud_storage.aws_storage import SimpleStorageService
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import file_digests
+from src.constants import (
+    ARTIFACT_MANIFEST_FILE_NAME,
+    ARTIFACT_DOWNLOAD_STATE_PATH,
+    ARTIFACT_DOWNLOAD_WORKERS,
+    ARTIFACT_MULTIPART_THRESHOLD,
+    ARTIFACT_MULTIPART_CHUNKSIZE,
+    ARTIFACT_MULTIPART_CONCURRENCY,
+)
+
+
+class ArtifactSync:
+    """
+    Conditional, parallel download of model artifacts from S3.
+
+    Each artifact is compared with what is already on local disk (S3 ETag and
+    the checksum manifest written by ModelPusher), only changed files are
+    fetched, downloads run concurrently with multipart ranged GETs, and every
+    downloaded file is verified before it replaces the local copy.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        s3_prefix: str,
+        s3: SimpleStorageService = None,
+        state_path: str = ARTIFACT_DOWNLOAD_STATE_PATH,
+        max_workers: int = ARTIFACT_DOWNLOAD_WORKERS
+    ):
+        try:
+            self.bucket_name = bucket_name
+            self.s3_prefix = s3_prefix
+            self.s3 = s3 or SimpleStorageService()
+            self.state_path = str(state_path)
+            self.max_workers = max_workers
+            self.transfer_config = TransferConfig(
+                multipart_threshold=ARTIFACT_MULTIPART_THRESHOLD,
+                multipart_chunksize=ARTIFACT_MULTIPART_CHUNKSIZE,
+                max_concurrency=ARTIFACT_MULTIPART_CONCURRENCY,
+            )
+        except Exception as e:
+            raise MyException(e, sys)
+
+    # -------------------------------------------------
+    def _key(self, file_name: str) -> str:
+        return f"{self.s3_prefix}/{file_name}"
+
+    def _load_state(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            logging.warning(f"Ignoring unreadable download state: {self.state_path}")
+            return {}
+
+    def _save_state(self, state: dict) -> None:
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _remote_manifest(self) -> dict:
+        """Per-file checksums of the pushed model ({} for older registries)."""
+        try:
+            response = self.s3.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=self._key(ARTIFACT_MANIFEST_FILE_NAME)
+            )
+            return json.loads(response["Body"].read()).get("files", {})
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code", "") in ["404", "NoSuchKey"]:
+                logging.info("No artifact manifest in S3; verifying downloads by ETag/size")
+                return {}
+            raise
+
+    def _head(self, file_name: str):
+        """(etag, size) of the remote object, or None when it does not exist."""
+        try:
+            response = self.s3.s3_client.head_object(
+                Bucket=self.bucket_name, Key=self._key(file_name)
+            )
+            return response["ETag"].strip('"'), response["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code", "") in ["404", "NoSuchKey", "NotFound"]:
+                return None
+            raise
+
+    @staticmethod
+    def _is_current(local_path: str, recorded: dict, etag: str, size: int, expected: dict) -> bool:
+        """
+        The local file is up to date when it is exactly the file we verified
+        on a previous download (size + mtime) and that download had the
+        same remote ETag / manifest checksum.
+        """
+        if not recorded or not os.path.exists(local_path):
+            return False
+
+        stat = os.stat(local_path)
+        if stat.st_size != size or stat.st_size != recorded.get("size"):
+            return False
+        if stat.st_mtime_ns != recorded.get("mtime_ns"):
+            return False
+        if recorded.get("etag") != etag:
+            return False
+        if expected.get("sha256") and expected["sha256"] != recorded.get("sha256"):
+            return False
+        return True
+
+    def _download(self, file_name: str, local_path: str, etag: str, size: int, expected: dict) -> dict:
+        """Download to a temporary file, verify it, then move it into place."""
+        key = self._key(file_name)
+        tmp_path = f"{local_path}.download"
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+
+        logging.info(f"Downloading s3://{self.bucket_name}/{key} ({size} bytes)")
+        self.s3.s3_client.download_file(
+            self.bucket_name, key, tmp_path, Config=self.transfer_config
+        )
+
+        try:
+            sha256, md5 = file_digests(tmp_path)
+            actual_size = os.path.getsize(tmp_path)
+
+            if actual_size != size:
+                raise Exception(f"{file_name}: size {actual_size} != expected {size}")
+            if expected.get("sha256") and sha256 != expected["sha256"]:
+                raise Exception(f"{file_name}: sha256 mismatch with manifest")
+            # Single-part uploads use the content MD5 as ETag
+            if "-" not in etag and len(etag) == 32 and md5 != etag:
+                raise Exception(f"{file_name}: MD5 does not match S3 ETag")
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        os.replace(tmp_path, local_path)
+        stat = os.stat(local_path)
+        return {
+            "etag": etag,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+        }
+
+    # -------------------------------------------------
+    def sync(self, artifacts: list, force: bool = False) -> dict:
+        """
+        Bring local artifacts in line with S3.
+
+        :param artifacts: (file_name, local_path, required) tuples
+        :param force: download everything regardless of local state
+        :return: {"downloaded": [...], "unchanged": [...], "missing": [...]}
+        """
+        try:
+            state = {} if force else self._load_state()
+            manifest = self._remote_manifest()
+            summary = {"downloaded": [], "unchanged": [], "missing": []}
+
+            to_download = []
+            for file_name, local_path, required in artifacts:
+                local_path = str(local_path)
+                # A manifest lists every file of the pushed model, so an optional
+                # file it leaves out belongs to an older model even if S3 still has it
+                if manifest and not required and file_name not in manifest:
+                    remote = None
+                else:
+                    remote = self._head(file_name)
+
+                if remote is None:
+                    if required:
+                        raise Exception(f"Required artifact missing in S3: {self._key(file_name)}")
+                    logging.warning(f"Optional artifact not in the pushed model: {self._key(file_name)}")
+                    # Drop any stale local copy so it is not served against a new model
+                    if os.path.exists(local_path):
+                        os.remove(local_path)
+                    state.pop(file_name, None)
+                    summary["missing"].append(file_name)
+                    continue
+
+                etag, size = remote
+                expected = manifest.get(file_name, {})
+                if self._is_current(local_path, state.get(file_name), etag, size, expected):
+                    logging.info(f"Artifact unchanged, skipping download: {local_path}")
+                    summary["unchanged"].append(file_name)
+                    continue
+
+                to_download.append((file_name, local_path, etag, size, expected))
+
+            errors = []
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+                futures = {
+                    pool.submit(self._download, *item): item[0]
+                    for item in to_download
+                }
+                for future, file_name in futures.items():
+                    try:
+                        state[file_name] = future.result()
+                        summary["downloaded"].append(file_name)
+                    except Exception as e:
+                        state.pop(file_name, None)
+                        errors.append(f"{file_name}: {e}")
+
+            # Record what did succeed so a retry only fetches the failures
+            self._save_state(state)
+            if errors:
+                raise Exception(f"Artifact download failed: {'; '.join(errors)}")
+
+            logging.info(
+                f"Artifact sync done: {len(summary['downloaded'])} downloaded, "
+                f"{len(summary['unchanged'])} unchanged, {len(summary['missing'])} missing"
+            )
+            return summary
+
+        except Exception as e:
+            raise MyException(e, sys)
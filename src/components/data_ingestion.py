@@ -1,5 +1,6 @@
 import os
 import sys
+import shutil
 import pandas as pd
 
 from src.constants import COLLECTION_NAME
@@ -49,6 +50,28 @@ class DataIngestion:
         except Exception as e:
             raise MyException(e, sys)
 
+    def copy_source_csv_into_feature_store(self) -> str:
+        """
+        Use a local CSV (source_csv_path) as the feature store, bypassing
+        MongoDB; the file is copied as is, without loading it.
+        """
+        try:
+            source_path = self.data_ingestion_config.source_csv_path
+            logging.info(f"Starting data ingestion from local CSV: {source_path}")
+
+            feature_store_path = self.data_ingestion_config.ingested_data_path
+            os.makedirs(os.path.dirname(feature_store_path), exist_ok=True)
+            shutil.copyfile(source_path, feature_store_path)
+
+            logging.info(
+                f"Movie data saved to feature store at: {feature_store_path}"
+            )
+
+            return feature_store_path
+
+        except Exception as e:
+            raise MyException(e, sys)
+
     def initiate_data_ingestion(self) -> DataIngestionArtifact:
         """
         Initiates data ingestion pipeline
@@ -56,7 +79,10 @@ class DataIngestion:
         logging.info("Entered initiate_data_ingestion method")
 
         try:
-            self.export_data_into_feature_store()
+            if self.data_ingestion_config.source_csv_path:
+                self.copy_source_csv_into_feature_store()
+            else:
+                self.export_data_into_feature_store()
 
             data_ingestion_artifact = DataIngestionArtifact(
                 ingested_data_file_path=self.data_ingestion_config.ingested_data_path
@@ -38,11 +38,11 @@ class DataTransformation:
         """
         Drop IMDb-specific numeric columns not required for content-based recommendation
         """
-        drop_cols = ["imdb_rating", "imdb_voting"]
+        drop_cols = ["imdb_rating", "imdb_votes"]
         existing_cols = [col for col in drop_cols if col in df.columns]
 
         logging.info(f"Dropping columns: {existing_cols}")
-        return df.drop(columns=existing_cols, axis=1)
+        return df.drop(columns=existing_cols)
 
     def create_combined_text(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -1,11 +1,15 @@
 import sys
 import os
+import json
+from datetime import datetime
 
 from src.cloud_storage.aws_storage import SimpleStorageService
 from src.exception import MyException
 from src.logger import logging
 from src.entity.artifact_entity import RecommenderModelPusherArtifact
 from src.entity.config_entity import ModelPusherConfig
+from src.constants import ARTIFACT_MANIFEST_FILE_NAME
+from src.utils.main_utils import file_digests
 
 
 class ModelPusher:
@@ -20,6 +24,63 @@ class ModelPusher:
         except Exception as e:
             raise MyException(e, sys)
 
+    def write_manifest(self, local_artifact_dir: str) -> str:
+        """
+        Write a checksum manifest of the artifacts next to them, so serving
+        can skip unchanged files and verify the ones it downloads
+        """
+        try:
+            files = {}
+            for root, _, names in os.walk(local_artifact_dir):
+                for name in names:
+                    local_path = os.path.join(root, name)
+                    rel_path = os.path.relpath(local_path, local_artifact_dir).replace("\\", "/")
+                    if rel_path == ARTIFACT_MANIFEST_FILE_NAME:
+                        continue
+                    sha256, _ = file_digests(local_path)
+                    files[rel_path] = {
+                        "sha256": sha256,
+                        "size": os.path.getsize(local_path),
+                    }
+
+            manifest_path = os.path.join(local_artifact_dir, ARTIFACT_MANIFEST_FILE_NAME)
+            with open(manifest_path, "w") as f:
+                json.dump(
+                    {"created_at": datetime.now().isoformat(timespec="seconds"), "files": files},
+                    f,
+                    indent=2
+                )
+
+            logging.info(f"Artifact manifest written: {manifest_path} ({len(files)} files)")
+            return manifest_path
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def delete_stale_keys(self, manifest_path: str, bucket_name: str, s3_dir: str) -> list:
+        """
+        Delete keys under the model prefix that the new manifest does not list,
+        so files dropped from the model are not synced back by serving
+        """
+        try:
+            with open(manifest_path) as f:
+                keep = set(json.load(f)["files"]) | {ARTIFACT_MANIFEST_FILE_NAME}
+
+            prefix = f"{s3_dir}/"
+            bucket = self.s3.get_bucket(bucket_name)
+            stale = [
+                obj.key for obj in bucket.objects.filter(Prefix=prefix)
+                if obj.key[len(prefix):] and obj.key[len(prefix):] not in keep
+            ]
+
+            for key in stale:
+                logging.info(f"Deleting stale s3://{bucket_name}/{key}")
+                self.s3.s3_client.delete_object(Bucket=bucket_name, Key=key)
+            return stale
+
+        except Exception as e:
+            raise MyException(e, sys)
+
     def initiate_model_pusher(self) -> RecommenderModelPusherArtifact:
         """
         Upload recommender artifacts to S3
@@ -31,6 +92,8 @@ class ModelPusher:
             bucket_name = self.model_pusher_config.bucket_name
             s3_dir = self.model_pusher_config.s3_model_dir
 
+            manifest_path = self.write_manifest(local_artifact_dir)
+
             for root, _, files in os.walk(local_artifact_dir):
                 for file in files:
                     local_path = os.path.join(root, file)
@@ -48,6 +111,8 @@ class ModelPusher:
                         remove=False
                     )
 
+            self.delete_stale_keys(manifest_path, bucket_name, s3_dir)
+
             model_pusher_artifact = RecommenderModelPusherArtifact(
                 bucket_name=bucket_name,
                 s3_model_path=s3_dir
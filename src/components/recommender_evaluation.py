@@ -1,63 +1,472 @@
+import os
 import sys
+import time
+import tempfile
+import multiprocessing
 import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import normalize
 from src.exception import MyException
 from src.logger import logging
+from src.entity.artifact_entity import RecommenderEvaluationArtifact
+from src.utils.genre_matrix import GenreMatrix
+from src.utils.similarity_utils import save_shared_csr, load_shared_csr
+from src.constants import (
+    EVALUATION_BLOCK_SIZE,
+    EVALUATION_SEED,
+    EVALUATION_N_BOOTSTRAP,
+    EVALUATION_CONFIDENCE,
+    RANKING_REPORT_BLOCK_SIZE,
+    RANKING_REPORT_HEAD_FRACTION,
+    RANKING_REPORT_HISTOGRAM_BINS,
+    RANKING_REPORT_TOP_HUBS
+)
 
 
-class RecommenderEvaluation:
-    def __init__(self, df, cosine_sim, recommend_fn):
+def cosine_top_k(sim_block: np.ndarray, k: int) -> np.ndarray:
+    """
+    Ground-truth neighbours of every row of a similarity block: the columns
+    ranked 2..k+1 by score (descending, ties broken by the lower column).
+    The top-ranked column, normally the row itself, is dropped, exactly as
+    sorted(enumerate(row), key=score, reverse=True)[1:k+1] would.
+
+    :param sim_block: (rows, n_items) similarity scores
+    :param k: neighbours per row
+    :return: (rows, min(k, n_items - 1)) column indices
+    """
+    neg = -np.asarray(sim_block)
+    n_rows, n_cols = neg.shape
+    width = min(k + 1, n_cols)
+    if width <= 1:
+        return np.empty((n_rows, 0), dtype=np.int64)
+
+    top = np.argpartition(neg, width - 1, axis=1)[:, :width]
+    order = np.lexsort((top, np.take_along_axis(neg, top, axis=1)))
+    top = np.take_along_axis(top, order, axis=1)
+
+    # argpartition keeps arbitrary columns among ties at the cut; rank
+    # those rows again over every tied column
+    cut = np.take_along_axis(neg, top[:, -1:], axis=1)
+    for i in np.flatnonzero((neg <= cut).sum(axis=1) > width).tolist():
+        cols = np.flatnonzero(neg[i] <= cut[i, 0])
+        top[i] = cols[np.lexsort((cols, neg[i, cols]))][:width]
+
+    return top[:, 1:]
+
+
+def count_hits(truth: np.ndarray, pred: np.ndarray) -> np.ndarray:
+    """
+    TP / FP / FN of predicted against true index sets, row by row.
+
+    :param truth: (rows, m) true indices, distinct within a row
+    :param pred: (rows, p) predicted indices, -1 for padding; repeats
+                 within a row count once
+    :return: (rows, 3) int64 counts: tp, fp, fn
+    """
+    pred = np.sort(pred, axis=1)
+    distinct = pred >= 0
+    distinct[:, 1:] &= pred[:, 1:] != pred[:, :-1]
+
+    tp = ((pred[:, :, None] == truth[:, None, :]).any(axis=2) & distinct).sum(axis=1)
+    fp = distinct.sum(axis=1) - tp
+    fn = truth.shape[1] - tp
+    return np.stack([tp, fp, fn], axis=1).astype(np.int64)
+
+
+def ranking_metrics(tp, fp, fn) -> tuple:
+    """Micro-averaged precision / recall / F1 from summed counts (scalars or arrays)."""
+    precision = tp / (tp + fp + 1e-6)
+    recall = tp / (tp + fn + 1e-6)
+    f1 = 2 * precision * recall / (precision + recall + 1e-6)
+    return precision, recall, f1
+
+
+# =====================================================
+# Ground-truth similarity rows
+# =====================================================
+class SimilarityRows:
+    """
+    Rows of the cosine similarity matrix, read from the dense matrix when
+    training built one and otherwise computed from the TF-IDF matrix (the
+    same float64 values cosine_similarity gives), so catalogs trained in
+    blocked mode can be evaluated too.
+    """
+
+    def __init__(self, cosine_sim=None, tfidf_matrix=None, cosine_sim_path: str = None):
         """
-        df          : movie dataframe
-        cosine_sim  : cosine similarity matrix
-        recommend_fn: recommend() function
+        :param cosine_sim_path: .npy file holding cosine_sim, for workers to
+                                map when cosine_sim is an in-memory array
         """
-        self.df = df
+        if cosine_sim is None and tfidf_matrix is None:
+            raise ValueError("Either cosine_sim or tfidf_matrix is required")
         self.cosine_sim = cosine_sim
-        self.recommend_fn = recommend_fn
+        self.cosine_sim_path = cosine_sim_path
+        self.matrix = None
+        self.matrix_t = None
+        if cosine_sim is None:
+            self._set_matrix(normalize(sparse.csr_matrix(tfidf_matrix)))
 
-    def precision_recall_f1_at_k(self, k=10):
+    def _set_matrix(self, matrix: sparse.csr_matrix) -> None:
+        self.matrix = matrix
+        self.matrix_t = matrix.T.tocsr()
+
+    def __call__(self, rows: np.ndarray) -> np.ndarray:
+        if self.cosine_sim is None:
+            return (self.matrix[rows] @ self.matrix_t).toarray()
+        if len(rows) and rows[-1] - rows[0] == len(rows) - 1:
+            # Contiguous rows: a slice, no gather copy
+            return self.cosine_sim[rows[0]:rows[-1] + 1]
+        return self.cosine_sim[rows]
+
+    def share(self, shared_dir: str) -> tuple:
+        """
+        Where worker processes can memory-map this source from: the dense
+        .npy file (cosine_sim_path, the memmap's own file, or a copy written
+        to shared_dir as a last resort), or the normalised TF-IDF matrix as
+        CSR component files.
+
+        :return: from_shared() arguments
+        """
+        if self.cosine_sim is None:
+            save_shared_csr(self.matrix, shared_dir)
+            return ("tfidf", shared_dir, self.matrix.shape)
+
+        path = self.cosine_sim_path or getattr(self.cosine_sim, "filename", None)
+        if not path:
+            path = os.path.join(shared_dir, "cosine_similarity.npy")
+            np.save(path, self.cosine_sim)
+        return ("dense", path, None)
+
+    @classmethod
+    def from_shared(cls, kind: str, location: str, shape: tuple) -> "SimilarityRows":
+        if kind == "dense":
+            return cls(cosine_sim=np.load(location, mmap_mode="r"))
+        rows = cls.__new__(cls)
+        rows.cosine_sim = None
+        rows._set_matrix(load_shared_csr(location, shape))
+        return rows
+
+
+# =====================================================
+# Process pool workers (ground-truth ranking)
+# =====================================================
+_worker_similarity = None
+_worker_k = None
+
+
+def _init_evaluation_worker(source: tuple, k: int) -> None:
+    global _worker_similarity, _worker_k
+
+    _worker_similarity = SimilarityRows.from_shared(*source)
+    _worker_k = k
+
+
+def _rank_block(similarity: SimilarityRows, k: int, task: tuple) -> tuple:
+    """
+    :param task: (sample positions, catalog rows, padded predicted rows)
+    :return: (sample positions, per-row tp / fp / fn)
+    """
+    positions, rows, pred = task
+    return positions, count_hits(cosine_top_k(similarity(rows), k), pred)
+
+
+def _rank_block_worker(task: tuple) -> tuple:
+    return _rank_block(_worker_similarity, _worker_k, task)
+
+
+def bootstrap_intervals(
+    stats: np.ndarray,
+    metric_fn,
+    n_bootstrap: int,
+    confidence: float,
+    seed: int
+) -> dict:
+    """
+    Percentile bootstrap over movies: resample the rows of stats (one row of
+    counts per movie) with replacement, sum them and apply metric_fn.
+
+    :param stats: (movies, columns) per-movie counts
+    :param metric_fn: (resamples, columns) sums -> {name: (resamples,) values}
+    :return: {name: (low, high)}
+    """
+    m = len(stats)
+    if m == 0 or n_bootstrap <= 0:
+        return {}
+
+    rng = np.random.default_rng(seed)
+    # Keep each (resamples, movies) gather to a few million counts
+    chunk = max(1, min(n_bootstrap, 4_000_000 // (m * stats.shape[1])))
+    draws = {}
+    for start in range(0, n_bootstrap, chunk):
+        size = min(chunk, n_bootstrap - start)
+        sums = stats[rng.integers(0, m, size=(size, m))].sum(axis=1)
+        for name, values in metric_fn(sums).items():
+            draws.setdefault(name, []).append(values)
+
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for name, values in draws.items():
+        values = np.concatenate(values)
+        values = values[~np.isnan(values)]
+        if len(values):
+            low, high = np.quantile(values, [alpha, 1 - alpha])
+            intervals[name] = (float(low), float(high))
+    return intervals
+
+
+class RecommenderEvaluation:
+    def __init__(
+        self,
+        df,
+        cosine_sim,
+        recommend_fn,
+        recommend_many_fn=None,
+        block_size: int = EVALUATION_BLOCK_SIZE,
+        tfidf_matrix=None,
+        cosine_sim_path: str = None,
+        sample_size: int = None,
+        sample_fraction: float = None,
+        seed: int = EVALUATION_SEED,
+        n_jobs: int = 1,
+        n_bootstrap: int = EVALUATION_N_BOOTSTRAP,
+        confidence: float = EVALUATION_CONFIDENCE,
+        genre_matrix: GenreMatrix = None
+    ):
+        """
+        df               : movie dataframe
+        cosine_sim       : cosine similarity matrix, or None to compute the
+                           ground-truth rows from tfidf_matrix
+        recommend_fn     : recommend() function
+        recommend_many_fn: recommend_many_rows() function; predictions for a
+                           whole block of titles in one call (per-title
+                           recommend_fn calls when not given)
+        block_size       : similarity rows scored per step
+        tfidf_matrix     : TF-IDF matrix (needed when cosine_sim is None)
+        cosine_sim_path  : saved .npy of cosine_sim; n_jobs workers map it
+                           instead of a temporary copy of an in-memory matrix
+        sample_size      : evaluate this many movies drawn at random ...
+        sample_fraction  : ... or this fraction of the catalog; every movie
+                           when neither is given
+        seed             : seed of the sample and of the bootstrap
+        n_jobs           : worker processes ranking the ground truth
+        n_bootstrap      : bootstrap resamples for the confidence intervals
+                           (0 disables them)
+        confidence       : confidence level of the intervals
+        genre_matrix     : genres of df's rows (built from df["genres"]
+                           when not given)
+        """
+        try:
+            self.df = df
+            self.cosine_sim = cosine_sim
+            self.recommend_fn = recommend_fn
+            self.recommend_many_fn = recommend_many_fn
+            self.block_size = block_size
+            self.seed = seed
+            self.n_jobs = max(1, n_jobs)
+            self.n_bootstrap = n_bootstrap
+            self.confidence = confidence
+            self.similarity = SimilarityRows(cosine_sim, tfidf_matrix, cosine_sim_path)
+            if genre_matrix is None:
+                genre_matrix = GenreMatrix.from_values(self.df["genres"])
+            self.genres = genre_matrix
+            self._titles = self.df["title"].tolist()
+
+            # Predictions are scored by title: every row maps to the first row
+            # carrying the same title, as the per-title evaluation always did
+            positions = pd.Series(np.arange(len(self.df)))
+            self._first_row = positions.groupby(
+                self.df["title"].to_numpy(), sort=False, dropna=False
+            ).transform("first").to_numpy(dtype=np.int64)
+
+            self.sample_rows(sample_size, sample_fraction)
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    # =====================================================
+    # Sampling
+    # =====================================================
+    def sample_rows(self, sample_size: int = None, sample_fraction: float = None) -> np.ndarray:
+        """
+        Choose the movies to evaluate: a seeded random sample without
+        replacement, or every movie when neither argument is given (or the
+        sample would cover the whole catalog).
+
+        :return: sorted row positions
+        """
+        n = len(self.df)
+        if sample_fraction is not None:
+            sample_size = int(round(n * sample_fraction))
+
+        self.sampled = sample_size is not None and sample_size < n
+        if self.sampled:
+            rng = np.random.default_rng(self.seed)
+            self.rows = np.sort(rng.choice(n, size=max(1, sample_size), replace=False))
+        else:
+            self.rows = np.arange(n)
+        return self.rows
+
+    def sample_size_for_budget(
+        self,
+        budget_seconds: float,
+        k: int = 10,
+        min_sample_size: int = 1
+    ) -> int:
+        """
+        Number of movies that can be evaluated within what is left of
+        budget_seconds after a pilot block of random movies. The pilot's
+        serial share (recommendations, genre counts) stays per movie; only
+        its ground-truth ranking share is divided over the n_jobs workers
+        (at most one per CPU).
+        """
         try:
-            tp = fp = fn = 0
             n = len(self.df)
+            rng = np.random.default_rng(self.seed + 1)
+            pilot = np.sort(rng.choice(n, size=min(self.block_size, n), replace=False))
+
+            timings = {}
+            self._movie_stats(pilot, k, n_jobs=1, timings=timings)
+            workers = min(self.n_jobs, os.cpu_count() or 1)
+            per_movie = (timings["serial"] + timings["ranking"] / workers) / len(pilot)
+
+            remaining = budget_seconds - timings["serial"] - timings["ranking"]
+            size = int(max(remaining, 0) / max(per_movie, 1e-9))
+            size = min(n, max(min_sample_size, size))
+            logging.info(
+                f"Evaluation pilot: {per_movie * 1000:.3f} ms per movie "
+                f"({workers} ranking workers); {size} of {n} movies fit the "
+                f"{remaining:.1f} s left of a {budget_seconds} s budget"
+            )
+            return size
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    # =====================================================
+    # Per-movie counts
+    # =====================================================
+    def _recommended_rows(self, titles: list, k: int) -> list:
+        """
+        Row positions recommended for each query, None when the recommender
+        returned nothing.
+        """
+        if self.recommend_many_fn is not None:
+            return [
+                None if rows is None or not len(rows) else np.asarray(rows, dtype=np.int64)
+                for _, rows in self.recommend_many_fn(titles, top_n=k)
+            ]
 
-            for idx in range(n):
-                # Ground truth (pure cosine similarity)
-                true_indices = [
-                    i for i, _ in sorted(
-                        enumerate(self.cosine_sim[idx]),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[1:k+1]
-                ]
+        recommended = []
+        for title in titles:
+            _, preds = self.recommend_fn(title, top_n=k)
+            if preds is None or preds.empty:
+                recommended.append(None)
+                continue
+            recommended.append(self.df.index.get_indexer(preds.index).astype(np.int64))
+        return recommended
 
-                title = self.df.iloc[idx]["title"]
-                matched_title, preds = self.recommend_fn(title, top_n=k)
+    def _movie_stats(
+        self,
+        rows: np.ndarray,
+        k: int,
+        ranking: bool = True,
+        genre: bool = True,
+        n_jobs: int = None,
+        timings: dict = None
+    ) -> dict:
+        """
+        Counts per evaluated movie, in the order of rows.
+
+        :param timings: optional dict that receives the seconds spent in this
+                        process ("serial": recommendations, genre counts) and
+                        in the ground-truth ranking ("ranking", pool or not)
+
+        :return: {"evaluated": (m,) bool, the movie got recommendations,
+                  "ranking": (m, 3) tp / fp / fn against the top-k cosine
+                  neighbours, "genre": (m, 2) recommendations sharing a
+                  genre with the movie / recommendations}
+        """
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        m = len(rows)
+        stats = {
+            "evaluated": np.zeros(m, dtype=bool),
+            "ranking": np.zeros((m, 3), dtype=np.int64),
+            "genre": np.zeros((m, 2), dtype=np.int64),
+        }
+        started = time.perf_counter()
 
-                if preds is None or preds.empty:
-                    continue
+        # Recommendations and genre counts are served from this process;
+        # only the ground-truth ranking is handed to the pool
+        tasks = []
+        for start in range(0, m, self.block_size):
+            block = rows[start:start + self.block_size]
+            recommended = self._recommended_rows([self._titles[row] for row in block.tolist()], k)
 
-                pred_indices = [
-                    self.df.index[self.df["title"] == t][0]
-                    for t in preds["title"]
-                ]
+            keep = np.asarray([i for i, recs in enumerate(recommended) if recs is not None], dtype=np.int64)
+            if not len(keep):
+                continue
+            positions = start + keep
+            stats["evaluated"][positions] = True
+            lengths = np.asarray([len(recommended[i]) for i in keep.tolist()])
+            recs = np.concatenate([recommended[i] for i in keep.tolist()])
 
-                true_vec = np.zeros(n)
-                pred_vec = np.zeros(n)
+            if genre:
+                owner = np.repeat(np.arange(len(keep)), lengths)
+                shared = self.genres.shared_counts(block[keep][owner], recs)
+                stats["genre"][positions, 0] = np.bincount(
+                    owner, weights=shared > 0, minlength=len(keep)
+                ).astype(np.int64)
+                stats["genre"][positions, 1] = lengths
 
-                true_vec[true_indices] = 1
-                pred_vec[pred_indices] = 1
+            if ranking:
+                pred = np.full((len(keep), lengths.max()), -1, dtype=np.int64)
+                pred[np.arange(lengths.max()) < lengths[:, None]] = self._first_row[recs]
+                tasks.append((positions, block[keep], pred))
 
-                tp += np.sum((true_vec == 1) & (pred_vec == 1))
-                fp += np.sum((true_vec == 0) & (pred_vec == 1))
-                fn += np.sum((true_vec == 1) & (pred_vec == 0))
+        serial_done = time.perf_counter()
+        if n_jobs > 1 and len(tasks) > 1:
+            with tempfile.TemporaryDirectory(prefix="evaluation_") as shared_dir:
+                with multiprocessing.Pool(
+                    processes=min(n_jobs, len(tasks)),
+                    initializer=_init_evaluation_worker,
+                    initargs=(self.similarity.share(shared_dir), k)
+                ) as pool:
+                    for positions, counts in pool.imap_unordered(_rank_block_worker, tasks):
+                        stats["ranking"][positions] = counts
+        else:
+            for task in tasks:
+                positions, counts = _rank_block(self.similarity, k, task)
+                stats["ranking"][positions] = counts
 
-            precision = tp / (tp + fp + 1e-6)
-            recall = tp / (tp + fn + 1e-6)
-            f1 = 2 * precision * recall / (precision + recall + 1e-6)
+        if timings is not None:
+            timings["serial"] = serial_done - started
+            timings["ranking"] = time.perf_counter() - serial_done
+        return stats
+
+    # =====================================================
+    # Metrics
+    # =====================================================
+    def precision_recall_f1_at_k(self, k=10):
+        """
+        Micro-averaged precision / recall / F1 of the served recommendations
+        against the top-k cosine neighbours, over the evaluated movies.
+        Ground truth and hits are computed for blocks of rows at a time;
+        movies without recommendations are skipped.
+        """
+        try:
+            started = time.perf_counter()
+            stats = self._movie_stats(self.rows, k, genre=False)
+            tp, fp, fn = stats["ranking"].sum(axis=0).tolist()
+            precision, recall, f1 = ranking_metrics(tp, fp, fn)
 
             logging.info(f"Precision@{k}: {precision:.4f}")
             logging.info(f"Recall@{k}: {recall:.4f}")
             logging.info(f"F1@{k}: {f1:.4f}")
+            logging.info(
+                f"Ranking evaluation over {len(self.rows)} movies took "
+                f"{time.perf_counter() - started:.2f} s"
+            )
 
             return precision, recall, f1
 
@@ -65,23 +474,16 @@ class RecommenderEvaluation:
             raise MyException(e, sys)
 
     def genre_precision_at_k(self, k=10):
+        """
+        Share of recommendations that share at least one genre with the
+        movie they were recommended for, over the evaluated movies. Genres
+        come from one multi-hot matrix built per run; each block of
+        recommendations is scored with a single sparse gather and
+        intersection count.
+        """
         try:
-            total = 0
-            match = 0
-
-            for idx in range(len(self.df)):
-                title = self.df.iloc[idx]["title"]
-                base_genres = set(self.df.iloc[idx]["genres"].split())
-
-                _, preds = self.recommend_fn(title, top_n=k)
-                if preds is None:
-                    continue
-
-                for _, row in preds.iterrows():
-                    total += 1
-                    rec_genres = set(row["genres"].split())
-                    if base_genres & rec_genres:
-                        match += 1
+            stats = self._movie_stats(self.rows, k, ranking=False)
+            match, total = stats["genre"].sum(axis=0).tolist()
 
             precision = match / total
             logging.info(f"Genre Precision@{k}: {precision:.4f}")
@@ -90,3 +492,289 @@ class RecommenderEvaluation:
 
         except Exception as e:
             raise MyException(e, sys)
+
+    def evaluate(self, k=10) -> RecommenderEvaluationArtifact:
+        """
+        Precision / recall / F1 and genre precision in a single pass over the
+        evaluated movies, with percentile bootstrap confidence intervals
+        (movies resampled with replacement).
+        """
+        try:
+            started = time.perf_counter()
+            stats = self._movie_stats(self.rows, k)
+            per_movie = np.hstack([stats["ranking"], stats["genre"]])[stats["evaluated"]]
+
+            def metrics(sums: np.ndarray) -> dict:
+                precision, recall, f1 = ranking_metrics(sums[:, 0], sums[:, 1], sums[:, 2])
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    genre_precision = sums[:, 3] / sums[:, 4]
+                return {
+                    "precision_at_k": precision,
+                    "recall_at_k": recall,
+                    "f1_at_k": f1,
+                    "genre_precision_at_k": genre_precision,
+                }
+
+            point = {
+                name: float(values[0])
+                for name, values in metrics(per_movie.sum(axis=0, keepdims=True)).items()
+            }
+            intervals = bootstrap_intervals(
+                per_movie, metrics, self.n_bootstrap, self.confidence, self.seed
+            )
+            seconds = time.perf_counter() - started
+
+            artifact = RecommenderEvaluationArtifact(
+                **point,
+                n_evaluated=len(per_movie),
+                sampled=self.sampled,
+                confidence_intervals=intervals,
+                evaluation_seconds=round(seconds, 3)
+            )
+            mode = "sampled" if self.sampled else "exhaustive"
+            logging.info(
+                f"Evaluation@{k} ({mode}, {artifact.n_evaluated} movies, {seconds:.2f} s)"
+            )
+            for name, value in point.items():
+                low, high = intervals.get(name, (float("nan"), float("nan")))
+                logging.info(
+                    f"{name}: {value:.4f} [{low:.4f}, {high:.4f}] "
+                    f"({self.confidence:.0%} CI)"
+                )
+
+            return artifact
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+
+# =====================================================
+# Ranking-quality report (neighbour table)
+# =====================================================
+def intra_list_similarity(lists: np.ndarray, vectors, block_size: int = RANKING_REPORT_BLOCK_SIZE) -> np.ndarray:
+    """
+    Mean pairwise cosine similarity within every recommendation list.
+
+    The sum over ordered pairs i != j of x_i . x_j is |sum_i x_i|^2 minus
+    sum_i |x_i|^2, so each block of lists needs one sparse product (a 0/1
+    list-membership matrix times the item vectors) instead of k^2 row pairs.
+
+    :param lists: (n_lists, k) item rows
+    :param vectors: (n_items, dims) sparse item vectors with unit (or zero) rows
+    :return: (n_lists,) mean pairwise similarity (NaN when k < 2)
+    """
+    n_lists, k = lists.shape
+    if k < 2:
+        return np.full(n_lists, np.nan)
+
+    vectors = sparse.csr_matrix(vectors, dtype=np.float64)
+    squared_norms = np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel()
+
+    similarity = np.empty(n_lists)
+    for start in range(0, n_lists, block_size):
+        block = np.asarray(lists[start:start + block_size], dtype=np.int64)
+        m = len(block)
+        membership = sparse.csr_matrix(
+            (np.ones(m * k), block.ravel(), np.arange(0, m * k + 1, k)),
+            shape=(m, vectors.shape[0])
+        )
+        summed = membership @ vectors
+        pair_sums = (
+            np.asarray(summed.multiply(summed).sum(axis=1)).ravel()
+            - squared_norms[block].sum(axis=1)
+        )
+        similarity[start:start + m] = pair_sums / (k * (k - 1))
+    return similarity
+
+
+def _distribution(values: np.ndarray) -> dict:
+    """Mean, std and percentiles of an array (ignoring NaN)."""
+    values = np.asarray(values, dtype=np.float64).ravel()
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {}
+    percentiles = [1, 5, 25, 50, 75, 95, 99]
+    summary = {"mean": float(values.mean()), "std": float(values.std())}
+    for p, value in zip(percentiles, np.percentile(values, percentiles)):
+        summary[f"p{p}"] = float(value)
+    return summary
+
+
+class RankingQualityReport:
+    """
+    Beyond-accuracy view of the served top-k lists, read straight from the
+    neighbour table: catalog coverage, popularity bias (vote_count of what
+    gets recommended), intra-list diversity, hubness (how often each movie
+    appears in other movies' lists) and the similarity score distributions.
+
+    Every figure is a whole-array numpy operation over the (n, k) table,
+    except diversity, which is one sparse product per block of lists.
+    """
+
+    def __init__(
+        self,
+        neighbor_indices: np.ndarray,
+        neighbor_scores: np.ndarray,
+        vote_counts: np.ndarray,
+        k: int = 10,
+        titles: list = None,
+        genre_matrix: GenreMatrix = None,
+        tfidf_matrix=None,
+        block_size: int = RANKING_REPORT_BLOCK_SIZE
+    ):
+        """
+        neighbor_indices: (n, K) neighbour table, best first, self excluded
+        neighbor_scores : (n, K) matching similarity scores
+        vote_counts     : (n,) vote_count per movie (NaN counts as 0)
+        k               : list length scored (the first k neighbours)
+        titles          : movie titles, to name the biggest hubs
+        genre_matrix    : GenreMatrix, for genre diversity
+        tfidf_matrix    : TF-IDF matrix, for content diversity
+        block_size      : lists per sparse product in the diversity pass
+        """
+        try:
+            k = min(k, neighbor_indices.shape[1])
+            self.lists = np.asarray(neighbor_indices[:, :k], dtype=np.int64)
+            self.scores = np.asarray(neighbor_scores[:, :k], dtype=np.float64)
+            self.vote_counts = np.nan_to_num(np.asarray(vote_counts, dtype=np.float64))
+            self.k = k
+            self.titles = titles
+            self.genre_matrix = genre_matrix
+            self.tfidf_matrix = tfidf_matrix
+            self.block_size = block_size
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    # -------------------------------------------------
+    def coverage(self, occurrences: np.ndarray) -> dict:
+        recommended = int(np.count_nonzero(occurrences))
+        return {
+            "catalog_coverage": recommended / len(occurrences),
+            "items_recommended": recommended,
+            "items_never_recommended": len(occurrences) - recommended,
+        }
+
+    def popularity(self) -> dict:
+        """
+        vote_count of recommended movies against the catalog. The lift is
+        their mean over the catalog mean (1.0 = no bias); percentiles are
+        catalog popularity ranks (0.5 = no bias).
+        """
+        votes = self.vote_counts
+        n = len(votes)
+        percentile = pd.Series(votes).rank(pct=True).to_numpy()
+        head = percentile > 1 - RANKING_REPORT_HEAD_FRACTION
+
+        recommended_votes = votes[self.lists]
+        catalog_mean = float(votes.mean())
+        return {
+            "catalog_mean_vote_count": catalog_mean,
+            "catalog_median_vote_count": float(np.median(votes)),
+            "recommended_mean_vote_count": float(recommended_votes.mean()),
+            "recommended_median_vote_count": float(np.median(recommended_votes)),
+            "popularity_lift": (
+                float(recommended_votes.mean()) / catalog_mean if catalog_mean else float("nan")
+            ),
+            "mean_popularity_percentile": float(percentile[self.lists].mean()),
+            "head_fraction": RANKING_REPORT_HEAD_FRACTION,
+            "head_catalog_share": float(head.sum() / n),
+            "head_recommendation_share": float(head[self.lists].mean()),
+        }
+
+    def diversity(self) -> dict:
+        """
+        Intra-list diversity, 1 - mean pairwise cosine similarity of the
+        movies in a list: on TF-IDF vectors (content) and on genre vectors.
+        """
+        report = {}
+        sources = {
+            "content": self.tfidf_matrix,
+            "genre": None if self.genre_matrix is None else self.genre_matrix.matrix,
+        }
+        for name, vectors in sources.items():
+            if vectors is None:
+                continue
+            unit = normalize(sparse.csr_matrix(vectors, dtype=np.float64))
+            report[name] = _distribution(
+                1 - intra_list_similarity(self.lists, unit, self.block_size)
+            )
+        return report
+
+    def hubness(self, occurrences: np.ndarray) -> dict:
+        """
+        k-occurrence of every movie (lists it appears in). Its skewness is
+        the usual hubness measure (0 for a symmetric spread); Gini is 0
+        when every movie is recommended equally often.
+        """
+        counts = occurrences.astype(np.float64)
+        n = len(counts)
+        std = counts.std()
+        skewness = float(((counts - counts.mean()) ** 3).mean() / std ** 3) if std else 0.0
+        ranked = np.sort(counts)
+        gini = float(
+            2 * np.dot(np.arange(1, n + 1), ranked) / (n * ranked.sum()) - (n + 1) / n
+        ) if ranked.sum() else 0.0
+
+        top = max(1, n // 100)
+        hubs = np.argsort(-occurrences, kind="stable")[:RANKING_REPORT_TOP_HUBS]
+        return {
+            "k_occurrence_skewness": skewness,
+            "k_occurrence_gini": gini,
+            "max_k_occurrence": int(occurrences.max()),
+            "top_1pct_recommendation_share": float(
+                np.sort(occurrences)[-top:].sum() / occurrences.sum()
+            ),
+            "top_hubs": [
+                {
+                    "row": int(row),
+                    "title": None if self.titles is None else self.titles[row],
+                    "k_occurrence": int(occurrences[row]),
+                }
+                for row in hubs.tolist()
+            ],
+        }
+
+    def score_distribution(self) -> dict:
+        """Neighbour similarity scores: all k, the best and the k-th per list."""
+        counts, edges = np.histogram(
+            np.clip(self.scores, 0, 1), bins=RANKING_REPORT_HISTOGRAM_BINS, range=(0, 1)
+        )
+        return {
+            "all": _distribution(self.scores),
+            "top_1": _distribution(self.scores[:, 0]),
+            f"top_{self.k}": _distribution(self.scores[:, -1]),
+            "zero_score_share": float((self.scores <= 0).mean()),
+            "histogram": {
+                "edges": [round(float(edge), 4) for edge in edges],
+                "counts": counts.tolist(),
+            },
+        }
+
+    # -------------------------------------------------
+    def compute(self) -> dict:
+        try:
+            started = time.perf_counter()
+            n = len(self.lists)
+            report = {"k": self.k, "n_items": n}
+            if n == 0 or self.k == 0:
+                return report
+
+            occurrences = np.bincount(self.lists.ravel(), minlength=n)
+            report["coverage"] = self.coverage(occurrences)
+            report["popularity"] = self.popularity()
+            report["diversity"] = self.diversity()
+            report["hubness"] = self.hubness(occurrences)
+            report["scores"] = self.score_distribution()
+            report["seconds"] = round(time.perf_counter() - started, 3)
+
+            logging.info(
+                f"Ranking report@{self.k} over {n} movies ({report['seconds']} s): "
+                f"coverage={report['coverage']['catalog_coverage']:.4f}, "
+                f"popularity_lift={report['popularity']['popularity_lift']:.3f}, "
+                f"k_occurrence_skewness={report['hubness']['k_occurrence_skewness']:.3f}"
+            )
+            return report
+
+        except Exception as e:
+            raise MyException(e, sys)
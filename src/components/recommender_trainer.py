@@ -15,6 +15,9 @@ from src.entity.artifact_entity import (
 from src.exception import MyException
 from src.logger import logging
 from src.constants import COMBINED_TEXT_COLUMN
+from src.utils.similarity_utils import top_k_from_dense, top_k_parallel
+from src.utils.main_utils import save_numpy_atomic
+from src.utils.serving_catalog import CATALOG_COLUMNS
 
 
 class RecommenderTrainer:
@@ -29,6 +32,49 @@ class RecommenderTrainer:
         except Exception as e:
             raise MyException(e, sys)
 
+    def get_similarity_mode(self, n_items: int) -> str:
+        """
+        Resolve the configured similarity mode ("auto" picks dense for
+        small catalogs and blocked once the N x N matrix gets too large)
+        """
+        mode = self.recommender_model_config.similarity_mode
+        if mode == "auto":
+            max_items = self.recommender_model_config.dense_similarity_max_items
+            mode = "dense" if n_items <= max_items else "blocked"
+
+        if mode not in ("dense", "blocked"):
+            raise ValueError(f"Unknown similarity mode: {mode}")
+        return mode
+
+    def compute_similarity(self, tfidf_matrix):
+        """
+        Compute the neighbour table, plus the dense cosine matrix in dense mode.
+
+        :return: (cosine_sim or None, neighbor_indices, neighbor_scores)
+        """
+        try:
+            k = self.recommender_model_config.top_k_neighbors
+            mode = self.get_similarity_mode(tfidf_matrix.shape[0])
+            logging.info(f"Similarity mode: {mode}")
+
+            if mode == "dense":
+                cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
+                logging.info("Cosine similarity matrix computed")
+                neighbor_indices, neighbor_scores = top_k_from_dense(cosine_sim, k=k)
+                return cosine_sim, neighbor_indices, neighbor_scores
+
+            neighbor_indices, neighbor_scores = top_k_parallel(
+                tfidf_matrix,
+                k=k,
+                block_size=self.recommender_model_config.similarity_block_size,
+                n_jobs=self.recommender_model_config.similarity_n_jobs
+            )
+            logging.info("Blocked similarity computed (dense matrix not materialised)")
+            return None, neighbor_indices, neighbor_scores
+
+        except Exception as e:
+            raise MyException(e, sys)
+
     def initiate_recommender_trainer(self) -> RecommenderModelArtifact:
         """
         Train TF-IDF based recommender and save artifacts
@@ -51,9 +97,14 @@ class RecommenderTrainer:
             tfidf_matrix = tfidf.fit_transform(df[COMBINED_TEXT_COLUMN])
             logging.info("TF-IDF vectorization completed")
 
-            # Cosine similarity
-            cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
-            logging.info("Cosine similarity matrix computed")
+            # Cosine similarity + compact top-K neighbour table used for serving
+            cosine_sim, neighbor_indices, neighbor_scores = (
+                self.compute_similarity(tfidf_matrix)
+            )
+            logging.info(
+                f"Neighbour table computed: {neighbor_indices.shape} "
+                f"(top {neighbor_indices.shape[1]} per movie)"
+            )
 
             # Create model directory
             model_dir = self.recommender_model_config.model_dir
@@ -69,10 +120,24 @@ class RecommenderTrainer:
                 tfidf_matrix
             )
 
-            # Save cosine similarity matrix
-            np.save(
-                self.recommender_model_config.cosine_similarity_path,
-                cosine_sim
+            # Save cosine similarity matrix (dense mode only); drop a stale
+            # one from an earlier run so serving never pairs it with new data
+            cosine_similarity_path = self.recommender_model_config.cosine_similarity_path
+            if cosine_sim is not None:
+                save_numpy_atomic(cosine_similarity_path, cosine_sim)
+            else:
+                if os.path.exists(cosine_similarity_path):
+                    os.remove(cosine_similarity_path)
+                cosine_similarity_path = None
+
+            # Save neighbour table (indices + float32 scores)
+            save_numpy_atomic(
+                self.recommender_model_config.neighbor_indices_path,
+                neighbor_indices
+            )
+            save_numpy_atomic(
+                self.recommender_model_config.neighbor_scores_path,
+                neighbor_scores
             )
 
             logging.info("Recommender artifacts saved successfully")
@@ -80,7 +145,14 @@ class RecommenderTrainer:
             return RecommenderModelArtifact(
                 tfidf_vectorizer_path=self.recommender_model_config.tfidf_vectorizer_path,
                 tfidf_matrix_path=self.recommender_model_config.tfidf_matrix_path,
-                cosine_similarity_path=self.recommender_model_config.cosine_similarity_path
+                cosine_similarity_path=cosine_similarity_path,
+                neighbor_indices_path=self.recommender_model_config.neighbor_indices_path,
+                neighbor_scores_path=self.recommender_model_config.neighbor_scores_path,
+                catalog=df[CATALOG_COLUMNS],
+                tfidf_matrix=tfidf_matrix,
+                cosine_sim=cosine_sim,
+                neighbor_indices=neighbor_indices,
+                neighbor_scores=neighbor_scores
             )
 
         except Exception as e:
@@ -7,7 +7,10 @@ from datetime import date
 # ============================================================
 
 PIPELINE_NAME: str = "movie_recommendation_pipeline"
-ARTIFACT_DIR: Path = Path("src/artifacts")
+# Root of every artifact; RECOMMENDER_ARTIFACT_DIR points the pipelines and
+# the server at another tree (e.g. a synthetic one for load tests)
+ARTIFACT_DIR_ENV_KEY = "RECOMMENDER_ARTIFACT_DIR"
+ARTIFACT_DIR: Path = Path(os.getenv(ARTIFACT_DIR_ENV_KEY, "src/artifacts"))
 
 CURRENT_YEAR = date.today().year
 
@@ -27,6 +30,7 @@ DATA_INGESTION_DIR = ARTIFACT_DIR / "data_ingestion"
 DATA_VALIDATION_DIR = ARTIFACT_DIR / "data_validation"
 DATA_TRANSFORMATION_DIR = ARTIFACT_DIR / "data_transformation"
 MODEL_DIR = ARTIFACT_DIR / "models"
+EVALUATION_DIR = ARTIFACT_DIR / "evaluation"
 
 # Create dirs safely
 for dir_path in [
@@ -34,7 +38,8 @@ for dir_path in [
     DATA_INGESTION_DIR,
     DATA_VALIDATION_DIR,
     DATA_TRANSFORMATION_DIR,
-    MODEL_DIR
+    MODEL_DIR,
+    EVALUATION_DIR
 ]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
@@ -45,6 +50,21 @@ for dir_path in [
 DATA_INGESTION_COLLECTION_NAME = COLLECTION_NAME
 INGESTED_DATA_FILE_NAME = "movies.csv"
 INGESTED_DATA_PATH = DATA_INGESTION_DIR / INGESTED_DATA_FILE_NAME
+# Ingest this local CSV instead of the MongoDB collection (e.g. a synthetic catalog)
+DATA_INGESTION_SOURCE_CSV_ENV_KEY = "DATA_INGESTION_SOURCE_CSV"
+
+# ============================================================
+# Synthetic catalogs (scale testing)
+# ============================================================
+
+# Real catalog the synthetic distributions are fitted on
+SYNTHETIC_SOURCE_CSV_PATH = Path("data/movies_with_images_1.csv")
+SYNTHETIC_SEED = 42
+# Rows generated (and written) per chunk; output depends on seed and chunk size
+SYNTHETIC_CHUNK_SIZE = 100_000
+# Share of dotted acronym titles ("K.G.F: Chapter 2"), above the real rate
+# so that acronym matching is exercised at every catalog size
+SYNTHETIC_ACRONYM_TITLE_RATE = 0.02
 
 # ============================================================
 # Data Validation constants
@@ -75,16 +95,60 @@ TEXT_COLUMNS = [
 TFIDF_VECTORIZER_FILE_NAME = "tfidf_vectorizer.pkl"
 TFIDF_MATRIX_FILE_NAME = "tfidf_matrix.npz"
 COSINE_SIMILARITY_FILE_NAME = "cosine_similarity.npy"
+NEIGHBOR_INDICES_FILE_NAME = "neighbor_indices.npy"
+NEIGHBOR_SCORES_FILE_NAME = "neighbor_scores.npy"
 
 TFIDF_VECTORIZER_PATH = MODEL_DIR / TFIDF_VECTORIZER_FILE_NAME
 TFIDF_MATRIX_PATH = MODEL_DIR / TFIDF_MATRIX_FILE_NAME
 COSINE_SIMILARITY_PATH = MODEL_DIR / COSINE_SIMILARITY_FILE_NAME
+NEIGHBOR_INDICES_PATH = MODEL_DIR / NEIGHBOR_INDICES_FILE_NAME
+NEIGHBOR_SCORES_PATH = MODEL_DIR / NEIGHBOR_SCORES_FILE_NAME
+
+# Number of precomputed neighbours kept per movie (self excluded)
+TOP_K_NEIGHBORS = 100
+
+# Similarity build: "dense" (full N x N matrix), "blocked" (row blocks of the
+# sparse TF-IDF matrix, neighbour table only) or "auto" (dense up to
+# DENSE_SIMILARITY_MAX_ITEMS movies, blocked beyond)
+SIMILARITY_MODE = "auto"
+DENSE_SIMILARITY_MAX_ITEMS = 20000
+SIMILARITY_BLOCK_SIZE = 1024
+# Worker processes for the blocked build (1 = serial)
+SIMILARITY_N_JOBS = 1
 
 # ============================================================
 # Optional: Model Evaluation (Ranking metrics)
 # ============================================================
 
 TOP_K_RECOMMENDATIONS = 10
+# Similarity rows scored per vectorised evaluation step
+EVALUATION_BLOCK_SIZE = 256
+
+# Catalogs up to this size are evaluated on every movie; larger ones on a
+# random sample sized to finish within the time budget (never fewer than
+# EVALUATION_MIN_SAMPLE_SIZE movies)
+EVALUATION_EXHAUSTIVE_MAX_ITEMS = 20000
+EVALUATION_TIME_BUDGET_SECONDS = 300
+EVALUATION_MIN_SAMPLE_SIZE = 1000
+EVALUATION_SEED = 42
+# Worker processes for the ground-truth ranking (1 = serial)
+EVALUATION_N_JOBS = 1
+# Bootstrap resamples and level of the metric confidence intervals
+EVALUATION_N_BOOTSTRAP = 1000
+EVALUATION_CONFIDENCE = 0.95
+# Evaluate the trainer's in-memory catalog and matrices (False) or reload the
+# saved artifacts from disk like serving does (True)
+EVALUATION_RELOAD_FROM_DISK = False
+
+# Ranking-quality report (coverage, popularity, diversity, hubness, scores)
+RANKING_REPORT_FILE_NAME = "ranking_report.json"
+RANKING_REPORT_PATH = EVALUATION_DIR / RANKING_REPORT_FILE_NAME
+# Recommendation lists summed per sparse product in the diversity pass
+RANKING_REPORT_BLOCK_SIZE = 4096
+# Share of most-voted movies counted as the popularity "head"
+RANKING_REPORT_HEAD_FRACTION = 0.2
+RANKING_REPORT_HISTOGRAM_BINS = 20
+RANKING_REPORT_TOP_HUBS = 20
 
 # ============================================================
 # AWS / Cloud (optional – future extension)
@@ -97,9 +161,62 @@ REGION_NAME = "us-east-1"
 MODEL_BUCKET_NAME = "movie-recommender-mlops"
 MODEL_PUSHER_S3_KEY = "model-registry/movie-recommender"
 
+# Checksums of a pushed model (written by ModelPusher next to the artifacts)
+ARTIFACT_MANIFEST_FILE_NAME = "manifest.json"
+# ETag / checksum of every artifact downloaded to this machine
+ARTIFACT_DOWNLOAD_STATE_PATH = ARTIFACT_DIR / "download_state.json"
+ARTIFACT_DOWNLOAD_WORKERS = 4
+# Files above the threshold are fetched as concurrent ranged GETs
+ARTIFACT_MULTIPART_THRESHOLD = 16 * 1024 * 1024
+ARTIFACT_MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+ARTIFACT_MULTIPART_CONCURRENCY = 8
+
 # ============================================================
 # App / API constants
 # ============================================================
 
 APP_HOST = "0.0.0.0"
 APP_PORT = 5000
+
+# Estimator LRU caches (raw query -> matched title, (title, top_n) -> results)
+RECOMMEND_CACHE_SIZE = 4096
+RECOMMEND_CACHE_TTL_SECONDS = 3600
+
+# Maximum number of titles accepted by POST /recommend/batch
+MAX_BATCH_SIZE = 500
+
+# Hot reload: seconds between artifact checks (unset/0 = no file watching)
+# and the token required by the /admin/reload endpoint (unset = disabled)
+MODEL_WATCH_INTERVAL_ENV_KEY = "MODEL_WATCH_INTERVAL"
+ADMIN_TOKEN_ENV_KEY = "ADMIN_TOKEN"
+
+# "1" serves the artifacts already under ARTIFACT_DIR without syncing from S3
+SKIP_ARTIFACT_SYNC_ENV_KEY = "SKIP_ARTIFACT_SYNC"
+
+# "0" loads model artifacts into private memory instead of memory-mapping them
+SERVING_MMAP_ENV_KEY = "RECOMMENDER_MMAP"
+
+# Logging (src/logger): LOG_QUEUE=0 writes records synchronously instead of
+# through the background writer thread; LOG_LEVEL sets the root level and
+# LOG_LEVELS per-logger levels ("recommender.requests=WARNING,werkzeug=ERROR");
+# LOG_SAMPLE_RATES keeps a fraction of the DEBUG/INFO records of a logger
+# ("recommender.requests=0.01")
+LOG_QUEUE_ENV_KEY = "LOG_QUEUE"
+LOG_LEVEL_ENV_KEY = "LOG_LEVEL"
+LOG_LEVELS_ENV_KEY = "LOG_LEVELS"
+LOG_SAMPLE_RATES_ENV_KEY = "LOG_SAMPLE_RATES"
+# Per-request records (one or more per API call) are logged here
+REQUEST_LOGGER_NAME = "recommender.requests"
+
+# "0" turns the latency / cache metrics exposed on /metrics into no-ops
+METRICS_ENABLED_ENV_KEY = "METRICS_ENABLED"
+
+# Request profiling (off by default): PROFILE_ON_DEMAND=1 honours the
+# X-Profile header / ?profile=1, PROFILE_SAMPLE_RATE profiles a random
+# fraction of requests; profiles are written to PROFILE_DIR
+PROFILE_ON_DEMAND_ENV_KEY = "PROFILE_ON_DEMAND"
+PROFILE_SAMPLE_RATE_ENV_KEY = "PROFILE_SAMPLE_RATE"
+PROFILE_DIR_ENV_KEY = "PROFILE_DIR"
+PROFILE_DIR = os.path.join("logs", "profiles")
+PROFILE_TOP_FRAMES = 30
+PROFILE_MAX_FILES = 500
@@ -0,0 +1,269 @@
+import os
+import ast
+import sys
+import string
+import argparse
+import yaml
+import numpy as np
+import pandas as pd
+from collections import Counter
+
+from src.exception import MyException
+from src.logger import logging
+from src.constants import (
+    SCHEMA_FILE_PATH,
+    SYNTHETIC_SOURCE_CSV_PATH,
+    SYNTHETIC_SEED,
+    SYNTHETIC_CHUNK_SIZE,
+    SYNTHETIC_ACRONYM_TITLE_RATE,
+)
+
+
+class _Empirical:
+    """
+    Observed values and their frequencies, sampled with replacement in O(1)
+    per draw (alias method; rng.choice(p=...) does a binary search per draw).
+    """
+
+    def __init__(self, values):
+        counts = Counter(values)
+        self.values = np.empty(len(counts), dtype=object)
+        self.values[:] = list(counts.keys())
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        self._prob, self._alias = self._alias_table(weights / weights.sum())
+
+    @staticmethod
+    def _alias_table(p: np.ndarray) -> tuple:
+        """Vose's alias table: draw i uniformly, keep it with prob[i], else take alias[i]."""
+        n = len(p)
+        scaled = (p * n).tolist()
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, x in enumerate(scaled) if x < 1.0]
+        large = [i for i, x in enumerate(scaled) if x >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        return np.asarray(prob), np.asarray(alias, dtype=np.int64)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        picks = rng.integers(0, len(self.values), size=size)
+        keep = rng.random(size) < self._prob[picks]
+        return self.values[np.where(keep, picks, self._alias[picks])]
+
+
+def _parse_list(value) -> list:
+    """Parse a list literal such as "['Action', 'War']" (malformed values -> [])."""
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    return [str(item) for item in parsed] if isinstance(parsed, list) else []
+
+
+def _split_names(names) -> tuple:
+    """First-name and last-name tokens of a list of person names."""
+    first, last = [], []
+    for name in names:
+        parts = name.split(" ", 1)
+        if len(parts) == 2:
+            first.append(parts[0])
+            last.append(parts[1])
+    return first, last
+
+
+class SyntheticMovieData:
+    """
+    Synthetic movie catalogs of any size, shaped like the real one.
+
+    Distributions are fitted on the source CSV: title and overview words
+    and lengths, genre combinations, cast size, keyword counts and keyword
+    frequencies, ratings, vote counts and release dates. Cast and director
+    names are recombined from real first and last names, so the vocabulary
+    keeps growing with the catalog as it would in real data. The output has
+    the source CSV's columns (a superset of config/schema.yaml) and the same
+    list-literal encoding, so it runs through ingestion, validation,
+    training and serving unchanged.
+
+    Rows are generated in chunks, each from its own seeded generator, so a
+    catalog is reproducible for a given (seed, chunk_size) and memory stays
+    bounded by one chunk however many rows are written.
+    """
+
+    def __init__(
+        self,
+        source_csv_path: str = SYNTHETIC_SOURCE_CSV_PATH,
+        schema_file_path: str = SCHEMA_FILE_PATH,
+        seed: int = SYNTHETIC_SEED,
+        acronym_title_rate: float = SYNTHETIC_ACRONYM_TITLE_RATE
+    ):
+        """
+        :param source_csv_path: real catalog the distributions are fitted on
+        :param schema_file_path: schema whose columns the output must contain
+        :param seed: base seed; chunk i uses the generator seeded with (seed, i)
+        :param acronym_title_rate: share of dotted acronym titles ("K.G.F: ...")
+        """
+        try:
+            self.seed = seed
+            self.acronym_title_rate = acronym_title_rate
+
+            with open(schema_file_path, "r") as f:
+                self.schema = yaml.safe_load(f)
+
+            source = pd.read_csv(source_csv_path)
+            missing = set(self.schema["columns"]) - set(source.columns)
+            if missing:
+                raise Exception(f"Source catalog lacks schema columns: {missing}")
+
+            self.columns = source.columns.tolist()
+            self._fit(source)
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def _fit(self, source: pd.DataFrame) -> None:
+        titles = source["title"].dropna().astype(str).str.split()
+        self._title_length = _Empirical(titles.str.len())
+        self._title_words = _Empirical(word for words in titles for word in words)
+
+        overviews = source["overview"].dropna().astype(str).str.split()
+        self._overview_length = _Empirical(overviews.str.len())
+        self._overview_words = _Empirical(word for words in overviews for word in words)
+
+        self._genres = _Empirical(source["genres"].dropna().astype(str))
+
+        cast = source["cast"].map(_parse_list)
+        self._cast_size = _Empirical(cast.str.len())
+        first, last = _split_names(name for names in cast for name in names)
+        director_first, director_last = _split_names(source["director"].dropna().astype(str))
+        self._first_names = _Empirical(first + director_first)
+        self._last_names = _Empirical(last + director_last)
+
+        keywords = source["keywords"].map(_parse_list)
+        self._keyword_count = _Empirical(keywords.str.len())
+        self._keywords = _Empirical(word for words in keywords for word in words)
+
+        self._rating = _Empirical(source["rating"].dropna())
+        self._vote_count = _Empirical(source["vote_count"].dropna().astype(np.int64))
+        self._release_date = _Empirical(source["release_date"].dropna().astype(str))
+
+    # -------------------------------------------------
+    @staticmethod
+    def _join_runs(tokens: list, lengths: np.ndarray, sep: str = " ") -> list:
+        """Join consecutive runs of tokens; run i has lengths[i] tokens."""
+        bounds = np.concatenate([[0], np.cumsum(lengths)]).tolist()
+        return [sep.join(tokens[bounds[i]:bounds[i + 1]]) for i in range(len(lengths))]
+
+    @staticmethod
+    def _list_literals(items: list, lengths: np.ndarray) -> list:
+        """Runs of items encoded like the source ("['a', 'b']"), duplicates dropped."""
+        bounds = np.concatenate([[0], np.cumsum(lengths)]).tolist()
+        literals = []
+        for i in range(len(lengths)):
+            run = list(dict.fromkeys(items[bounds[i]:bounds[i + 1]]))
+            # Quotes and backslashes need repr's escaping
+            plain = "".join(run)
+            if "'" in plain or "\\" in plain:
+                literals.append(repr(run))
+            else:
+                literals.append("['" + "', '".join(run) + "']" if run else "[]")
+        return literals
+
+    def _names(self, rng: np.random.Generator, size: int) -> list:
+        first = self._first_names.sample(rng, size).tolist()
+        last = self._last_names.sample(rng, size).tolist()
+        return [f"{a} {b}" for a, b in zip(first, last)]
+
+    def _titles(self, rng: np.random.Generator, n_rows: int) -> list:
+        lengths = self._title_length.sample(rng, n_rows).astype(np.int64)
+        titles = self._join_runs(
+            self._title_words.sample(rng, int(lengths.sum())).tolist(), lengths
+        )
+
+        for i in np.flatnonzero(rng.random(n_rows) < self.acronym_title_rate).tolist():
+            letters = rng.choice(list(string.ascii_uppercase), size=rng.integers(2, 5))
+            titles[i] = ".".join(letters) + ": " + titles[i]
+        return titles
+
+    def generate_chunk(self, chunk_index: int, n_rows: int, first_id: int) -> pd.DataFrame:
+        """
+        One chunk of synthetic movies.
+
+        :param chunk_index: position of the chunk (selects its random stream)
+        :param n_rows: rows in the chunk
+        :param first_id: id of the first row
+        """
+        rng = np.random.default_rng([self.seed, chunk_index])
+        ids = np.arange(first_id, first_id + n_rows)
+
+        overview_lengths = self._overview_length.sample(rng, n_rows).astype(np.int64)
+        cast_sizes = self._cast_size.sample(rng, n_rows).astype(np.int64)
+        keyword_counts = self._keyword_count.sample(rng, n_rows).astype(np.int64)
+
+        chunk = pd.DataFrame({
+            "id": ids,
+            "title": self._titles(rng, n_rows),
+            "overview": self._join_runs(
+                self._overview_words.sample(rng, int(overview_lengths.sum())).tolist(),
+                overview_lengths
+            ),
+            "genres": self._genres.sample(rng, n_rows),
+            "cast": self._list_literals(self._names(rng, int(cast_sizes.sum())), cast_sizes),
+            "director": self._names(rng, n_rows),
+            "keywords": self._list_literals(
+                self._keywords.sample(rng, int(keyword_counts.sum())).tolist(), keyword_counts
+            ),
+            "rating": self._rating.sample(rng, n_rows).astype(np.float64),
+            "vote_count": self._vote_count.sample(rng, n_rows).astype(np.int64),
+            "release_date": self._release_date.sample(rng, n_rows),
+            "imdb_rating": np.nan,
+            "imdb_votes": np.nan,
+            "poster_url": [f"https://image.tmdb.org/t/p/w500/synthetic_{i}.jpg" for i in ids.tolist()],
+            "backdrop_url": [f"https://image.tmdb.org/t/p/w500/synthetic_{i}_bd.jpg" for i in ids.tolist()],
+        })
+        return chunk[[column for column in self.columns if column in chunk.columns]]
+
+    def iter_chunks(self, n_rows: int, chunk_size: int = SYNTHETIC_CHUNK_SIZE):
+        """Yield the catalog as DataFrames of at most chunk_size rows."""
+        for chunk_index, start in enumerate(range(0, n_rows, chunk_size)):
+            yield self.generate_chunk(chunk_index, min(chunk_size, n_rows - start), start + 1)
+
+    def export_csv(self, file_path: str, n_rows: int, chunk_size: int = SYNTHETIC_CHUNK_SIZE) -> str:
+        """
+        Stream a catalog of n_rows movies to a CSV file, one chunk at a time.
+
+        :return: file_path
+        """
+        try:
+            logging.info(f"Generating synthetic catalog: {n_rows} rows -> {file_path}")
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+            tmp_path = f"{file_path}.tmp"
+            for chunk_index, chunk in enumerate(self.iter_chunks(n_rows, chunk_size)):
+                chunk.to_csv(
+                    tmp_path,
+                    index=False,
+                    header=chunk_index == 0,
+                    mode="w" if chunk_index == 0 else "a"
+                )
+            os.replace(tmp_path, file_path)
+
+            logging.info(f"Synthetic catalog written to {file_path}")
+            return file_path
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic movie catalog CSV")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--seed", type=int, default=SYNTHETIC_SEED)
+    parser.add_argument("--chunk-size", type=int, default=SYNTHETIC_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    SyntheticMovieData(seed=args.seed).export_csv(args.output, args.rows, args.chunk_size)
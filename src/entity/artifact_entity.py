@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
 
 # =========================================================
@@ -37,7 +37,21 @@ class DataTransformationArtifact:
 class RecommenderModelArtifact:
     tfidf_vectorizer_path: str
     tfidf_matrix_path: str
-    cosine_similarity_path: str
+    cosine_similarity_path: Optional[str]
+    neighbor_indices_path: Optional[str] = None
+    neighbor_scores_path: Optional[str] = None
+    # In-memory copies of what was just written, handed to evaluation so it
+    # does not read the files back (None when the artifact was loaded or
+    # built without them)
+    catalog: Any = field(default=None, repr=False, compare=False)
+    tfidf_matrix: Any = field(default=None, repr=False, compare=False)
+    cosine_sim: Any = field(default=None, repr=False, compare=False)
+    neighbor_indices: Any = field(default=None, repr=False, compare=False)
+    neighbor_scores: Any = field(default=None, repr=False, compare=False)
+
+    @property
+    def in_memory(self) -> bool:
+        return self.catalog is not None and self.neighbor_indices is not None
 
 
 # # =========================================================
@@ -49,6 +63,18 @@ class RecommenderEvaluationArtifact:
     recall_at_k: float
     f1_at_k: float
     genre_precision_at_k: Optional[float] = None
+    # Movies evaluated, and whether they were a random sample of the catalog
+    n_evaluated: Optional[int] = None
+    sampled: bool = False
+    # metric name -> (low, high) bootstrap confidence interval
+    confidence_intervals: Optional[dict] = None
+    evaluation_seconds: Optional[float] = None
+    # Ranking quality of the served top-k lists (full figures in the report)
+    catalog_coverage: Optional[float] = None
+    popularity_lift: Optional[float] = None
+    intra_list_diversity: Optional[float] = None
+    hubness_skewness: Optional[float] = None
+    ranking_report_path: Optional[str] = None
 
 
 # # =========================================================
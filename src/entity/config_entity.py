@@ -33,6 +33,8 @@ class DataIngestionConfig:
         data_ingestion_dir, "movies.csv"
     )
     collection_name: str = COLLECTION_NAME
+    # Local CSV ingested instead of MongoDB when set (e.g. a synthetic catalog)
+    source_csv_path: str = os.getenv(DATA_INGESTION_SOURCE_CSV_ENV_KEY)
 
 
 @dataclass
@@ -62,11 +64,34 @@ class DataTransformationConfig:
 # # =========================================================
 #@dataclass
 class RecommenderModelConfig:
-    model_dir: str = "src/artifacts/models"
+    model_dir: str = str(MODEL_DIR)
     tfidf_vectorizer_path: str = os.path.join(model_dir, "tfidf_vectorizer.pkl")
     tfidf_matrix_path: str = os.path.join(model_dir, "tfidf_matrix.npz")
     cosine_similarity_path: str = os.path.join(model_dir, "cosine_similarity.npy")
-    
+    neighbor_indices_path: str = os.path.join(model_dir, NEIGHBOR_INDICES_FILE_NAME)
+    neighbor_scores_path: str = os.path.join(model_dir, NEIGHBOR_SCORES_FILE_NAME)
+    top_k_neighbors: int = TOP_K_NEIGHBORS
+    similarity_mode: str = SIMILARITY_MODE
+    dense_similarity_max_items: int = DENSE_SIMILARITY_MAX_ITEMS
+    similarity_block_size: int = SIMILARITY_BLOCK_SIZE
+    similarity_n_jobs: int = SIMILARITY_N_JOBS
+
+
+@dataclass
+class RecommenderEvaluationConfig:
+    top_k: int = TOP_K_RECOMMENDATIONS
+    exhaustive_max_items: int = EVALUATION_EXHAUSTIVE_MAX_ITEMS
+    time_budget_seconds: float = EVALUATION_TIME_BUDGET_SECONDS
+    min_sample_size: int = EVALUATION_MIN_SAMPLE_SIZE
+    seed: int = EVALUATION_SEED
+    n_jobs: int = EVALUATION_N_JOBS
+    n_bootstrap: int = EVALUATION_N_BOOTSTRAP
+    confidence: float = EVALUATION_CONFIDENCE
+    block_size: int = EVALUATION_BLOCK_SIZE
+    reload_from_disk: bool = EVALUATION_RELOAD_FROM_DISK
+    ranking_report_path: str = str(RANKING_REPORT_PATH)
+
+
 @dataclass
 class ModelPusherConfig:
     bucket_name: str
@@ -1,9 +1,23 @@
 import sys
+import time
 import pandas as pd
 
 from src.exception import MyException
-from src.logger import logging
+from src.logger import logging, request_logger
 from src.pipeline.prediction_pipeline import MovieRecommender
+from src.utils.lru_cache import LRUCache, MISSING
+from src.utils.serving_catalog import encode_json
+from src.utils import metrics
+from src.constants import RECOMMEND_CACHE_SIZE, RECOMMEND_CACHE_TTL_SECONDS
+
+
+SERIALIZE_SECONDS = metrics.histogram(
+    "recommender_serialize_seconds",
+    "Response body assembly latency (cache misses only)",
+    ("kind",)
+)
+_SERIALIZE_SINGLE_SECONDS = SERIALIZE_SECONDS.labels("single")
+_SERIALIZE_BATCH_SECONDS = SERIALIZE_SECONDS.labels("batch")
 
 
 class MovieRecommenderEstimator:
@@ -12,13 +26,160 @@ class MovieRecommenderEstimator:
     This replaces classifier-based estimators used in supervised ML.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_size: int = RECOMMEND_CACHE_SIZE,
+        cache_ttl_seconds: float = RECOMMEND_CACHE_TTL_SECONDS
+    ):
+        """
+        :param cache_size: entries per LRU cache (0 disables caching)
+        :param cache_ttl_seconds: cache entry lifetime (None = no expiry)
+        """
         try:
             logging.info("Initializing MovieRecommenderEstimator")
             self.recommender = MovieRecommender()
+
+            # raw query -> matched title, (matched title, top_n) -> response body.
+            # The recommender is never replaced, so entries stay valid for the
+            # estimator's lifetime; a new model comes with a new estimator
+            # (and empty caches) from the model reloader
+            self.query_cache = LRUCache(cache_size, cache_ttl_seconds)
+            self.result_cache = LRUCache(cache_size, cache_ttl_seconds)
         except Exception as e:
             raise MyException(e, sys)
 
+    @property
+    def model_version(self) -> str:
+        return self.recommender.model_version
+
+    def validate(self) -> None:
+        """Raise if the loaded model artifacts are inconsistent."""
+        try:
+            self.recommender.validate()
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def cache_metrics(self) -> list:
+        """Cache counters as metric families, built at scrape time."""
+        hits = metrics.Counter("recommender_cache_hits_total", "Cache hits", ("cache",))
+        misses = metrics.Counter("recommender_cache_misses_total", "Cache misses", ("cache",))
+        evictions = metrics.Counter(
+            "recommender_cache_evictions_total", "Cache evictions", ("cache",)
+        )
+        hit_ratio = metrics.Gauge(
+            "recommender_cache_hit_ratio", "Cache hits / lookups", ("cache",)
+        )
+        entries = metrics.Gauge("recommender_cache_entries", "Cached entries", ("cache",))
+
+        for cache, cache_obj in [("query", self.query_cache), ("result", self.result_cache)]:
+            stats = cache_obj.stats()
+            hits.labels(cache).inc(stats["hits"])
+            misses.labels(cache).inc(stats["misses"])
+            evictions.labels(cache).inc(stats["evictions"])
+            hit_ratio.labels(cache).set(stats["hit_rate"])
+            entries.labels(cache).set(stats["size"])
+
+        return [hits, misses, evictions, hit_ratio, entries]
+
+    def match_title(self, movie_name: str):
+        """
+        Resolve a raw user query to a catalog title (None if nothing matches).
+        """
+        matched_title = self.query_cache.get(movie_name)
+        if matched_title is MISSING:
+            matched_title = self.recommender.find_movie(movie_name)
+            self.query_cache.put(movie_name, matched_title)
+        return matched_title
+
+    def recommend_json(
+        self,
+        movie_name: str,
+        top_n: int = 10,
+        use_cache: bool = True,
+        genre: str = None
+    ) -> bytes:
+        """
+        Cached /recommend response body, assembled from the catalog's
+        precomputed record fragments (same bytes as jsonify would produce).
+
+        :param movie_name: Input movie name (user query)
+        :param top_n: Number of recommendations
+        :param use_cache: False runs the full matching / lookup path
+                          (e.g. when profiling a slow query)
+        :param genre: keep only recommendations of this genre
+        :return: JSON object {"matched_title": ..., "results": [...]}
+        """
+        try:
+            request_logger.info(
+                "Estimator received request: movie=%r, top_n=%s", movie_name, top_n
+            )
+
+            if use_cache:
+                matched_movie = self.match_title(movie_name)
+            else:
+                matched_movie = self.recommender.find_movie(movie_name)
+            if matched_movie is None:
+                raise Exception("Movie not found")
+
+            key = (matched_movie, top_n, genre and genre.lower())
+            body = self.result_cache.get(key) if use_cache else MISSING
+            if body is MISSING:
+                rows = self.recommender.recommend_rows(matched_movie, top_n, genre)
+                started = time.perf_counter()
+                body = (
+                    b'{"matched_title":' + encode_json(matched_movie)
+                    + b',"results":' + self.recommender.catalog.records_json(rows) + b"}"
+                )
+                _SERIALIZE_SINGLE_SECONDS.observe(time.perf_counter() - started)
+                if use_cache:
+                    self.result_cache.put(key, body)
+
+            return body
+
+        except Exception as e:
+            logging.error("Error occurred in MovieRecommenderEstimator", exc_info=True)
+            raise MyException(e, sys)
+
+    def recommend_text_json(
+        self,
+        query: str,
+        top_n: int = 10,
+        use_cache: bool = True,
+        genre: str = None
+    ) -> bytes:
+        """
+        Cached /recommend/text response body: movies matching a free-text
+        description, built from the catalog's precomputed record fragments.
+
+        :param query: free-text description ("space heist with a robot sidekick")
+        :param top_n: Number of recommendations
+        :param use_cache: False always scores the query
+        :param genre: only consider movies of this genre
+        :return: JSON object {"query": ..., "results": [...], "scores": [...]}
+        """
+        try:
+            request_logger.info("Estimator received text request: query=%r, top_n=%s", query, top_n)
+
+            key = ("text", query, top_n, genre and genre.lower())
+            body = self.result_cache.get(key) if use_cache else MISSING
+            if body is MISSING:
+                rows, scores = self.recommender.recommend_text_rows(query, top_n, genre)
+                started = time.perf_counter()
+                body = (
+                    b'{"query":' + encode_json(query)
+                    + b',"results":' + self.recommender.catalog.records_json(rows)
+                    + b',"scores":' + encode_json([round(score, 4) for score in scores]) + b"}"
+                )
+                _SERIALIZE_SINGLE_SECONDS.observe(time.perf_counter() - started)
+                if use_cache:
+                    self.result_cache.put(key, body)
+
+            return body
+
+        except Exception as e:
+            logging.error("Error occurred in MovieRecommenderEstimator", exc_info=True)
+            raise MyException(e, sys)
+
     def recommend(self, movie_name: str, top_n: int = 10) -> pd.DataFrame:
         """
         Generate movie recommendations.
@@ -28,8 +189,8 @@ class MovieRecommenderEstimator:
         :return: matched movie name + recommendations dataframe
         """
         try:
-            logging.info(
-                f"Estimator received request: movie='{movie_name}', top_n={top_n}"
+            request_logger.info(
+                "Estimator received request: movie=%r, top_n=%s", movie_name, top_n
             )
 
             matched_movie, recommendations = self.recommender.recommend(
@@ -43,6 +204,61 @@ class MovieRecommenderEstimator:
             logging.error("Error occurred in MovieRecommenderEstimator", exc_info=True)
             raise MyException(e, sys)
 
+    def is_known_genre(self, genre: str) -> bool:
+        return self.recommender.genre_matrix.genre_id(genre) is not None
+
+    def search_titles(self, query: str, limit: int = 10) -> pd.DataFrame:
+        """
+        Autocomplete lookup.
+
+        :param query: partial title typed by the user
+        :param limit: maximum number of matches
+        :return: matching catalog rows, most voted first
+        """
+        try:
+            rows = self.recommender.autocomplete(query, limit)
+            return self.recommender.catalog.frame(rows)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def recommend_many_json(self, movie_names: list, top_n: int = 10) -> bytes:
+        """
+        /recommend/batch response body built from precomputed record fragments.
+
+        :param movie_names: Input movie names (user queries)
+        :param top_n: Number of recommendations per title
+        :return: JSON object {"results": [...]}, one item per input
+        """
+        try:
+            request_logger.info(
+                "Estimator received batch request: %d titles, top_n=%s", len(movie_names), top_n
+            )
+
+            batch = self.recommender.recommend_many_rows(
+                movie_names, top_n=top_n, match_fn=self.match_title
+            )
+            catalog = self.recommender.catalog
+            started = time.perf_counter()
+
+            items = []
+            for movie_name, (matched_movie, rows) in zip(movie_names, batch):
+                if matched_movie is None:
+                    items.append(encode_json({"query": movie_name, "error": "Movie not found"}))
+                    continue
+                items.append(
+                    b'{"matched_title":' + encode_json(matched_movie)
+                    + b',"query":' + encode_json(movie_name)
+                    + b',"results":' + catalog.records_json(rows) + b"}"
+                )
+
+            body = b'{"results":[' + b",".join(items) + b"]}"
+            _SERIALIZE_BATCH_SECONDS.observe(time.perf_counter() - started)
+            return body
+
+        except Exception as e:
+            logging.error("Error occurred in MovieRecommenderEstimator", exc_info=True)
+            raise MyException(e, sys)
+
     def __repr__(self):
         return "MovieRecommenderEstimator()"
 
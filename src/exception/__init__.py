@@ -19,8 +19,10 @@ def error_message_detail(error: Exception, error_detail: sys) -> str:
     line_number = exc_tb.tb_lineno
     error_message = f"Error occurred in python script: [{file_name}] at line number [{line_number}]: {str(error)}"
     
-    # Log the error for better tracking
-    logging.error(error_message)
+    # Log the error for better tracking; a wrapped MyException was already
+    # logged where it was raised, so each error is logged once
+    if not isinstance(error, MyException):
+        logging.error(error_message)
     
     return error_message
 
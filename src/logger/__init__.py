@@ -1,11 +1,22 @@
 # filepath: C:\Users\abhis\yeshwanth\MOVIE-RECOMMENDATION-ENGINE-MLOPS\src\logger\__init__.py
 import os
 import sys
+import queue
+import atexit
+import random
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
 
+from src.constants import (
+    LOG_QUEUE_ENV_KEY,
+    LOG_LEVEL_ENV_KEY,
+    LOG_LEVELS_ENV_KEY,
+    LOG_SAMPLE_RATES_ENV_KEY,
+    REQUEST_LOGGER_NAME,
+)
+
 try:  # Add this line
     # Constants for log configuration
     LOG_DIR = 'logs'
@@ -27,13 +38,83 @@ try:  # Add this line
     # Construct the log file path
     log_file_path = log_dir_path / LOG_FILE
 
+    # Background writer used in queue mode (None when logging synchronously)
+    queue_listener = None
+
+    class SamplingFilter(logging.Filter):
+        """
+        Keeps a random fraction of a logger's DEBUG/INFO records; warnings
+        and errors always pass.
+        """
+
+        def __init__(self, rate: float):
+            super().__init__()
+            self.rate = min(max(rate, 0.0), 1.0)
+
+        def filter(self, record: logging.LogRecord) -> bool:
+            return record.levelno > logging.INFO or random.random() < self.rate
+
+    def parse_logger_settings(value: str) -> dict:
+        """Parse "name=value,name=value" into {name: value} (blank entries ignored)."""
+        settings = {}
+        for item in (value or "").split(","):
+            name, sep, setting = item.partition("=")
+            if sep and name.strip():
+                settings[name.strip()] = setting.strip()
+        return settings
+
+    def stop_queue_listener():
+        """Write out the queued records and stop the writer thread."""
+        if queue_listener is not None and queue_listener._thread is not None:
+            queue_listener.stop()
+
+    def flush_on_exit():
+        atexit.register(stop_queue_listener)
+        # multiprocessing children leave through os._exit, which skips atexit;
+        # forked ones also drop inherited finalizers, so re-add it after fork
+        mp_util = sys.modules.get("multiprocessing.util")
+        if mp_util is not None:
+            def add_finalizer(_=None):
+                mp_util.Finalize(None, stop_queue_listener, exitpriority=0)
+            add_finalizer()
+            mp_util.register_after_fork(queue_listener, add_finalizer)
+
+    def start_queue_listener(handlers: list) -> QueueHandler:
+        """
+        Route records through a queue to a writer thread that runs the real
+        handlers, so callers never wait on disk or console I/O.
+        """
+        global queue_listener
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        queue_listener.start()
+        flush_on_exit()
+
+        def restart_in_child():
+            # Threads do not survive fork (e.g. gunicorn --preload): give the
+            # child its own queue and writer thread
+            child_queue = queue.SimpleQueue()
+            queue_handler.queue = child_queue
+            queue_listener.queue = child_queue
+            queue_listener._thread = None
+            queue_listener.start()
+            flush_on_exit()
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=restart_in_child)
+        return queue_handler
+
     def configure_logger():
         """
-        Configures logging with a rotating file handler and a console handler.
+        Configures logging with a rotating file handler and a console handler,
+        written from a background thread unless LOG_QUEUE=0, plus per-logger
+        levels (LOG_LEVELS) and sampling (LOG_SAMPLE_RATES).
         """
         # Create a custom logger
         logger = logging.getLogger()
-        logger.setLevel(logging.DEBUG)
+        logger.setLevel(os.getenv(LOG_LEVEL_ENV_KEY, "DEBUG").upper())
 
         # Define formatter
         formatter = logging.Formatter("[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s")
@@ -64,10 +145,24 @@ try:  # Add this line
         console_handler.setLevel(logging.INFO)
 
         # Add handlers to the logger
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        if os.getenv(LOG_QUEUE_ENV_KEY, "1") != "0":
+            logger.addHandler(start_queue_listener([file_handler, console_handler]))
+        else:
+            logger.addHandler(file_handler)
+            logger.addHandler(console_handler)
+
+        for name, level in parse_logger_settings(os.getenv(LOG_LEVELS_ENV_KEY)).items():
+            logging.getLogger(name).setLevel(level.upper())
+
+        # Filters on a logger only see records logged through that logger
+        for name, rate in parse_logger_settings(os.getenv(LOG_SAMPLE_RATES_ENV_KEY)).items():
+            logging.getLogger(name).addFilter(SamplingFilter(float(rate)))
 
     # Configure the logger
     configure_logger()
+
+    # Per-request records; level and sampling are configured separately
+    # from the lifecycle logs that go to the root logger
+    request_logger = logging.getLogger(REQUEST_LOGGER_NAME)
 except Exception as e:  # Add this line
     print(f"An error occurred: {e}")  # Add this line
\ No newline at end of file
@@ -0,0 +1,212 @@
+import gc
+import sys
+import time
+import weakref
+import threading
+from datetime import datetime
+
+from src.exception import MyException
+from src.logger import logging
+from src.entity.estimator import MovieRecommenderEstimator
+from src.utils.main_utils import file_fingerprint
+from src.utils import metrics
+
+
+MODEL_LOAD_SECONDS = metrics.histogram(
+    "recommender_model_load_seconds",
+    "Time to load and validate a model (including artifact download)",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+)
+MODEL_LOADS = metrics.counter(
+    "recommender_model_loads_total",
+    "Model load attempts by result",
+    ("result",)
+)
+MODEL_LOADED_AT = metrics.gauge(
+    "recommender_model_loaded_timestamp_seconds",
+    "Unix time the live model was swapped in"
+)
+
+
+class ModelReloader:
+    """
+    Owns the live MovieRecommenderEstimator and replaces it without downtime.
+
+    A reload builds and validates a new estimator next to the live one, then
+    swaps the reference in a single assignment. Request handlers read
+    `reloader.estimator` once per request, so in-flight requests finish on
+    the model they started with. The old model is freed once the last of
+    them drops its reference.
+    """
+
+    def __init__(self, estimator_factory=MovieRecommenderEstimator, prepare_fn=None):
+        """
+        :param estimator_factory: callable returning a loaded estimator
+        :param prepare_fn: optional callable run before loading a new model
+                           (e.g. downloading artifacts from S3)
+        """
+        self._estimator_factory = estimator_factory
+        self._prepare_fn = prepare_fn
+        self._estimator = None
+        self._reload_lock = threading.Lock()
+        self._watch_thread = None
+        self._stop_watching = threading.Event()
+
+        self.status = {
+            "state": "empty",
+            "model_version": None,
+            "loaded_at": None,
+            "last_error": None,
+            "reloads": 0,
+        }
+
+    # -------------------------------------------------
+    @property
+    def estimator(self) -> MovieRecommenderEstimator:
+        return self._estimator
+
+    @property
+    def model_version(self) -> str:
+        estimator = self._estimator
+        return estimator.model_version if estimator is not None else None
+
+    def collect_metrics(self) -> list:
+        """Live model info and cache metrics, for MetricsRegistry collect hooks."""
+        info = metrics.Gauge(
+            "recommender_model_info", "Live model version and state",
+            ("model_version", "state")
+        )
+        info.labels(self.model_version or "none", self.status["state"]).set(1)
+
+        estimator = self._estimator
+        if estimator is None:
+            return [info]
+        return [info] + estimator.cache_metrics()
+
+    # -------------------------------------------------
+    def _build(self, prepare: bool) -> MovieRecommenderEstimator:
+        if prepare and self._prepare_fn is not None:
+            self._prepare_fn()
+
+        estimator = self._estimator_factory()
+        estimator.validate()
+
+        # The swap is what invalidates cached responses, so the new model
+        # must not bring any entries with it
+        if len(estimator.query_cache) or len(estimator.result_cache):
+            raise Exception("New estimator does not start with empty caches")
+        return estimator
+
+    def load(self, prepare: bool = True) -> bool:
+        """
+        Load, validate and swap in a new model (blocking).
+
+        :param prepare: run prepare_fn (artifact download) first
+        :return: True if the new model is live, False if a reload was
+                 already running or the new model failed validation
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            logging.warning("Model reload already in progress; request ignored")
+            return False
+
+        try:
+            previous_state = self.status["state"]
+            self.status["state"] = "loading"
+            started = time.perf_counter()
+
+            try:
+                new_estimator = self._build(prepare)
+            except Exception as e:
+                MODEL_LOADS.labels("failure").inc()
+                logging.error("Model reload failed; keeping the current model", exc_info=True)
+                self.status["state"] = "failed" if previous_state == "empty" else "serving"
+                self.status["last_error"] = str(e)
+                if self._estimator is None:
+                    raise MyException(e, sys)
+                return False
+
+            old_estimator = self._estimator
+            self._estimator = new_estimator
+
+            load_seconds = time.perf_counter() - started
+            MODEL_LOAD_SECONDS.observe(load_seconds)
+            MODEL_LOADS.labels("success").inc()
+            MODEL_LOADED_AT.set(time.time())
+
+            self.status.update({
+                "state": "serving",
+                "model_version": new_estimator.model_version,
+                "loaded_at": datetime.now().isoformat(timespec="seconds"),
+                "last_error": None,
+            })
+            if old_estimator is not None:
+                self.status["reloads"] += 1
+            logging.info(
+                f"Model {new_estimator.model_version} live after {load_seconds:.2f}s"
+            )
+
+            if old_estimator is not None:
+                old_version = old_estimator.model_version
+                weakref.finalize(
+                    old_estimator, logging.info, f"Model {old_version} released"
+                )
+                del old_estimator
+                gc.collect()
+
+            return True
+
+        finally:
+            self._reload_lock.release()
+
+    def reload_async(self, prepare: bool = True) -> bool:
+        """
+        Start a reload in a background thread.
+
+        :return: False if a reload is already running
+        """
+        if self._reload_lock.locked():
+            return False
+
+        threading.Thread(
+            target=self.load, kwargs={"prepare": prepare},
+            name="model-reload", daemon=True
+        ).start()
+        return True
+
+    # -------------------------------------------------
+    def watch(self, interval_seconds: float) -> None:
+        """
+        Poll the live model's artifact files and reload when they change.
+        A change must be stable for one extra poll, so a half-written
+        artifact set is never picked up.
+        """
+        if self._watch_thread is not None:
+            return
+
+        def _watch():
+            pending = rejected = None
+            while not self._stop_watching.wait(interval_seconds):
+                estimator = self._estimator
+                if estimator is None:
+                    continue
+
+                current = file_fingerprint(estimator.recommender.artifact_paths())
+                if current in (estimator.model_version, rejected):
+                    pending = None
+                elif current == pending:
+                    logging.info(f"Model artifacts changed on disk ({current}); reloading")
+                    if not self.load(prepare=False):
+                        # Do not retry the same broken artifact set every poll
+                        rejected = current
+                    pending = None
+                else:
+                    pending = current
+
+        self._watch_thread = threading.Thread(
+            target=_watch, name="model-watch", daemon=True
+        )
+        self._watch_thread.start()
+        logging.info(f"Watching model artifacts every {interval_seconds}s")
+
+    def stop_watching(self) -> None:
+        self._stop_watching.set()
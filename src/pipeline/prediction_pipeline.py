@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 import numpy as np
 import pandas as pd
 import unicodedata
@@ -7,26 +8,84 @@ import re
 from difflib import SequenceMatcher
 
 from src.exception import MyException
-from src.logger import logging
-from src.constants import COSINE_SIMILARITY_PATH
+from src.logger import logging, request_logger
+from src.utils.search_index import AutocompleteIndex
+from src.utils.serving_catalog import ServingCatalog
+from src.utils.text_index import TextQueryIndex
+from src.utils import metrics
+from src.utils.metrics import StageTimer
+from src.utils.main_utils import file_fingerprint
+from src.utils.similarity_utils import top_k_from_block
+from src.entity.artifact_entity import RecommenderModelArtifact
+from src.constants import (
+    ARTIFACT_DIR,
+    COSINE_SIMILARITY_PATH,
+    NEIGHBOR_INDICES_PATH,
+    NEIGHBOR_SCORES_PATH,
+    TFIDF_VECTORIZER_PATH,
+    TFIDF_MATRIX_PATH,
+    SERVING_MMAP_ENV_KEY,
+)
 
 
 # =====================================================
 # Text normalization (accents, symbols, acronyms)
 # =====================================================
+_SEPARATORS_RE = re.compile(r"[.\-_:]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def normalize_text(text: str) -> str:
     if not isinstance(text, str):
         return ""
 
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(c for c in text if not unicodedata.combining(c))
+    # ASCII has no decompositions or combining marks
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
     text = text.lower()
-    text = re.sub(r"[.\-_:]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _SEPARATORS_RE.sub(" ", text)
+    text = _WHITESPACE_RE.sub(" ", text).strip()
 
     return text
 
 
+# Fuzzy score = 0.7 * token Jaccard + 0.3 * sequence ratio, accepted above 0.5
+FUZZY_JACCARD_WEIGHT = 0.7
+FUZZY_SEQ_WEIGHT = 0.3
+FUZZY_THRESHOLD = 0.5
+
+
+# =====================================================
+# Serving metrics
+# =====================================================
+FIND_MOVIE_TIERS = ("exact", "substring", "acronym", "fuzzy", "none")
+
+FIND_MOVIE_SECONDS = metrics.histogram(
+    "recommender_find_movie_seconds",
+    "Title matching latency by the find_movie tier that resolved the query",
+    ("tier",)
+)
+FIND_MOVIE_STAGE_SECONDS = metrics.histogram(
+    "recommender_find_movie_stage_seconds",
+    "Time spent in each find_movie stage",
+    ("stage",)
+)
+SIMILARITY_SECONDS = metrics.histogram(
+    "recommender_similarity_seconds",
+    "Neighbour lookup / similarity sort latency",
+    ("mode",)
+)
+
+# Resolved once so the hot path skips label lookups
+_FIND_MOVIE_TIER_SECONDS = {tier: FIND_MOVIE_SECONDS.labels(tier) for tier in FIND_MOVIE_TIERS}
+for _stage in ("normalize", "exact", "substring", "acronym", "fuzzy"):
+    FIND_MOVIE_STAGE_SECONDS.labels(_stage)
+_SIMILARITY_SINGLE_SECONDS = SIMILARITY_SECONDS.labels("single")
+_SIMILARITY_BATCH_SECONDS = SIMILARITY_SECONDS.labels("batch")
+_SIMILARITY_TEXT_SECONDS = SIMILARITY_SECONDS.labels("text")
+
+
 def seq_ratio(a, b):
     return SequenceMatcher(None, a, b).ratio()
 
@@ -41,110 +100,512 @@ def jaccard(a, b):
 # Movie Recommender
 # =====================================================
 class MovieRecommender:
-    def __init__(self):
+    def __init__(self, mmap: bool = None, model_artifact: RecommenderModelArtifact = None):
+        """
+        :param mmap: memory-map the similarity / neighbour artifacts read-only
+                     so all worker processes share one page-cache copy
+                     (defaults to the RECOMMENDER_MMAP env var, on unless "0")
+        :param model_artifact: trainer output still holding its catalog and
+                               matrices in memory; they are used as they are
+                               and nothing is read from disk (no free-text
+                               index). Used to evaluate a freshly trained model
+        """
         try:
+            if mmap is None:
+                mmap = os.getenv(SERVING_MMAP_ENV_KEY, "1") != "0"
+            self.mmap_mode = "r" if mmap else None
+
+            if model_artifact is not None and model_artifact.in_memory:
+                self._init_from_memory(model_artifact)
+                return
+
             logging.info("Loading recommender artifacts")
+            self.catalog = self._load_latest_catalog()
+            self._index_catalog()
+
+            self._cosine_sim = None
+            self.cosine_sim_path = COSINE_SIMILARITY_PATH
+            self.neighbor_indices = None
+            self.neighbor_scores = None
+
+            if os.path.exists(NEIGHBOR_INDICES_PATH):
+                self.neighbor_indices = np.load(
+                    NEIGHBOR_INDICES_PATH, mmap_mode=self.mmap_mode
+                )
+                if os.path.exists(NEIGHBOR_SCORES_PATH):
+                    self.neighbor_scores = np.load(
+                        NEIGHBOR_SCORES_PATH, mmap_mode=self.mmap_mode
+                    )
+                logging.info(
+                    f"Serving from neighbour table: {self.neighbor_indices.shape} "
+                    f"(mmap={self.mmap_mode is not None})"
+                )
+            else:
+                # Older model registries only ship the dense matrix
+                self._cosine_sim = np.load(
+                    COSINE_SIMILARITY_PATH, mmap_mode=self.mmap_mode
+                )
+
+            # Free-text queries (/recommend/text) need the training TF-IDF
+            self.text_index = None
+            if os.path.exists(TFIDF_VECTORIZER_PATH) and os.path.exists(TFIDF_MATRIX_PATH):
+                self.text_index = TextQueryIndex.from_files(
+                    TFIDF_VECTORIZER_PATH, TFIDF_MATRIX_PATH
+                )
+                logging.info(
+                    f"Text query index loaded: {len(self.text_index)} movies, "
+                    f"{self.text_index.n_terms} terms"
+                )
+
+            self._artifact_paths = [
+                self.catalog_path,
+                NEIGHBOR_INDICES_PATH,
+                NEIGHBOR_SCORES_PATH,
+                COSINE_SIMILARITY_PATH,
+                TFIDF_VECTORIZER_PATH,
+                TFIDF_MATRIX_PATH,
+            ]
+            self.model_version = file_fingerprint(self.artifact_paths())
 
-            self.df = self._load_latest_dataframe()
+            logging.info(
+                f"Recommender artifacts loaded successfully (version {self.model_version})"
+            )
+
+        except Exception as e:
+            raise MyException(e, sys)
 
-            self.df["title_norm"] = self.df["title"].apply(normalize_text)
-            self.df["title_tokens"] = self.df["title_norm"].apply(
-                lambda x: set(x.split())
+    def _index_catalog(self) -> None:
+        """Lookup structures over the loaded catalog (titles, tokens, genres)."""
+        self._df = None
+        self.genre_matrix = self.catalog.genre_matrix()
+
+        self._build_title_index()
+        self._build_token_index()
+        self.autocomplete_index = AutocompleteIndex(
+            self.catalog.titles_norm,
+            self.catalog.vote_counts
+        )
+
+    def _init_from_memory(self, model_artifact: RecommenderModelArtifact) -> None:
+        logging.info("Building recommender from in-memory training artifacts")
+
+        self.catalog_path = None
+        self.catalog = ServingCatalog(model_artifact.catalog, normalize_text)
+        self._index_catalog()
+
+        # Only what the artifact holds is used: no dense fallback without
+        # its matrix, and the version comes from the files it was written to
+        self._cosine_sim = model_artifact.cosine_sim
+        self.cosine_sim_path = None
+        self.neighbor_indices = model_artifact.neighbor_indices
+        self.neighbor_scores = model_artifact.neighbor_scores
+        self.text_index = None
+        self._artifact_paths = [
+            path for path in (
+                model_artifact.neighbor_indices_path,
+                model_artifact.neighbor_scores_path,
+                model_artifact.cosine_similarity_path,
+                model_artifact.tfidf_vectorizer_path,
+                model_artifact.tfidf_matrix_path,
             )
+            if path is not None
+        ]
+        self.model_version = file_fingerprint(self.artifact_paths())
 
-            self.df["rating"] = self.df["rating"].fillna(
-                self.df["rating"].mean()
+    # -------------------------------------------------
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        Catalog as a DataFrame (title, genres, rating, poster_url, vote_count),
+        built on first access for offline use such as evaluation; serving
+        reads the columnar catalog directly.
+        """
+        if self._df is None:
+            self._df = self.catalog.frame(
+                columns=["title", "genres", "rating", "poster_url", "vote_count"]
+            )
+        return self._df
+
+    @property
+    def cosine_sim(self) -> np.ndarray:
+        """
+        Dense similarity matrix, loaded on first access only
+        (serving uses the neighbour table when available); None for an
+        in-memory model built without one.
+        """
+        if self._cosine_sim is None and self.cosine_sim_path is not None:
+            self._cosine_sim = np.load(
+                self.cosine_sim_path, mmap_mode=self.mmap_mode
             )
+        return self._cosine_sim
 
-            self.cosine_sim = np.load(COSINE_SIMILARITY_PATH)
+    def _has_dense_similarity(self) -> bool:
+        """Whether the dense matrix is available for top_n beyond the neighbour table."""
+        if self._cosine_sim is not None:
+            return True
+        return self.cosine_sim_path is not None and os.path.exists(self.cosine_sim_path)
 
-            logging.info("Recommender artifacts loaded successfully")
+    # -------------------------------------------------
+    def artifact_paths(self) -> list:
+        """Files this model is served from (also its version fingerprint)."""
+        return list(self._artifact_paths)
+
+    def validate(self) -> None:
+        """
+        Sanity-check a freshly loaded model before it goes live: artifacts
+        must describe the same catalog and a recommendation must succeed.
+        """
+        n = len(self.catalog)
+        if n == 0:
+            raise Exception("Catalog is empty")
+
+        if self.neighbor_indices is not None:
+            if self.neighbor_indices.shape[0] != n:
+                raise Exception(
+                    f"Neighbour table has {self.neighbor_indices.shape[0]} rows, "
+                    f"catalog has {n}"
+                )
+            sample = np.asarray(self.neighbor_indices[[0, n - 1]])
+            if sample.size and (sample.min() < 0 or sample.max() >= n):
+                raise Exception("Neighbour table references rows outside the catalog")
+
+        # The dense matrix also serves top_n > K, so check it whenever it ships
+        if self.neighbor_indices is None or self._has_dense_similarity():
+            if self.cosine_sim.shape != (n, n):
+                raise Exception(
+                    f"Similarity matrix shape {self.cosine_sim.shape} does not match "
+                    f"catalog size {n}"
+                )
+
+        if self.text_index is not None and len(self.text_index) != n:
+            raise Exception(
+                f"TF-IDF matrix has {len(self.text_index)} rows, catalog has {n}"
+            )
 
-        except Exception as e:
-            raise MyException(e, sys)
+        self.recommend_title(self.catalog.title_at(0), top_n=min(5, n - 1))
 
     # -------------------------------------------------
-    def _load_latest_dataframe(self) -> pd.DataFrame:
-        for root, _, files in os.walk("src/artifacts"):
+    def _load_latest_catalog(self) -> ServingCatalog:
+        for root, _, files in os.walk(ARTIFACT_DIR):
             for file in files:
                 if file == "movies.csv":
-                    return pd.read_csv(os.path.join(root, file))
+                    self.catalog_path = os.path.join(root, file)
+                    return ServingCatalog.from_csv(self.catalog_path, normalize_text)
         raise Exception("movies.csv not found in artifacts")
 
+    # -------------------------------------------------
+    def _build_title_index(self) -> None:
+        """
+        O(1) lookup tables built once at load time:
+          title_norm_index: title_norm -> row ids, most voted first
+          title_index:      title      -> row id of the most voted movie
+        Ties on vote_count keep catalog order, so duplicate titles
+        (remakes) always resolve to the same row.
+        """
+        votes = np.nan_to_num(self.catalog.vote_counts)
+        order = np.lexsort((np.arange(len(self.catalog)), -votes)).tolist()
+
+        titles = self.catalog.titles
+        norms = self.catalog.titles_norm
+
+        self.title_norm_index = {}
+        self.title_index = {}
+        for row in order:
+            self.title_norm_index.setdefault(norms[row], []).append(row)
+            self.title_index.setdefault(titles[row], row)
+
+        # Normalised titles in the same order, for "most voted match" scans
+        self._rows_by_votes = order
+        self._norms_by_votes = [norms[row] for row in order]
+
+    def _build_token_index(self) -> None:
+        """
+        Inverted index title token -> row ids (ascending) for the fuzzy fallback
+        """
+        self.token_index = self.catalog.token_postings()
+        self.title_token_counts = self.catalog.token_counts
+
+    def _exact_match(self, q: str):
+        rows = self.title_norm_index.get(q)
+        if rows:
+            return self.catalog.title_at(rows[0])
+        return None
+
+    def _most_voted_containing(self, q: str):
+        """Most voted title whose normalised form contains q (None if none)."""
+        for pos, title_norm in enumerate(self._norms_by_votes):
+            if q in title_norm:
+                return self.catalog.title_at(self._rows_by_votes[pos])
+        return None
+
+    def _most_voted_starting_with(self, prefix: str):
+        """Most voted title whose normalised form starts with prefix (None if none)."""
+        for pos, title_norm in enumerate(self._norms_by_votes):
+            if title_norm.startswith(prefix):
+                return self.catalog.title_at(self._rows_by_votes[pos])
+        return None
+
+    # -------------------------------------------------
+    def autocomplete(self, query: str, limit: int = 10) -> list:
+        """
+        Row ids of titles matching the query prefix (at any word boundary),
+        most voted first
+        """
+        return self.autocomplete_index.search(normalize_text(query), limit)
+
     # -------------------------------------------------
     def find_movie(self, query: str):
+        started = time.perf_counter()
+        title, tier = self._match_title(query, StageTimer(FIND_MOVIE_STAGE_SECONDS))
+        _FIND_MOVIE_TIER_SECONDS[tier].observe(time.perf_counter() - started)
+        return title
+
+    def _match_title(self, query: str, timer: StageTimer):
+        """(matched title or None, tier that resolved it); timer records each stage"""
         q = normalize_text(query)
         q_tokens = set(q.split())
         q_acronym = " ".join(list(q))  # kgf → k g f
+        timer.lap("normalize")
 
         # ---------- SHORT TITLES ----------
         if len(q) <= 4:
-            exact = self.df[self.df["title_norm"] == q]
-            if not exact.empty:
-                return exact.iloc[0]["title"]
+            exact = self._exact_match(q)
+            timer.lap("exact")
+            if exact is not None:
+                return exact, "exact"
 
-            sub = self.df[self.df["title_norm"].str.contains(q, regex=False)]
-            if not sub.empty:
-                return sub.sort_values("vote_count", ascending=False).iloc[0]["title"]
+            sub = self._most_voted_containing(q)
+            timer.lap("substring")
+            if sub is not None:
+                return sub, "substring"
 
-            acro = self.df[self.df["title_norm"].str.startswith(q_acronym)]
-            if not acro.empty:
-                return acro.sort_values("vote_count", ascending=False).iloc[0]["title"]
+            acro = self._most_voted_starting_with(q_acronym)
+            timer.lap("acronym")
+            if acro is not None:
+                return acro, "acronym"
 
         # ---------- NORMAL TITLES ----------
-        exact = self.df[self.df["title_norm"] == q]
-        if not exact.empty:
-            return exact.iloc[0]["title"]
+        exact = self._exact_match(q)
+        timer.lap("exact")
+        if exact is not None:
+            return exact, "exact"
 
-        sub = self.df[self.df["title_norm"].str.contains(q, regex=False)]
-        if not sub.empty:
-            return sub.sort_values("vote_count", ascending=False).iloc[0]["title"]
+        sub = self._most_voted_containing(q)
+        timer.lap("substring")
+        if sub is not None:
+            return sub, "substring"
 
-        acro = self.df[self.df["title_norm"].str.startswith(q_acronym)]
-        if not acro.empty:
-            return acro.sort_values("vote_count", ascending=False).iloc[0]["title"]
+        acro = self._most_voted_starting_with(q_acronym)
+        timer.lap("acronym")
+        if acro is not None:
+            return acro, "acronym"
 
         # ---------- FUZZY FALLBACK ----------
+        expanded_tokens = q_tokens | set(q_acronym.split())
         best_title = None
         best_score = 0
 
-        for _, row in self.df.iterrows():
-            expanded_tokens = q_tokens | set(q_acronym.split())
+        for row, jac in self._fuzzy_candidates(expanded_tokens):
+            # Upper bound with a perfect sequence ratio; skip if it cannot win
+            if FUZZY_JACCARD_WEIGHT * jac + FUZZY_SEQ_WEIGHT <= max(best_score, FUZZY_THRESHOLD):
+                continue
 
             score = (
-                0.7 * jaccard(expanded_tokens, row["title_tokens"])
-                + 0.3 * seq_ratio(q, row["title_norm"])
+                FUZZY_JACCARD_WEIGHT * jac
+                + FUZZY_SEQ_WEIGHT * seq_ratio(q, self.catalog.titles_norm[row])
             )
 
-            if score > best_score and score > 0.5:
+            if score > best_score and score > FUZZY_THRESHOLD:
                 best_score = score
-                best_title = row["title"]
+                best_title = self.catalog.title_at(row)
+
+        timer.lap("fuzzy")
+        return best_title, ("fuzzy" if best_title is not None else "none")
+
+    def _fuzzy_candidates(self, expanded_tokens: set) -> list:
+        """
+        (row, token Jaccard) of the rows that can possibly clear the fuzzy
+        threshold, in catalog order.
+
+        A title needs Jaccard > (threshold - seq_weight) / jaccard_weight even
+        with a perfect sequence ratio, so it must share at least one token with
+        the query. Shared-token counts from the inverted index give the exact
+        Jaccard, which prunes the rest before any SequenceMatcher work and is
+        reused as the Jaccard term of the score.
+        """
+        postings = [
+            self.token_index[token]
+            for token in expanded_tokens
+            if token in self.token_index
+        ]
+        if not postings:
+            return []
+
+        rows, shared = np.unique(np.concatenate(postings), return_counts=True)
+        union = len(expanded_tokens) + self.title_token_counts[rows] - shared
+        min_jaccard = (FUZZY_THRESHOLD - FUZZY_SEQ_WEIGHT) / FUZZY_JACCARD_WEIGHT
+
+        # Small tolerance: the exact score is recomputed for every survivor
+        jac = shared / union
+        keep = jac > min_jaccard - 1e-9
+        return list(zip(rows[keep].tolist(), jac[keep].tolist()))
+
+    # -------------------------------------------------
+    def _similar_indices(self, idx: int, top_n: int):
+        """
+        Row indices of the top_n most similar movies to row idx.
+        O(top_n) slice of the neighbour table; falls back to sorting
+        the dense row when top_n exceeds the precomputed K.
+        """
+        if self.neighbor_indices is not None:
+            k = self.neighbor_indices.shape[1]
+            if top_n <= k:
+                return self.neighbor_indices[idx, :top_n].tolist()
+
+            if not self._has_dense_similarity():
+                logging.warning(
+                    f"top_n={top_n} exceeds neighbour table K={k}; "
+                    f"returning {k} recommendations"
+                )
+                return self.neighbor_indices[idx].tolist()
+
+        sim_scores = list(enumerate(self.cosine_sim[idx]))
+        sim_scores = sorted(
+            sim_scores, key=lambda x: x[1], reverse=True
+        )[1 : top_n + 1]
+
+        return [i[0] for i in sim_scores]
+
+    def _top_k_rows(self, rows: np.ndarray, top_n: int) -> np.ndarray:
+        """
+        Vectorised version of _similar_indices for many query rows at once:
+        one gather from the neighbour table, or one argpartition over the
+        2-D block of dense similarity rows.
+
+        :return: (len(rows), top_n) array of recommended row indices
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+
+        if self.neighbor_indices is not None:
+            k = self.neighbor_indices.shape[1]
+            if top_n <= k or not self._has_dense_similarity():
+                return np.asarray(self.neighbor_indices[rows, :top_n])
+
+        block = np.asarray(self.cosine_sim[rows])
+        indices, _ = top_k_from_block(block, top_n, self_cols=rows)
+        return indices
+
+    # -------------------------------------------------
+    def recommend_many_rows(self, movie_names: list, top_n: int = 10, match_fn=None) -> list:
+        """
+        Matched title and recommended row ids for many queries, with a
+        single vectorised top-K.
+
+        :param movie_names: user queries
+        :param top_n: number of recommendations per query
+        :param match_fn: query -> matched title (defaults to find_movie)
+        :return: (matched_title, row ids) per query, (None, None) for
+                 queries that match no movie
+        """
+        match_fn = match_fn or self.find_movie
+        matched = [match_fn(name) for name in movie_names]
+        hits = [i for i, title in enumerate(matched) if title is not None]
+
+        results = [(None, None)] * len(movie_names)
+        if not hits:
+            return results
+
+        rows = [self.title_index[matched[i]] for i in hits]
+        started = time.perf_counter()
+        neighbor_rows = self._top_k_rows(rows, top_n).tolist()
+        _SIMILARITY_BATCH_SECONDS.observe(time.perf_counter() - started)
+
+        for pos, i in enumerate(hits):
+            results[i] = (matched[i], neighbor_rows[pos])
+
+        return results
+
+    def recommend_many(self, movie_names: list, top_n: int = 10, match_fn=None) -> list:
+        """
+        Recommendations for many queries with a single vectorised top-K.
+
+        :param movie_names: user queries
+        :param top_n: number of recommendations per query
+        :param match_fn: query -> matched title (defaults to find_movie)
+        :return: (matched_title, recommendations dataframe) per query,
+                 (None, None) for queries that match no movie
+        """
+        try:
+            request_logger.info("Generating batch recommendations for %d inputs", len(movie_names))
+
+            return [
+                (matched, None if rows is None else self.catalog.frame(rows))
+                for matched, rows in self.recommend_many_rows(movie_names, top_n, match_fn)
+            ]
 
-        return best_title
+        except Exception as e:
+            raise MyException(e, sys)
 
     # -------------------------------------------------
     def recommend(self, movie_name: str, top_n: int = 10):
         try:
-            logging.info(f"Generating recommendations for input: {movie_name}")
+            request_logger.info("Generating recommendations for input: %r", movie_name)
 
             matched_title = self.find_movie(movie_name)
             if matched_title is None:
                 raise Exception("Movie not found")
 
-            idx = self.df.index[self.df["title"] == matched_title][0]
-
-            sim_scores = list(enumerate(self.cosine_sim[idx]))
-            sim_scores = sorted(
-                sim_scores, key=lambda x: x[1], reverse=True
-            )[1 : top_n + 1]
-
-            movie_indices = [i[0] for i in sim_scores]
-
-            recommendations = self.df.iloc[movie_indices][
-                ["title", "genres", "rating", "poster_url"]
-            ]
-
-            return matched_title, recommendations
+            return matched_title, self.recommend_title(matched_title, top_n)
 
         except Exception as e:
             raise MyException(e, sys)
+
+    # -------------------------------------------------
+    def recommend_title(self, matched_title: str, top_n: int = 10) -> pd.DataFrame:
+        """
+        Recommendations for an exact catalog title (already resolved by find_movie)
+        """
+        return self.catalog.frame(self.recommend_rows(matched_title, top_n))
+
+    def recommend_rows(self, matched_title: str, top_n: int = 10, genre: str = None) -> list:
+        """
+        Recommended row ids for an exact catalog title.
+
+        :param genre: keep only movies of this genre, drawn from the whole
+                      precomputed neighbour list (so fewer than top_n can
+                      come back)
+        """
+        idx = self.title_index[matched_title]
+
+        started = time.perf_counter()
+        if genre is None:
+            rows = self._similar_indices(idx, top_n)
+        else:
+            pool = len(self.catalog) - 1
+            if self.neighbor_indices is not None:
+                pool = max(top_n, self.neighbor_indices.shape[1])
+            rows = self._similar_indices(idx, pool)
+            keep = self.genre_matrix.has_genre(rows, genre)
+            rows = [row for row, kept in zip(rows, keep.tolist()) if kept][:top_n]
+        _SIMILARITY_SINGLE_SECONDS.observe(time.perf_counter() - started)
+        return rows
+
+    # -------------------------------------------------
+    def recommend_text_rows(self, query: str, top_n: int = 10, genre: str = None) -> tuple:
+        """
+        Movies best matching a free-text description, by cosine similarity
+        between the query's TF-IDF vector and each movie's.
+
+        :param genre: only consider movies of this genre
+
+        :return: (row ids, scores), best first; empty when no query term is
+                 in the vocabulary
+        """
+        if self.text_index is None:
+            raise Exception("Text search is not available: TF-IDF artifacts not loaded")
+
+        started = time.perf_counter()
+        row_mask = None if genre is None else self.genre_matrix.genre_mask(genre)
+        rows, scores = self.text_index.top_k(query, top_n, row_mask)
+        _SIMILARITY_TEXT_SECONDS.observe(time.perf_counter() - started)
+        return rows, scores
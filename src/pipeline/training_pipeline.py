@@ -1,4 +1,8 @@
+import os
 import sys
+import json
+from dataclasses import asdict, replace
+from scipy import sparse
 from src.logger import logging
 from src.exception import MyException
 
@@ -7,7 +11,7 @@ from src.components.data_ingestion import DataIngestion
 from src.components.data_validation import DataValidation
 from src.components.data_transformation import DataTransformation
 from src.components.recommender_trainer import RecommenderTrainer
-from src.components.recommender_evaluation import RecommenderEvaluation
+from src.components.recommender_evaluation import RecommenderEvaluation, RankingQualityReport
 from src.components.model_pusher import ModelPusher
 from src.pipeline.prediction_pipeline import MovieRecommender
 # Configs
@@ -16,6 +20,7 @@ from src.entity.config_entity import (
     DataValidationConfig,
     DataTransformationConfig,
     RecommenderModelConfig,
+    RecommenderEvaluationConfig,
     ModelPusherConfig
 )
 from src.constants import MODEL_BUCKET_NAME, MODEL_PUSHER_S3_KEY
@@ -26,6 +31,7 @@ from src.entity.artifact_entity import (
     DataValidationArtifact,
     DataTransformationArtifact,
     RecommenderModelArtifact,
+    RecommenderEvaluationArtifact,
     RecommenderModelPusherArtifact
 )
 
@@ -39,6 +45,7 @@ class TrainingPipeline:
             self.data_validation_config = DataValidationConfig()
             self.data_transformation_config = DataTransformationConfig()
             self.recommender_model_config = RecommenderModelConfig()
+            self.recommender_evaluation_config = RecommenderEvaluationConfig()
             self.model_pusher_config = ModelPusherConfig(
                 bucket_name=MODEL_BUCKET_NAME,
                 s3_model_dir=MODEL_PUSHER_S3_KEY,
@@ -152,6 +159,7 @@ class TrainingPipeline:
                 f"\nTF-IDF: {recommender_model_artifact.tfidf_vectorizer_path}"
                 f"\nMatrix: {recommender_model_artifact.tfidf_matrix_path}"
                 f"\nCosine: {recommender_model_artifact.cosine_similarity_path}"
+                f"\nNeighbors: {recommender_model_artifact.neighbor_indices_path}"
             )
 
             return recommender_model_artifact
@@ -159,6 +167,110 @@ class TrainingPipeline:
         except Exception as e:
             raise MyException(e, sys)
 
+    # =========================================================
+    # Recommender Evaluation
+    # =========================================================
+    def start_recommender_evaluation(
+        self,
+        recommender_model_artifact: RecommenderModelArtifact
+    ) -> RecommenderEvaluationArtifact:
+        """
+        Every movie is evaluated in catalogs of up to exhaustive_max_items;
+        larger catalogs are evaluated on a seeded random sample sized to fit
+        time_budget_seconds. Without a dense similarity matrix (blocked
+        mode) the ground truth is computed from the TF-IDF matrix.
+
+        The ranking-quality report (coverage, popularity bias, diversity,
+        hubness, scores) covers every movie's list and is written as JSON
+        next to the accuracy figures.
+
+        The catalog and matrices the trainer still holds are evaluated
+        directly; with reload_from_disk (or an artifact without them) the
+        saved files are loaded back as serving would.
+        """
+        try:
+            logging.info("Starting Recommender Evaluation stage")
+            config = self.recommender_evaluation_config
+
+            if recommender_model_artifact.in_memory and not config.reload_from_disk:
+                recommender = MovieRecommender(model_artifact=recommender_model_artifact)
+                tfidf_matrix = recommender_model_artifact.tfidf_matrix
+            else:
+                recommender = MovieRecommender()
+                tfidf_matrix = sparse.load_npz(recommender_model_artifact.tfidf_matrix_path)
+
+            if recommender_model_artifact.cosine_similarity_path is None:
+                cosine_sim = None
+            else:
+                cosine_sim = recommender.cosine_sim
+
+            evaluator = RecommenderEvaluation(
+                df=recommender.df,
+                cosine_sim=cosine_sim,
+                recommend_fn=recommender.recommend,
+                recommend_many_fn=recommender.recommend_many_rows,
+                block_size=config.block_size,
+                tfidf_matrix=None if cosine_sim is not None else tfidf_matrix,
+                cosine_sim_path=recommender_model_artifact.cosine_similarity_path,
+                seed=config.seed,
+                n_jobs=config.n_jobs,
+                n_bootstrap=config.n_bootstrap,
+                confidence=config.confidence,
+                genre_matrix=recommender.genre_matrix
+            )
+
+            n = len(recommender.df)
+            if n > config.exhaustive_max_items:
+                evaluator.sample_rows(
+                    sample_size=evaluator.sample_size_for_budget(
+                        config.time_budget_seconds,
+                        k=config.top_k,
+                        min_sample_size=config.min_sample_size
+                    )
+                )
+                logging.info(
+                    f"{n} movies exceed {config.exhaustive_max_items}; "
+                    f"evaluating a sample of {len(evaluator.rows)}"
+                )
+
+            evaluation_artifact = evaluator.evaluate(k=config.top_k)
+
+            report = RankingQualityReport(
+                neighbor_indices=recommender.neighbor_indices,
+                neighbor_scores=recommender.neighbor_scores,
+                vote_counts=recommender.catalog.vote_counts,
+                k=config.top_k,
+                titles=recommender.catalog.titles,
+                genre_matrix=recommender.genre_matrix,
+                tfidf_matrix=tfidf_matrix
+            ).compute()
+            report["accuracy"] = asdict(evaluation_artifact)
+
+            os.makedirs(os.path.dirname(config.ranking_report_path), exist_ok=True)
+            with open(config.ranking_report_path, "w") as f:
+                json.dump(report, f, indent=2)
+            logging.info(f"Ranking report saved at: {config.ranking_report_path}")
+
+            diversity = report["diversity"].get("content") or report["diversity"].get("genre", {})
+            evaluation_artifact = replace(
+                evaluation_artifact,
+                catalog_coverage=report["coverage"]["catalog_coverage"],
+                popularity_lift=report["popularity"]["popularity_lift"],
+                intra_list_diversity=diversity.get("mean"),
+                hubness_skewness=report["hubness"]["k_occurrence_skewness"],
+                ranking_report_path=config.ranking_report_path
+            )
+
+            logging.info(
+                f"Recommender Evaluation completed in "
+                f"{evaluation_artifact.evaluation_seconds} s"
+            )
+
+            return evaluation_artifact
+
+        except Exception as e:
+            raise MyException(e, sys)
+
     # =========================================================
     # Model Pusher
     # =========================================================
@@ -185,7 +297,11 @@ class TrainingPipeline:
     # =========================================================
     # Run Entire Pipeline
     # =========================================================
-    def run_pipeline(self) -> None:
+    def run_pipeline(self, push_model: bool = True) -> None:
+        """
+        :param push_model: upload the trained artifacts to S3 (False keeps
+                           them local, e.g. for runs on a synthetic catalog)
+        """
         try:
             logging.info("===== Movie Recommendation Training Pipeline STARTED =====")
 
@@ -203,28 +319,26 @@ class TrainingPipeline:
             recommender_trainer_artifact = self.start_recommender_trainer(
                 data_transformation_artifact
             )
-            # Load recommender for evaluation
-            recommender = MovieRecommender()
-
-            evaluator = RecommenderEvaluation(
-                df=recommender.df,
-                cosine_sim=recommender.cosine_sim,
-                recommend_fn=recommender.recommend
+            evaluation_artifact = self.start_recommender_evaluation(
+                recommender_trainer_artifact
             )
 
-            precision, recall, f1 = evaluator.precision_recall_f1_at_k(k=10)
-            genre_precision = evaluator.genre_precision_at_k(k=10)
-
             # Upload trained artifacts to S3
-            self.start_model_pusher()
+            if push_model:
+                self.start_model_pusher()
+            else:
+                logging.info("Model push skipped; artifacts kept locally")
 
             logging.info("===== Movie Recommendation Training Pipeline COMPLETED =====")
+            k = self.recommender_evaluation_config.top_k
             logging.info(
                 f"Final Evaluation -> "
-                f"Precision@10={precision:.4f}, "
-                f"Recall@10={recall:.4f}, "
-                f"F1@10={f1:.4f}, "
-                f"GenrePrecision@10={genre_precision:.4f}"
+                f"Precision@{k}={evaluation_artifact.precision_at_k:.4f}, "
+                f"Recall@{k}={evaluation_artifact.recall_at_k:.4f}, "
+                f"F1@{k}={evaluation_artifact.f1_at_k:.4f}, "
+                f"GenrePrecision@{k}={evaluation_artifact.genre_precision_at_k:.4f} "
+                f"({evaluation_artifact.n_evaluated} movies"
+                f"{', sampled' if evaluation_artifact.sampled else ''})"
             )
 
         except Exception as e:
@@ -0,0 +1,116 @@
+import ast
+import sys
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.exception import MyException
+
+
+def parse_genres(value) -> list:
+    """
+    Genre names of one catalog value. Values are list literals such as
+    "['Action', 'Science Fiction']"; a plain "Action, Drama" string is split
+    on commas, and missing or empty values have no genres.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        parsed = value.split(",")
+    if isinstance(parsed, str):
+        parsed = [parsed]
+    if not isinstance(parsed, (list, tuple)):
+        return []
+    return [str(name).strip() for name in parsed if str(name).strip()]
+
+
+# =====================================================
+# Multi-hot genre matrix
+# =====================================================
+class GenreMatrix:
+    """
+    Sparse multi-hot genre matrix: row i has a 1 in column g when movie i
+    is tagged with genre g.
+
+    The catalog stores each distinct genre string once, so only those are
+    parsed; the per-movie matrix is a row gather of the distinct ones.
+    Shared-genre counts for any list of movie pairs are then one sparse
+    gather and a row-wise product, with no per-movie Python sets.
+    """
+
+    def __init__(self, codes: np.ndarray, table):
+        """
+        :param codes: per-movie index into table
+        :param table: distinct genre values (list literals)
+        """
+        try:
+            genre_lists = [parse_genres(value) for value in table]
+            self.names = sorted({name for names in genre_lists for name in names})
+            self.genre_ids = {name.lower(): i for i, name in enumerate(self.names)}
+
+            rows = np.repeat(np.arange(len(genre_lists)), [len(names) for names in genre_lists])
+            cols = [self.genre_ids[name.lower()] for names in genre_lists for name in names]
+            distinct = sparse.csr_matrix(
+                (np.ones(len(cols), dtype=np.int32), (rows, cols)),
+                shape=(len(genre_lists), len(self.names))
+            )
+            # Repeated names within one value count once
+            distinct.data[:] = 1
+
+            self.matrix = distinct[np.asarray(codes, dtype=np.int64)]
+            self._masks = {}
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    @classmethod
+    def from_values(cls, values) -> "GenreMatrix":
+        """Build from a per-movie column of genre values."""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        table = list(uniques)
+        missing = codes < 0
+        if missing.any():
+            codes[missing] = len(table)
+            table.append(None)
+        return cls(codes, table)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    # -------------------------------------------------
+    def genre_id(self, name: str):
+        """Column of a genre name (case-insensitive), None if unknown."""
+        return self.genre_ids.get(str(name).strip().lower())
+
+    def genre_counts(self) -> np.ndarray:
+        """Number of genres per movie."""
+        return np.diff(self.matrix.indptr)
+
+    def genre_mask(self, name: str) -> np.ndarray:
+        """
+        Boolean mask over all movies: which are tagged with the genre
+        (all False for an unknown genre). Cached per genre.
+        """
+        genre = self.genre_id(name)
+        if genre is None:
+            return np.zeros(len(self), dtype=bool)
+
+        mask = self._masks.get(genre)
+        if mask is None:
+            mask = self.matrix[:, genre].toarray().ravel() > 0
+            self._masks[genre] = mask
+        return mask
+
+    def has_genre(self, rows, name: str) -> np.ndarray:
+        """Boolean mask over rows: which of those movies are tagged with the genre."""
+        return self.genre_mask(name)[np.asarray(rows, dtype=np.int64)]
+
+    def shared_counts(self, rows_a, rows_b) -> np.ndarray:
+        """
+        Number of genres shared by each pair (rows_a[i], rows_b[i]).
+        """
+        a = self.matrix[np.asarray(rows_a, dtype=np.int64)]
+        b = self.matrix[np.asarray(rows_b, dtype=np.int64)]
+        return np.asarray(a.multiply(b).sum(axis=1)).ravel()
@@ -0,0 +1,62 @@
+import os
+import sys
+import hashlib
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of the current process in MB
+    (0.0 where the platform does not expose it).
+    """
+    if resource is None:
+        return 0.0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def file_fingerprint(paths: list) -> str:
+    """
+    Short version id for a set of files, derived from their names, sizes
+    and modification times (missing files are skipped).
+    """
+    digest = hashlib.md5()
+    for path in sorted(str(p) for p in paths):
+        if not os.path.exists(path):
+            continue
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def save_numpy_atomic(path: str, array) -> None:
+    """
+    np.save to a temporary file and rename it into place, so processes that
+    memory-mapped the previous version keep reading a consistent file.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def file_digests(path: str, chunk_size: int = 8 * 1024 * 1024) -> tuple:
+    """
+    SHA-256 and MD5 hex digests of a file, computed in one streaming pass.
+    """
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+            md5.update(chunk)
+    return sha256.hexdigest(), md5.hexdigest()
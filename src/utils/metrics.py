@@ -0,0 +1,317 @@
+import os
+import math
+import time
+import threading
+import numpy as np
+
+from src.constants import METRICS_ENABLED_ENV_KEY
+
+
+# Latency buckets in seconds, from 10µs (cache hits) to 10s (cold fuzzy scans)
+LATENCY_BUCKETS = (
+    10e-6, 25e-6, 50e-6, 100e-6, 250e-6, 500e-6,
+    1e-3, 2.5e-3, 5e-3, 10e-3, 25e-3, 50e-3, 100e-3, 250e-3, 500e-3,
+    1.0, 2.5, 5.0, 10.0,
+)
+
+# Observations buffered per histogram before they are bucketed in one go
+_DRAIN_THRESHOLD = 1024
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+# =====================================================
+# Metric types
+# =====================================================
+class _Metric:
+    """
+    Base class: a metric family with optional labels. `labels(...)` returns
+    (and caches) the child holding the values for one label combination;
+    hot paths should resolve their children once, up front.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        # Fast path: label values already strings and the child exists
+        child = self._children.get(values)
+        if child is not None:
+            return child
+
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def samples(self):
+        """(name suffix, labels, value) for every exposed sample."""
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key))
+            yield from child.samples(labels)
+
+    def render(self) -> list:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if not ENABLED:
+            return
+        with self._lock:
+            self.value += amount
+
+    def samples(self, labels: dict):
+        yield "", labels, self.value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count (name should end in _total)."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self, labels: dict):
+        yield "", labels, self.value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down; last write wins."""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+
+class _HistogramChild:
+    """
+    observe() only appends to a list (atomic under the GIL, no lock, no
+    bucket search); buffered values are bucketed with numpy once the buffer
+    fills up and on every scrape.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "_pending", "_lock")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = np.asarray(bounds, dtype=np.float64)
+        # One slot per bucket plus the +Inf overflow
+        self.counts = np.zeros(len(bounds) + 1, dtype=np.int64)
+        self.sum = 0.0
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        if ENABLED:
+            pending = self._pending
+            pending.append(value)
+            if len(pending) >= _DRAIN_THRESHOLD:
+                self._drain()
+
+    def _drain(self) -> None:
+        with self._lock:
+            pending = self._pending
+            n = len(pending)
+            if not n:
+                return
+            # Slicing and deleting are atomic, so concurrent appends land
+            # after the drained prefix and are kept for the next drain
+            values = np.asarray(pending[:n], dtype=np.float64)
+            del pending[:n]
+
+            self.counts += np.bincount(
+                np.searchsorted(self.bounds, values, side="left"),
+                minlength=len(self.counts)
+            )
+            self.sum += float(values.sum())
+
+    def samples(self, labels: dict):
+        self._drain()
+        with self._lock:
+            counts = self.counts.tolist()
+            total = self.sum
+
+        cumulative = 0
+        for bound, count in zip(self.bounds.tolist() + [math.inf], counts):
+            cumulative += count
+            yield "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+        yield "_sum", labels, total
+        yield "_count", labels, cumulative
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+
+# =====================================================
+# Registry and exposition
+# =====================================================
+class MetricsRegistry:
+    """
+    Process-local collection of metrics rendered in the Prometheus text
+    format (version 0.0.4). Collect hooks run on every scrape and return
+    extra metrics computed on demand (e.g. cache statistics).
+
+    Each worker process has its own registry; with several gunicorn
+    workers every scrape reports the worker that served it.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collect_hooks = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collect_hook(self, hook) -> None:
+        """:param hook: callable returning a list of metrics built at scrape time"""
+        self._collect_hooks.append(hook)
+
+    def render(self) -> str:
+        metrics = list(self._metrics)
+        for hook in self._collect_hooks:
+            metrics.extend(hook())
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Set METRICS_ENABLED=0 to turn every observation into a no-op
+ENABLED = os.getenv(METRICS_ENABLED_ENV_KEY, "1") != "0"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def set_enabled(enabled: bool) -> None:
+    global ENABLED
+    ENABLED = enabled
+
+
+def counter(name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: tuple = (),
+    buckets: tuple = LATENCY_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# =====================================================
+# Timing helpers
+# =====================================================
+class StageTimer:
+    """
+    Lap timer for a multi-stage code path: each lap(stage) records the time
+    since the previous lap into that stage's histogram child.
+
+        timer = StageTimer(FIND_MOVIE_STAGE_SECONDS)
+        q = normalize_text(query); timer.lap("normalize")
+    """
+
+    __slots__ = ("_histogram", "_last")
+
+    def __init__(self, stage_histogram: Histogram):
+        self._histogram = stage_histogram
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._histogram.labels(stage).observe(now - self._last)
+        self._last = now
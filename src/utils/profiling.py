@@ -0,0 +1,156 @@
+import os
+import time
+import random
+import pstats
+import cProfile
+import threading
+from datetime import datetime
+
+from src.logger import logging
+from src.constants import (
+    PROFILE_ON_DEMAND_ENV_KEY,
+    PROFILE_SAMPLE_RATE_ENV_KEY,
+    PROFILE_DIR_ENV_KEY,
+    PROFILE_DIR,
+    PROFILE_TOP_FRAMES,
+    PROFILE_MAX_FILES,
+)
+
+
+class RequestProfiler:
+    """
+    Opt-in cProfile hook for individual requests.
+
+    A request is profiled when on-demand profiling is enabled and the caller
+    asks for it, or when it falls in the random sample. The profile is saved
+    as a .prof file (open with `python -m pstats` or snakeviz) and its top
+    frames are returned to the caller. With both triggers off, `active` is
+    False and the request path skips the profiler entirely.
+    """
+
+    def __init__(
+        self,
+        on_demand: bool = False,
+        sample_rate: float = 0.0,
+        profile_dir: str = PROFILE_DIR,
+        top_frames: int = PROFILE_TOP_FRAMES,
+        max_files: int = PROFILE_MAX_FILES
+    ):
+        """
+        :param on_demand: allow callers to request a profile explicitly
+        :param sample_rate: fraction of requests profiled at random (0..1)
+        :param profile_dir: directory for saved .prof files
+        :param top_frames: number of frames returned in the summary
+        :param max_files: oldest profiles beyond this count are deleted
+        """
+        self.on_demand = on_demand
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.profile_dir = profile_dir
+        self.top_frames = top_frames
+        self.max_files = max_files
+        self.active = on_demand or self.sample_rate > 0
+        # Only one profile at a time: profilers do not nest
+        self._busy = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        return cls(
+            on_demand=os.getenv(PROFILE_ON_DEMAND_ENV_KEY, "0") == "1",
+            sample_rate=float(os.getenv(PROFILE_SAMPLE_RATE_ENV_KEY, "0")),
+            profile_dir=os.getenv(PROFILE_DIR_ENV_KEY, PROFILE_DIR),
+        )
+
+    # -------------------------------------------------
+    def trigger(self, requested: bool) -> str:
+        """
+        Why this request should be profiled: "requested", "sampled" or None.
+
+        :param requested: the caller asked for a profile (and is allowed to)
+        """
+        if requested and self.on_demand:
+            return "requested"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def run(self, fn, label: str, reason: str):
+        """
+        Call fn() under cProfile.
+
+        :param label: what is being profiled (stored with the profile)
+        :param reason: trigger that fired ("requested" / "sampled")
+        :return: (result, exception or None, report dict or None if another
+                 profile was already running)
+        """
+        if not self._busy.acquire(blocking=False):
+            try:
+                return fn(), None, None
+            except Exception as e:
+                return None, e, None
+
+        try:
+            profiler = cProfile.Profile()
+            result = error = None
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                result = fn()
+            except Exception as e:
+                error = e
+            finally:
+                profiler.disable()
+            elapsed = time.perf_counter() - started
+
+            report = {
+                "label": label,
+                "reason": reason,
+                "wall_seconds": round(elapsed, 6),
+                "top_frames": self._top_frames(profiler),
+            }
+            report["profile_file"] = self._save(profiler, reason)
+            logging.info(
+                f"Profiled {label!r} ({reason}) in {elapsed * 1000:.1f} ms -> "
+                f"{report['profile_file']}"
+            )
+            return result, error, report
+
+        finally:
+            self._busy.release()
+
+    # -------------------------------------------------
+    def _top_frames(self, profiler: cProfile.Profile) -> list:
+        """Heaviest frames by cumulative time."""
+        stats = pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+        frames = []
+        for func in stats.fcn_list[:self.top_frames]:
+            primitive_calls, calls, tottime, cumtime, _ = stats.stats[func]
+            file_name, line, name = func
+            frames.append({
+                "function": f"{name} ({os.path.basename(file_name)}:{line})",
+                "calls": calls if calls == primitive_calls else f"{calls}/{primitive_calls}",
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            })
+        return frames
+
+    def _save(self, profiler: cProfile.Profile, reason: str) -> str:
+        """Dump the profile and prune the oldest files beyond max_files."""
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            file_name = (
+                f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{reason}_{os.getpid()}.prof"
+            )
+            path = os.path.join(self.profile_dir, file_name)
+            profiler.dump_stats(path)
+
+            profiles = sorted(
+                name for name in os.listdir(self.profile_dir) if name.endswith(".prof")
+            )
+            for name in profiles[:max(0, len(profiles) - self.max_files)]:
+                os.remove(os.path.join(self.profile_dir, name))
+
+            return file_name
+        except OSError:
+            # A full or read-only disk must not fail the request
+            logging.warning("Could not save request profile", exc_info=True)
+            return None
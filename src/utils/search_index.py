@@ -0,0 +1,119 @@
+import numpy as np
+
+
+# Sorts after every real character, used to close prefix ranges
+_MAX_CHAR = chr(0x10FFFF)
+# Rows converted to Python ints at a time while walking in rank order
+_SCAN_CHUNK = 256
+
+
+# =====================================================
+# Autocomplete index (/search, /suggest)
+# =====================================================
+class AutocompleteIndex:
+    """
+    Prefix search over normalised movie titles, ranked by vote_count.
+
+    Every title is indexed at each word boundary ("the dark knight",
+    "dark knight", "knight"), so a query matches when it is a prefix of the
+    title or of any word-aligned tail of it. The index is a suffix array of
+    (row, offset) pairs sorted by text; a query is two binary searches plus a
+    rank lookup over the matching range.
+    """
+
+    def __init__(self, titles_norm: list, vote_counts: np.ndarray, dense_range: int = 65536):
+        """
+        :param titles_norm: normalised title per catalog row
+        :param vote_counts: popularity per catalog row (NaN treated as 0)
+        :param dense_range: ranges larger than this are answered by walking
+                            titles in popularity order instead of ranking the range
+        """
+        n = len(titles_norm)
+        votes = np.nan_to_num(np.asarray(vote_counts, dtype=np.float64))
+
+        # Most voted first; ties keep catalog order
+        self._by_rank = np.lexsort((np.arange(n), -votes)).astype(np.int32)
+        self._rank = np.empty(n, dtype=np.int32)
+        self._rank[self._by_rank] = np.arange(n, dtype=np.int32)
+
+        self._titles = list(titles_norm)
+        self.dense_range = dense_range
+
+        # Suffixes are generated in rank order, and the stable sort keeps that
+        # order within equal keys
+        keys, rows, offsets = [], [], []
+        for row in self._by_rank.tolist():
+            title = self._titles[row]
+            start = 0
+            while True:
+                keys.append(title[start:])
+                rows.append(row)
+                offsets.append(start)
+                nxt = title.find(" ", start)
+                if nxt < 0:
+                    break
+                start = nxt + 1
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        del keys
+
+        self._rows = np.asarray(rows, dtype=np.int32)[order]
+        self._offsets = np.asarray(offsets, dtype=np.int32)[order]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _lower_bound(self, query: str) -> int:
+        """First suffix position whose text is >= query."""
+        width = len(query)
+        lo, hi = 0, len(self._rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = int(self._offsets[mid])
+            text = self._titles[self._rows[mid]][offset:offset + width]
+            if text < query:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _scan_by_rank(self, query: str, limit: int) -> list:
+        """Walk titles from most to least voted; cheap when the prefix is common."""
+        boundary_query = " " + query
+        matches = []
+        for start in range(0, len(self._by_rank), _SCAN_CHUNK):
+            for row in self._by_rank[start:start + _SCAN_CHUNK].tolist():
+                title = self._titles[row]
+                if title.startswith(query) or boundary_query in title:
+                    matches.append(row)
+                    if len(matches) == limit:
+                        return matches
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Catalog rows whose title matches the normalised query prefix,
+        most voted first, at most `limit` rows.
+        """
+        if not query or limit <= 0:
+            return []
+
+        lo = self._lower_bound(query)
+        hi = self._lower_bound(query + _MAX_CHAR)
+        if lo == hi:
+            return []
+
+        if hi - lo > self.dense_range:
+            return self._scan_by_rank(query, limit)
+
+        ranks = self._rank[self._rows[lo:hi]]
+        # A title can match at two word boundaries, so keep a few spare
+        # candidates before de-duplicating
+        kth = 4 * limit
+        if len(ranks) > kth + 1:
+            top = np.unique(np.partition(ranks, kth)[:kth + 1])
+            ranks = top if len(top) >= limit else np.unique(ranks)
+        else:
+            ranks = np.unique(ranks)
+
+        return self._by_rank[ranks[:limit]].tolist()
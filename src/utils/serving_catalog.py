@@ -0,0 +1,210 @@
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+from src.exception import MyException
+from src.utils.genre_matrix import GenreMatrix
+
+
+# Columns serving needs from movies.csv; everything else stays on disk
+CATALOG_COLUMNS = ["title", "genres", "rating", "poster_url", "vote_count"]
+RECORD_COLUMNS = ["title", "genres", "rating", "poster_url"]
+
+
+def encode_json(value) -> bytes:
+    """
+    Serialise like Flask's default JSON provider in production (sorted keys,
+    compact separators, ASCII-escaped), so responses assembled from
+    fragments are byte-identical to jsonify() output.
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _encode_table(table: np.ndarray) -> list:
+    """JSON text of every value in a string table, as json.dumps writes it."""
+    return [
+        json.encoder.encode_basestring_ascii(value) if isinstance(value, str)
+        else json.dumps(value)
+        for value in table.tolist()
+    ]
+
+
+def _intern_column(values) -> tuple:
+    """
+    Factorise a string column into (int32 codes, table of unique values),
+    so repeated strings are stored once. Missing values share one NaN entry
+    at the end of the table, so a record built from the table is identical
+    to the DataFrame row.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    table = uniques.tolist()
+
+    missing = codes < 0
+    if missing.any():
+        codes[missing] = len(table)
+        table.append(np.nan)
+
+    return codes.astype(np.int32), np.asarray(table, dtype=object)
+
+
+# =====================================================
+# Serving catalog
+# =====================================================
+class ServingCatalog:
+    """
+    Compact, read-only movie catalog for serving.
+
+    Only the columns the API returns are kept: string columns as int32 codes
+    into tables of unique strings, numeric columns as numpy arrays,
+    and the normalised title tokens as a CSR pair (token_offsets, token_ids)
+    of integer ids into token_vocab instead of one Python set per row.
+    """
+
+    def __init__(self, frame: pd.DataFrame, normalize_fn):
+        """
+        :param frame: movies dataframe with at least CATALOG_COLUMNS
+        :param normalize_fn: title -> normalised title (shared with query matching)
+        """
+        try:
+            self._title_codes, self._title_table = _intern_column(frame["title"])
+            self._genre_codes, self._genre_table = _intern_column(frame["genres"])
+            self._poster_codes, self._poster_table = _intern_column(frame["poster_url"])
+
+            rating = frame["rating"].to_numpy(dtype=np.float64)
+            self.ratings = np.where(np.isnan(rating), np.nanmean(rating), rating)
+            self.vote_counts = frame["vote_count"].to_numpy(dtype=np.float64)
+
+            self.titles = self._title_table[self._title_codes].tolist()
+            self.titles_norm = [normalize_fn(title) for title in self.titles]
+
+            self._build_tokens()
+            self._build_record_fragments()
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    @classmethod
+    def from_csv(cls, path: str, normalize_fn) -> "ServingCatalog":
+        """Read only the serving columns of movies.csv."""
+        try:
+            return cls(pd.read_csv(path, usecols=CATALOG_COLUMNS), normalize_fn)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def __len__(self) -> int:
+        return len(self._title_codes)
+
+    # -------------------------------------------------
+    def _build_tokens(self) -> None:
+        """Distinct tokens per title as CSR (token_offsets, token_ids), row-major."""
+        self.token_vocab = {}
+        ids, counts = [], []
+        for norm in self.titles_norm:
+            row_ids = {
+                self.token_vocab.setdefault(token, len(self.token_vocab))
+                for token in norm.split()
+            }
+            ids.extend(row_ids)
+            counts.append(len(row_ids))
+
+        self.token_ids = np.asarray(ids, dtype=np.int32)
+        self.token_counts = np.asarray(counts, dtype=np.int32)
+        self.token_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(self.token_counts, out=self.token_offsets[1:])
+
+    def token_postings(self) -> dict:
+        """
+        Inverted index token -> row ids (ascending), as views into one
+        int32 array grouped by token id.
+        """
+        rows = np.repeat(np.arange(len(self), dtype=np.int32), self.token_counts)
+        order = np.argsort(self.token_ids, kind="stable")
+        rows = rows[order]
+        bounds = np.searchsorted(
+            self.token_ids[order], np.arange(len(self.token_vocab) + 1)
+        ).tolist()
+
+        return {
+            token: rows[bounds[token_id]:bounds[token_id + 1]]
+            for token, token_id in self.token_vocab.items()
+        }
+
+    def _build_record_fragments(self) -> None:
+        """
+        Each row's public record, JSON-encoded once at load time. Strings are
+        encoded once per unique value and the record keys are written in
+        sorted order, giving the same bytes as encode_json(record).
+        """
+        titles = _encode_table(self._title_table)
+        genres = _encode_table(self._genre_table)
+        posters = _encode_table(self._poster_table)
+        rating_values, rating_codes = np.unique(self.ratings, return_inverse=True)
+        rating_texts = [json.dumps(rating) for rating in rating_values.tolist()]
+
+        self.record_fragments = tuple(
+            (
+                '{"genres":%s,"poster_url":%s,"rating":%s,"title":%s}'
+                % (genres[genre], posters[poster], rating_texts[rating], titles[title])
+            ).encode()
+            for title, genre, poster, rating in zip(
+                self._title_codes.tolist(),
+                self._genre_codes.tolist(),
+                self._poster_codes.tolist(),
+                rating_codes.tolist(),
+            )
+        )
+
+    def genre_matrix(self) -> GenreMatrix:
+        """Multi-hot genres of every row (each distinct genre string parsed once)."""
+        return GenreMatrix(self._genre_codes, self._genre_table.tolist())
+
+    # -------------------------------------------------
+    def title_at(self, row: int) -> str:
+        return self.titles[row]
+
+    def records_json(self, rows) -> bytes:
+        """JSON array of the given rows' records, joined from precomputed fragments."""
+        fragments = self.record_fragments
+        return b"[" + b",".join([fragments[row] for row in rows]) + b"]"
+
+    def frame(self, rows=None, columns: list = RECORD_COLUMNS) -> pd.DataFrame:
+        """
+        DataFrame view of the given rows (all rows by default), indexed by
+        row id like the original movies dataframe.
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+
+        data = {}
+        for column in columns:
+            if column == "title":
+                data[column] = self._title_table[self._title_codes[rows]]
+            elif column == "genres":
+                data[column] = self._genre_table[self._genre_codes[rows]]
+            elif column == "poster_url":
+                data[column] = self._poster_table[self._poster_codes[rows]]
+            elif column == "rating":
+                data[column] = self.ratings[rows]
+            elif column == "vote_count":
+                data[column] = self.vote_counts[rows]
+            else:
+                raise KeyError(f"Column not in serving catalog: {column}")
+
+        return pd.DataFrame(data, index=rows)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the catalog (arrays + unique strings)."""
+        arrays = [
+            self._title_codes, self._genre_codes, self._poster_codes,
+            self.ratings, self.vote_counts,
+            self.token_ids, self.token_counts, self.token_offsets,
+        ]
+        tables = [self._title_table, self._genre_table, self._poster_table, self.titles_norm]
+
+        total = sum(array.nbytes for array in arrays + tables[:3])
+        total += sys.getsizeof(self.titles) + sys.getsizeof(self.titles_norm)
+        total += sum(sys.getsizeof(value) for table in tables for value in table)
+        total += sys.getsizeof(self.token_vocab) + sum(sys.getsizeof(t) for t in self.token_vocab)
+        total += sys.getsizeof(self.record_fragments)
+        total += sum(sys.getsizeof(fragment) for fragment in self.record_fragments)
+        return total
@@ -0,0 +1,208 @@
+import os
+import time
+import tempfile
+import multiprocessing
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from src.logger import logging
+from src.utils.main_utils import peak_rss_mb
+
+
+# =====================================================
+# Top-K neighbour selection
+# =====================================================
+def top_k_from_block(
+    sim_block: np.ndarray,
+    k: int,
+    row_offset: int = 0,
+    self_cols: np.ndarray = None
+):
+    """
+    Select the top-k most similar columns for every row of a similarity block.
+
+    The row's own column (row_offset + i) is excluded. Neighbours are sorted
+    by score descending, ties broken by the lower column index.
+
+    :param sim_block: (rows, n_items) similarity scores
+    :param k: number of neighbours to keep per row
+    :param row_offset: global index of the first row in the block
+    :param self_cols: global index of every row, for blocks of non-contiguous
+                      rows (overrides row_offset)
+    :return: (indices int32, scores float32), both shaped (rows, k)
+    """
+    scores = np.array(sim_block, dtype=np.result_type(sim_block.dtype, np.float32))
+    n_rows, n_cols = scores.shape
+    k = max(0, min(k, n_cols - 1))
+
+    if k == 0 or n_rows == 0:
+        return (
+            np.empty((n_rows, k), dtype=np.int32),
+            np.empty((n_rows, k), dtype=np.float32),
+        )
+
+    rows = np.arange(n_rows)
+    if self_cols is None:
+        self_cols = rows + row_offset
+    self_cols = np.asarray(self_cols)
+    in_block = self_cols < n_cols
+    scores[rows[in_block], self_cols[in_block]] = -np.inf
+
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+
+    order = np.lexsort((candidates, -candidate_scores))
+    indices = np.take_along_axis(candidates, order, axis=1)
+    top_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+    return indices.astype(np.int32), top_scores.astype(np.float32)
+
+
+def top_k_from_dense(cosine_sim: np.ndarray, k: int, block_size: int = 1024):
+    """
+    Build the neighbour table from a full dense similarity matrix,
+    one row block at a time to bound the temporary copies.
+    """
+    n = cosine_sim.shape[0]
+    k = max(0, min(k, n - 1))
+
+    indices = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        indices[start:stop], scores[start:stop] = top_k_from_block(
+            cosine_sim[start:stop], k, row_offset=start
+        )
+
+    return indices, scores
+
+
+def top_k_blocked(tfidf_matrix: sparse.spmatrix, k: int, block_size: int = 1024):
+    """
+    Build the neighbour table straight from the sparse TF-IDF matrix without
+    ever materialising the N x N similarity matrix.
+
+    Each row block is multiplied against the transpose of the (L2-normalised)
+    matrix, so the block holds exact cosine scores for all columns and the
+    top-K of its rows is final once the block is processed. Peak memory is
+    roughly 2 * block_size * N * 4 bytes on top of the sparse matrix.
+    """
+    matrix = normalize(sparse.csr_matrix(tfidf_matrix, dtype=np.float32))
+    matrix_t = matrix.T
+    n = matrix.shape[0]
+    k = max(0, min(k, n - 1))
+
+    indices = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+    n_blocks = (n + block_size - 1) // block_size
+
+    for block_no, start in enumerate(range(0, n, block_size), start=1):
+        started = time.perf_counter()
+        stop = min(start + block_size, n)
+
+        block = (matrix[start:stop] @ matrix_t).toarray()
+        indices[start:stop], scores[start:stop] = top_k_from_block(
+            block, k, row_offset=start
+        )
+        del block
+
+        logging.info(
+            f"Similarity block {block_no}/{n_blocks} rows [{start}, {stop}) "
+            f"took {time.perf_counter() - started:.3f}s, "
+            f"peak RSS {peak_rss_mb():.1f} MB"
+        )
+
+    return indices, scores
+
+
+# =====================================================
+# Parallel blocked build (process pool)
+# =====================================================
+_worker_matrix = None
+_worker_matrix_t = None
+_worker_k = None
+
+
+def save_shared_csr(matrix: sparse.csr_matrix, shared_dir: str) -> None:
+    """
+    Dump the CSR components as plain .npy files so workers can memory-map
+    them read-only instead of receiving a pickled copy each.
+    """
+    np.save(os.path.join(shared_dir, "data.npy"), matrix.data)
+    np.save(os.path.join(shared_dir, "indices.npy"), matrix.indices)
+    np.save(os.path.join(shared_dir, "indptr.npy"), matrix.indptr)
+
+
+def load_shared_csr(shared_dir: str, shape: tuple) -> sparse.csr_matrix:
+    """Read-only CSR matrix over the memory-mapped files of save_shared_csr."""
+    data = np.load(os.path.join(shared_dir, "data.npy"), mmap_mode="r")
+    indices = np.load(os.path.join(shared_dir, "indices.npy"), mmap_mode="r")
+    indptr = np.load(os.path.join(shared_dir, "indptr.npy"), mmap_mode="r")
+    return sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def _init_similarity_worker(shared_dir: str, shape: tuple, k: int) -> None:
+    global _worker_matrix, _worker_matrix_t, _worker_k
+
+    _worker_matrix = load_shared_csr(shared_dir, shape)
+    _worker_matrix_t = _worker_matrix.T
+    _worker_k = k
+
+
+def _similarity_worker(bounds: tuple):
+    start, stop = bounds
+    started = time.perf_counter()
+
+    block = (_worker_matrix[start:stop] @ _worker_matrix_t).toarray()
+    indices, scores = top_k_from_block(block, _worker_k, row_offset=start)
+
+    return start, stop, indices, scores, time.perf_counter() - started, peak_rss_mb()
+
+
+def top_k_parallel(
+    tfidf_matrix: sparse.spmatrix,
+    k: int,
+    block_size: int = 1024,
+    n_jobs: int = 2
+):
+    """
+    Parallel version of top_k_blocked: row blocks are sharded across a
+    process pool. The normalised TF-IDF matrix is written once to a temporary
+    directory and memory-mapped by every worker, so the page cache holds a
+    single shared copy. Output is identical in layout to top_k_blocked.
+    """
+    if n_jobs <= 1:
+        return top_k_blocked(tfidf_matrix, k=k, block_size=block_size)
+
+    matrix = normalize(sparse.csr_matrix(tfidf_matrix, dtype=np.float32))
+    n = matrix.shape[0]
+    k = max(0, min(k, n - 1))
+
+    indices = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+    bounds = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+    with tempfile.TemporaryDirectory(prefix="similarity_") as shared_dir:
+        save_shared_csr(matrix, shared_dir)
+        del matrix
+
+        with multiprocessing.Pool(
+            processes=n_jobs,
+            initializer=_init_similarity_worker,
+            initargs=(shared_dir, (n, tfidf_matrix.shape[1]), k)
+        ) as pool:
+            results = pool.imap_unordered(_similarity_worker, bounds)
+            for done, (start, stop, block_indices, block_scores, seconds, rss) in enumerate(
+                results, start=1
+            ):
+                indices[start:stop] = block_indices
+                scores[start:stop] = block_scores
+                logging.info(
+                    f"Similarity block {done}/{len(bounds)} rows [{start}, {stop}) "
+                    f"took {seconds:.3f}s, worker peak RSS {rss:.1f} MB"
+                )
+
+    logging.info(f"Parallel similarity build finished with {n_jobs} workers")
+    return indices, scores
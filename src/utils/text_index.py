@@ -0,0 +1,136 @@
+import sys
+import pickle
+import numpy as np
+from collections import Counter
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from src.exception import MyException
+
+
+# =====================================================
+# Free-text queries over the TF-IDF matrix
+# =====================================================
+class TextQueryIndex:
+    """
+    Scores arbitrary text ("space heist with a robot sidekick") against the
+    TF-IDF matrix the recommender was trained on.
+
+    The matrix is kept column-major (CSC) with L2-normalised float32 rows,
+    so a query is a sparse mat-vec that only reads the postings of its own
+    terms: the cost grows with how common those terms are, not with the
+    catalog. Queries are vectorised with the fitted vectorizer's analyzer,
+    vocabulary and idf weights directly, which gives the same vector as
+    vectorizer.transform() without its per-call validation overhead.
+    """
+
+    def __init__(self, vectorizer, tfidf_matrix: sparse.spmatrix):
+        """
+        :param vectorizer: fitted TfidfVectorizer
+        :param tfidf_matrix: (n_items, n_terms) matrix it produced at training
+        """
+        try:
+            self.vectorizer = vectorizer
+            self.analyzer = vectorizer.build_analyzer()
+            self.vocabulary = vectorizer.vocabulary_
+            self.idf = vectorizer.idf_ if vectorizer.use_idf else None
+
+            matrix = normalize(sparse.csr_matrix(tfidf_matrix, dtype=np.float32))
+            matrix = matrix.tocsc()
+            self.indptr = matrix.indptr
+            self.indices = matrix.indices
+            self.data = matrix.data
+            self.n_items, self.n_terms = matrix.shape
+
+            if self.n_terms != len(self.vocabulary):
+                raise Exception(
+                    f"TF-IDF matrix has {self.n_terms} terms, "
+                    f"vectorizer vocabulary has {len(self.vocabulary)}"
+                )
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    @classmethod
+    def from_files(cls, vectorizer_path: str, matrix_path: str) -> "TextQueryIndex":
+        try:
+            with open(vectorizer_path, "rb") as f:
+                vectorizer = pickle.load(f)
+            return cls(vectorizer, sparse.load_npz(matrix_path))
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def __len__(self) -> int:
+        return self.n_items
+
+    # -------------------------------------------------
+    def vectorize(self, text: str) -> tuple:
+        """
+        TF-IDF vector of a query, as vectorizer.transform([text]) builds it.
+
+        :return: (term ids int64, weights float64); empty when no query term
+                 is in the vocabulary
+        """
+        counts = Counter(
+            self.vocabulary[token]
+            for token in self.analyzer(text)
+            if token in self.vocabulary
+        )
+        term_ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if not len(counts):
+            return term_ids, weights
+
+        if self.vectorizer.sublinear_tf:
+            weights = 1.0 + np.log(weights)
+        if self.idf is not None:
+            weights = weights * self.idf[term_ids]
+
+        norm = self.vectorizer.norm
+        if norm == "l2":
+            weights = weights / np.sqrt(np.dot(weights, weights))
+        elif norm == "l1":
+            weights = weights / np.abs(weights).sum()
+        return term_ids, weights
+
+    def top_k(self, text: str, k: int, row_mask: np.ndarray = None) -> tuple:
+        """
+        Catalog rows most similar to a free-text query (cosine similarity).
+
+        :param text: free-text query
+        :param k: number of rows to return
+        :param row_mask: optional boolean mask over the catalog; only rows
+                         where it is True are returned (e.g. one genre)
+        :return: (row ids, scores), best first, ties broken by the lower row;
+                 only rows sharing at least one term with the query
+        """
+        term_ids, weights = self.vectorize(text)
+        if not len(term_ids) or k <= 0:
+            return [], []
+
+        starts = self.indptr[term_ids]
+        ends = self.indptr[term_ids + 1]
+        rows = np.concatenate([self.indices[s:e] for s, e in zip(starts, ends)])
+        values = np.concatenate([
+            self.data[s:e] * w for s, e, w in zip(starts, ends, weights)
+        ])
+
+        if len(rows) * 8 < self.n_items:
+            # Few postings: accumulate per candidate row
+            candidates, inverse = np.unique(rows, return_inverse=True)
+            scores = np.bincount(inverse, weights=values)
+        else:
+            # Common terms: one dense accumulator over the catalog
+            scores = np.bincount(rows, weights=values, minlength=self.n_items)
+            candidates = np.flatnonzero(scores)
+            scores = scores[candidates]
+
+        if row_mask is not None:
+            allowed = row_mask[candidates]
+            candidates, scores = candidates[allowed], scores[allowed]
+
+        if len(candidates) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            candidates, scores = candidates[keep], scores[keep]
+        order = np.lexsort((candidates, -scores))
+        return candidates[order].tolist(), scores[order].tolist()